@@ -1,11 +1,11 @@
-FEATURE_COLUMNS = [
-    "festival",
-    "transport_mode",
-    "distance_km",
-    "historical_rush_index",
-    "days_before_festival",
-    "source_city_tier",
-    "destination_city_tier"
-]
-
-TARGET_COLUMN = "booking_risk_score"
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+# The feature spec lives in src/feature_spec.py, shared by training and serving
+from feature_spec import CATEGORICAL_COLUMNS, MODEL_SPECS, check_features
+
+FEATURE_COLUMNS = MODEL_SPECS["multimodal_rush"]["features"]
+
+TARGET_COLUMN = MODEL_SPECS["multimodal_rush"]["target"]
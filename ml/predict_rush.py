@@ -1,9 +1,40 @@
-import pandas as pd
-import joblib
+import os
+import sys
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from multimodal import (
+    MultiModalRushPredictor, bundle_fingerprint, export_multimodal_bundle, sources_fingerprint
+)
+
+MODEL_PATH = "ml/rush_model.pkl"
+ENCODERS_PATH = "ml/label_encoders.pkl"
+BUNDLE_DIR = "ml/models/multimodal"
+
+# Loaded on first use; (re)exported from the legacy pickles when the bundle
+# is missing or was exported from other versions of them
+_predictor = None
+_predictor_lock = threading.Lock()
+
+
+def get_predictor():
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                sources = [MODEL_PATH, ENCODERS_PATH]
+                if all(os.path.exists(path) for path in sources):
+                    fingerprint = sources_fingerprint(sources)
+                    if bundle_fingerprint(BUNDLE_DIR) != fingerprint:
+                        import joblib
+                        export_multimodal_bundle(
+                            joblib.load(MODEL_PATH), joblib.load(ENCODERS_PATH), BUNDLE_DIR,
+                            source_fingerprint=fingerprint
+                        )
+                _predictor = MultiModalRushPredictor(bundle_dir=BUNDLE_DIR)
+    return _predictor
 
-# Load trained model and encoders
-model = joblib.load("ml/rush_model.pkl")
-label_encoders = joblib.load("ml/label_encoders.pkl")
 
 def predict_rush(
     festival: str,
@@ -15,29 +46,22 @@ def predict_rush(
     Predict festive travel rush level
     """
 
-    # Create input dataframe (MATCH training features exactly)
-    data = pd.DataFrame([{
-        "festival": festival,
-        "transport_mode": transport_mode,
-        "distance_km": distance_km,
-        "historical_rush_index": historical_rush_index,
-    }])
-
-    # Encode categorical columns
-    for col, encoder in label_encoders.items():
-        if col in data.columns:
-            data[col] = encoder.transform(data[col])
+    return get_predictor().predict(
+        festival, transport_mode, distance_km, historical_rush_index
+    )
 
-    # Predict
-    prediction = model.predict(data)[0]
-    confidence = model.predict_proba(data).max()
 
-    # Decode prediction back to label
-    rush_label = label_encoders["rush_level"].inverse_transform([prediction])[0]
+def predict_rush_batch(festival, transport_mode, distance_km, historical_rush_index):
+    """
+    Predict rush levels for arrays of journeys in one pass
+    """
 
+    labels, probabilities = get_predictor().predict_batch(
+        festival, transport_mode, distance_km, historical_rush_index
+    )
     return {
-        "predicted_rush_level": rush_label,
-        "confidence": round(confidence * 100, 2)
+        "predicted_rush_level": labels,
+        "confidence": (probabilities.max(axis=1) * 100).round(2)
     }
 
 
@@ -0,0 +1,710 @@
+"""
+Model-agnostic advisory logic shared by every advisor backend.
+
+Backends load their models and implement the three batched primitives
+(_predict_rush_proba, _predict_confirmation, _predict_booking_window); the
+single-request methods, sweeps, rankings and recommendations are built on
+top of them here. Only NumPy is imported so the lightweight runtime can
+reuse this module without pulling in pandas or sklearn.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from cache import LRUCache
+from calibration import apply_calibration
+from features import (batch_size, default_peak_day_proximity,
+                      estimate_historical_rush, FESTIVAL_WEIGHTS, CLASS_WEIGHTS)
+from recommendations import decode_bits, recommendation_bits, recommendation_codes, render
+from uncertainty import MARGINAL_SHARE, row_uncertainty, vote_uncertainty
+
+
+# model_dir -> (artifact stat signature, content hash) of the last hash taken
+_bundle_versions = {}
+
+
+def _artifact_signature(model_dir):
+    names = sorted(name for name in os.listdir(model_dir) if name.endswith((".pkl", ".json", ".npz")))
+    signature = []
+    for name in names:
+        stat = os.stat(os.path.join(model_dir, name))
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def model_bundle_version(model_dir):
+    """
+    Short content hash identifying the set of model artifacts in model_dir.
+    The artifacts are only re-read and hashed when their names, mtimes or
+    sizes change, so reload polls stay cheap.
+    """
+
+    key = os.path.abspath(model_dir)
+    signature = _artifact_signature(model_dir)
+    cached = _bundle_versions.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha1()
+    for name, _, _ in signature:
+        digest.update(name.encode())
+        with open(os.path.join(model_dir, name), "rb") as f:
+            digest.update(f.read())
+    version = digest.hexdigest()[:12]
+    _bundle_versions[key] = (signature, version)
+    return version
+
+
+class BaseAdvisor:
+    """
+    Shared advisory API. Subclasses set label_index, rush_labels,
+    rush_features, rush_feature_info, model_version, transforms,
+    rush_ensemble (the rush forest as a TreeEnsemble), confirm_calibration
+    (isotonic lookup arrays or None) and input_profile (drift.build_profile
+    output or None), then call _init_shared().
+    """
+
+    def _init_shared(self):
+        # Reuse of batched alternative rankings across identical requests
+        self.alternatives_cache = LRUCache(maxsize=2048)
+
+    def categories(self, col):
+        """Training vocabulary of a categorical column, in encoder order"""
+        return np.array(list(self._label_index[col]))
+
+    def _predict_rush_proba(self, columns, n_rows):
+        raise NotImplementedError
+
+    def _predict_confirmation(self, columns, n_rows):
+        raise NotImplementedError
+
+    def _predict_booking_window(self, columns, n_rows):
+        """
+        Booking models evaluated in one pass over a shared feature matrix:
+        shape (n_rows, 3) holding the recommended days and the lower/upper
+        bound offsets from it, or (n_rows, 1) without quantile models
+        """
+        raise NotImplementedError
+
+    def _rush_tree_pass(self, columns, n_rows):
+        """Rush probabilities, per-tree outputs and leaf indices from one forest pass"""
+        leaves = self.rush_ensemble.apply(self.transforms["rush"](columns, n_rows))
+        votes = self.rush_ensemble.tree_values(None, leaves)
+        return self.rush_ensemble.combine(votes), votes, leaves
+
+    def _top_factors(self):
+        features = self.rush_feature_info["features"]
+        importance = self.rush_feature_info["importance"]
+
+        top_factors = sorted(
+            zip(features, importance),
+            key=lambda x: x[1],
+            reverse=True
+        )[:4]
+
+        return [f.replace("_", " ").title() for f, _ in top_factors]
+
+    def predict_rush_level(self, festival, days_before_festival, route_distance_km,
+                          source_city_tier, destination_city_tier,
+                          train_class, train_type, historical_rush_index=None,
+                          peak_day_proximity=None, with_uncertainty=False,
+                          with_attributions=False):
+        """
+        Rush level for one journey. top_factors are the global feature
+        importances unless with_attributions is set, which ranks this
+        request's own path contributions and adds them as factor_contributions.
+        """
+
+        rush_levels, probabilities, *details = self.predict_rush_batch(
+            festival=festival,
+            days_before_festival=days_before_festival,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=train_class,
+            train_type=train_type,
+            historical_rush_index=historical_rush_index,
+            peak_day_proximity=peak_day_proximity,
+            with_uncertainty=with_uncertainty,
+            with_attributions=with_attributions
+        )
+
+        result = {
+            "rush_level": str(rush_levels[0]),
+            "confidence": float(np.round(probabilities[0].max(), 3)),
+            "top_factors": self._top_factors(),
+            "probabilities": {
+                str(label): float(np.round(prob, 3))
+                for label, prob in zip(self.rush_labels, probabilities[0])
+            }
+        }
+        if with_attributions:
+            # Contributions toward the predicted level, strongest first
+            contributions = details[0]["attributions"]["contributions"][0, :, probabilities[0].argmax()]
+            order = np.argsort(-contributions, kind="stable")
+            result["top_factors"] = [self.rush_features[i].replace("_", " ").title() for i in order[:4]]
+            result["factor_contributions"] = {
+                self.rush_features[i]: round(float(contributions[i]), 3) for i in order
+            }
+        if with_uncertainty:
+            result["uncertainty"] = row_uncertainty(details[0]["uncertainty"], self.rush_labels)
+        return result
+
+    def predict_rush_batch(self, festival, days_before_festival, route_distance_km,
+                           source_city_tier, destination_city_tier,
+                           train_class, train_type, historical_rush_index=None,
+                           peak_day_proximity=None, with_uncertainty=False,
+                           with_attributions=False, marginal_share=MARGINAL_SHARE):
+        """
+        Vectorized predict_rush_level: every argument may be a scalar or an
+        array. Returns the rush labels and the class probability matrix.
+
+        With with_uncertainty or with_attributions set, a third item holds
+        the requested details, all from one pass over the flattened forest:
+        "uncertainty" is a vote_uncertainty summary and "attributions" holds
+        the per-feature path contributions, shape (n_rows, n_features,
+        n_classes), under "contributions" and their "bias".
+        """
+
+        if historical_rush_index is None:
+            historical_rush_index = self._estimate_historical_rush_batch(
+                festival, route_distance_km, source_city_tier,
+                destination_city_tier, train_class
+            )
+
+        if peak_day_proximity is None:
+            peak_day_proximity = default_peak_day_proximity(festival, days_before_festival)
+
+        columns = {
+            "festival": festival,
+            "days_before_festival": days_before_festival,
+            "route_distance_km": route_distance_km,
+            "source_city_tier": source_city_tier,
+            "destination_city_tier": destination_city_tier,
+            "peak_day_proximity": peak_day_proximity,
+            "train_class": train_class,
+            "train_type": train_type,
+            "historical_rush_index": historical_rush_index
+        }
+
+        if with_uncertainty or with_attributions:
+            probabilities, votes, leaves = self._rush_tree_pass(columns, batch_size(columns))
+            details = {}
+            if with_uncertainty:
+                details["uncertainty"] = vote_uncertainty(votes, probabilities, marginal_share)
+            if with_attributions:
+                bias, contributions = self.rush_ensemble.contributions(leaves, len(self.rush_features))
+                details["attributions"] = {"bias": bias, "contributions": contributions}
+            return self.rush_labels[probabilities.argmax(axis=1)], probabilities, details
+
+        probabilities = self._predict_rush_proba(columns, batch_size(columns))
+
+        return self.rush_labels[probabilities.argmax(axis=1)], probabilities
+
+    def rush_curve(self, festival, route_distance_km, source_city_tier,
+                   destination_city_tier, train_class, train_type,
+                   days_range=range(0, 121)):
+        """
+        Predict rush level for every day in days_range with a single
+        batched model call
+        """
+
+        days = np.asarray(list(days_range), dtype=np.int64)
+        if days.size == 0:
+            raise ValueError("days_range must contain at least one day")
+
+        rush_levels, probabilities = self.predict_rush_batch(
+            festival=festival,
+            days_before_festival=days,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=train_class,
+            train_type=train_type
+        )
+
+        return {
+            "festival": festival,
+            "days_before_festival": days.tolist(),
+            "rush_level": rush_levels.tolist(),
+            "confidence": np.round(probabilities.max(axis=1), 3).tolist(),
+            "probabilities": {
+                label: np.round(probabilities[:, i], 3).tolist()
+                for i, label in enumerate(self.rush_labels)
+            }
+        }
+
+    def predict_confirmation_probability(self, current_waitlist_position,
+                                        days_to_journey, train_type, quota,
+                                        train_class, historical_rush_index,
+                                        ticket_status="WL"):
+
+        probability = self.predict_confirmation_batch(
+            current_waitlist_position=current_waitlist_position,
+            days_to_journey=days_to_journey,
+            train_type=train_type,
+            quota=quota,
+            train_class=train_class,
+            historical_rush_index=historical_rush_index,
+            ticket_status=ticket_status
+        )[0]
+        return round(float(probability), 3)
+
+    def predict_confirmation_batch(self, current_waitlist_position, days_to_journey,
+                                   train_type, quota, train_class,
+                                   historical_rush_index, ticket_status="WL"):
+        """
+        Vectorized predict_confirmation_probability over scalars or arrays.
+        Returns unrounded probabilities, calibrated when the models ship a
+        calibration and clipped to [0, 1].
+        """
+
+        columns = {
+            "current_waitlist_position": current_waitlist_position,
+            "days_to_journey": days_to_journey,
+            "train_type": train_type,
+            "quota": quota,
+            "train_class": train_class,
+            "historical_rush_index": historical_rush_index,
+            "ticket_status": ticket_status
+        }
+
+        raw = self._predict_confirmation(columns, batch_size(columns))
+        return apply_calibration(raw, self.confirm_calibration)
+
+    def _booking_pass(self, festival, route_distance_km, source_city_tier,
+                      destination_city_tier, train_class, historical_rush_index=None):
+        if historical_rush_index is None:
+            historical_rush_index = self._estimate_historical_rush_batch(
+                festival, route_distance_km, source_city_tier,
+                destination_city_tier, train_class
+            )
+
+        columns = {
+            "festival": festival,
+            "route_distance_km": route_distance_km,
+            "source_city_tier": source_city_tier,
+            "destination_city_tier": destination_city_tier,
+            "train_class": train_class,
+            "historical_rush_index": historical_rush_index
+        }
+
+        return self._predict_booking_window(columns, batch_size(columns))
+
+    def predict_booking_batch(self, festival, route_distance_km, source_city_tier,
+                              destination_city_tier, train_class,
+                              historical_rush_index=None):
+        """
+        Vectorized optimal booking day prediction over scalars or arrays.
+        Returns the unrounded recommended days before the festival.
+        """
+
+        return self._booking_pass(festival, route_distance_km, source_city_tier,
+                                  destination_city_tier, train_class,
+                                  historical_rush_index)[:, 0]
+
+    def predict_booking_window_batch(self, festival, route_distance_km, source_city_tier,
+                                     destination_city_tier, train_class,
+                                     historical_rush_index=None):
+        """
+        Vectorized booking window over scalars or arrays. Returns whole-day
+        (optimal_min, optimal_max, recommended) arrays with the recommended
+        day always inside the window.
+        """
+
+        window = self._booking_pass(festival, route_distance_km, source_city_tier,
+                                    destination_city_tier, train_class,
+                                    historical_rush_index)
+        days = window[:, 0]
+
+        if window.shape[1] == 1:
+            # Models trained without quantile bounds keep the fixed ±5-day band
+            low, high = days - 5, days + 5
+        else:
+            # Independently fitted quantiles may cross the midpoint
+            low = np.floor(np.minimum(days + window[:, 1], days))
+            high = np.ceil(np.maximum(days + window[:, 2], days))
+
+        return low.astype(np.int64), high.astype(np.int64), days.astype(np.int64)
+
+    def predict_optimal_booking_window(self, festival, route_distance_km,
+                                       source_city_tier, destination_city_tier,
+                                       train_class, historical_rush_index=None):
+
+        optimal_min, optimal_max, recommended = self.predict_booking_window_batch(
+            festival=festival,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=train_class,
+            historical_rush_index=historical_rush_index
+        )
+
+        return {
+            "optimal_min": int(optimal_min[0]),
+            "optimal_max": int(optimal_max[0]),
+            "recommended": int(recommended[0])
+        }
+
+    def get_complete_advisory(self, festival, days_before_festival, source_city,
+                             destination_city, route_distance_km, source_city_tier,
+                             destination_city_tier, train_class, train_type,
+                             current_waitlist_position=0, quota="General",
+                             with_uncertainty=False, with_attributions=False):
+        """
+        Get complete travel advisory including rush level, confirmation probability,
+        and optimal booking window
+        """
+        
+        # Predict rush level
+        rush_info = self.predict_rush_level(
+            festival=festival,
+            days_before_festival=days_before_festival,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=train_class,
+            train_type=train_type,
+            with_uncertainty=with_uncertainty,
+            with_attributions=with_attributions
+        )
+        
+        # Get historical rush index from rush prediction
+        historical_rush_index = self._estimate_historical_rush(
+            festival, route_distance_km, source_city_tier,
+            destination_city_tier, train_class
+        )
+        
+        # Predict confirmation probability if waitlisted
+        confirmation_prob = None
+        if current_waitlist_position > 0:
+            confirmation_prob = self.predict_confirmation_probability(
+                current_waitlist_position=current_waitlist_position,
+                days_to_journey=days_before_festival,
+                train_type=train_type,
+                quota=quota,
+                train_class=train_class,
+                historical_rush_index=historical_rush_index
+            )
+        
+        # Get optimal booking window
+        booking_window = self.predict_optimal_booking_window(
+            festival=festival,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=train_class,
+            historical_rush_index=historical_rush_index
+        )
+        
+        # Generate recommendations
+        codes = self._recommendation_codes(
+            rush_info["rush_level"],
+            days_before_festival,
+            booking_window,
+            confirmation_prob,
+            train_class
+        )
+        recommendations = render(codes, **booking_window)
+        
+        return {
+            "route": {
+                "from": source_city,
+                "to": destination_city,
+                "distance_km": route_distance_km
+            },
+            "festival": festival,
+            "days_before_festival": days_before_festival,
+            "rush_analysis": rush_info,
+            "confirmation_probability": confirmation_prob,
+            "optimal_booking_window": booking_window,
+            "recommendations": recommendations,
+            "recommendation_codes": codes,
+            "train_details": {
+                "class": train_class,
+                "type": train_type,
+                "quota": quota
+            }
+        }
+    
+    def get_batch_advisory(self, festival, days_before_festival, route_distance_km,
+                           source_city_tier, destination_city_tier, train_class,
+                           train_type, current_waitlist_position=0, quota="General",
+                           peak_day_proximity=None, with_uncertainty=False,
+                           with_attributions=False):
+        """
+        Vectorized get_complete_advisory over scalars or equal-length arrays.
+        Returns a dict of columns, one value per journey; confirmation
+        probability is NaN for journeys that are not waitlisted.
+        peak_day_proximity defaults to the distance from the catalog peak
+        offsets, the same values festival_calendar derives from dates.
+        """
+
+        historical = self._estimate_historical_rush_batch(
+            festival, route_distance_km, source_city_tier,
+            destination_city_tier, train_class
+        )
+
+        rush_levels, rush_proba, *details = self.predict_rush_batch(
+            festival=festival,
+            days_before_festival=days_before_festival,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=train_class,
+            train_type=train_type,
+            historical_rush_index=historical,
+            peak_day_proximity=peak_day_proximity,
+            with_uncertainty=with_uncertainty,
+            with_attributions=with_attributions
+        )
+        n_rows = len(rush_levels)
+
+        def rows(value, idx=slice(None)):
+            return np.broadcast_to(np.asarray(value), (n_rows,))[idx]
+
+        # Only waitlisted journeys go through the confirmation model
+        confirmation = np.full(n_rows, np.nan)
+        waitlisted = np.flatnonzero(rows(current_waitlist_position) > 0)
+        if waitlisted.size:
+            confirmation[waitlisted] = np.round(self.predict_confirmation_batch(
+                current_waitlist_position=rows(current_waitlist_position, waitlisted),
+                days_to_journey=rows(days_before_festival, waitlisted),
+                train_type=rows(train_type, waitlisted),
+                quota=rows(quota, waitlisted),
+                train_class=rows(train_class, waitlisted),
+                historical_rush_index=rows(historical, waitlisted)
+            ), 3)
+
+        window = self.predict_booking_window_batch(
+            festival=festival,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=train_class,
+            historical_rush_index=historical
+        )
+        optimal_min, optimal_max, recommended = (rows(bound) for bound in window)
+
+        columns = {
+            "rush_level": rush_levels,
+            "rush_confidence": np.round(rush_proba.max(axis=1), 3),
+            **{
+                f"rush_probability_{str(label).lower()}": np.round(rush_proba[:, i], 3)
+                for i, label in enumerate(self.rush_labels)
+            },
+            "historical_rush_index": np.round(rows(historical), 1),
+            "confirmation_probability": confirmation,
+            "optimal_min": optimal_min,
+            "optimal_max": optimal_max,
+            "recommended_booking_days": recommended,
+        }
+
+        bits = recommendation_bits({
+            "rush_level": rush_levels,
+            "days_before": rows(days_before_festival),
+            "optimal_min": columns["optimal_min"],
+            "optimal_max": columns["optimal_max"],
+            "confirmation_probability": confirmation,
+            "train_class": rows(train_class)
+        })
+        columns["recommendation_bits"] = bits
+        columns["recommendation_codes"] = decode_bits(bits)
+
+        if with_uncertainty:
+            summary = details[0]["uncertainty"]
+            columns["rush_vote_share"] = np.round(summary["vote_share"], 3)
+            columns["rush_margin"] = np.round(summary["margin"], 3)
+            columns["rush_marginal"] = summary["marginal"]
+        if with_attributions:
+            toward_level = details[0]["attributions"]["contributions"][
+                np.arange(n_rows), :, rush_proba.argmax(axis=1)
+            ]
+            columns["rush_top_factor"] = np.asarray(self.rush_features)[toward_level.argmax(axis=1)]
+
+        return columns
+
+    def get_complete_advisories(self, requests):
+        """
+        get_complete_advisory for a list of request dicts, scored with one
+        get_batch_advisory pass. Each result equals the single-request one.
+        """
+
+        fields = ("festival", "days_before_festival", "route_distance_km", "source_city_tier",
+                  "destination_city_tier", "train_class", "train_type",
+                  "current_waitlist_position", "quota")
+        defaults = {"current_waitlist_position": 0, "quota": "General"}
+        requests = [dict(defaults, **params) for params in requests]
+        if not requests:
+            return []
+
+        columns = self.get_batch_advisory(**{
+            name: np.array([params[name] for params in requests]) for name in fields
+        })
+
+        top_factors = self._top_factors()
+        advisories = []
+        for i, params in enumerate(requests):
+            confirmation = float(columns["confirmation_probability"][i])
+            booking_window = {
+                "optimal_min": int(columns["optimal_min"][i]),
+                "optimal_max": int(columns["optimal_max"][i]),
+                "recommended": int(columns["recommended_booking_days"][i])
+            }
+            joined = columns["recommendation_codes"][i]
+            codes = joined.split("|") if joined else []
+
+            advisories.append({
+                "route": {
+                    "from": params["source_city"],
+                    "to": params["destination_city"],
+                    "distance_km": params["route_distance_km"]
+                },
+                "festival": params["festival"],
+                "days_before_festival": params["days_before_festival"],
+                "rush_analysis": {
+                    "rush_level": str(columns["rush_level"][i]),
+                    "confidence": float(columns["rush_confidence"][i]),
+                    "top_factors": list(top_factors),
+                    "probabilities": {
+                        str(label): float(columns[f"rush_probability_{str(label).lower()}"][i])
+                        for label in self.rush_labels
+                    }
+                },
+                "confirmation_probability": None if np.isnan(confirmation) else confirmation,
+                "optimal_booking_window": booking_window,
+                "recommendations": render(codes, **booking_window),
+                "recommendation_codes": codes,
+                "train_details": {
+                    "class": params["train_class"],
+                    "type": params["train_type"],
+                    "quota": params["quota"]
+                }
+            })
+
+        return advisories
+
+    def rank_alternatives(self, festival, days_before_festival, route_distance_km,
+                          source_city_tier, destination_city_tier,
+                          current_waitlist_position=1, top_n=None):
+        """
+        Rank every train class x train type x quota option for a route by
+        predicted confirmation probability and rush, using one batched pass
+        per model
+        """
+
+        key = (festival, int(days_before_festival), float(route_distance_km),
+               int(source_city_tier), int(destination_city_tier),
+               int(current_waitlist_position))
+
+        ranking = self.alternatives_cache.get(key)
+        if ranking is None:
+            ranking = self._rank_alternatives(*key)
+            self.alternatives_cache.set(key, ranking)
+
+        if top_n is None:
+            return ranking
+        return {**ranking, "options": ranking["options"][:top_n]}
+
+    def _rank_alternatives(self, festival, days_before_festival, route_distance_km,
+                           source_city_tier, destination_city_tier,
+                           current_waitlist_position):
+        classes = self.categories("train_class")
+        types = self.categories("train_type")
+        quotas = self.categories("quota")
+
+        historical = self._estimate_historical_rush_batch(
+            festival, route_distance_km, source_city_tier,
+            destination_city_tier, classes
+        )
+
+        # Rush does not depend on quota: score class x type only
+        cls_idx, type_idx = np.divmod(np.arange(len(classes) * len(types)), len(types))
+
+        rush_levels, rush_proba = self.predict_rush_batch(
+            festival=festival,
+            days_before_festival=days_before_festival,
+            route_distance_km=route_distance_km,
+            source_city_tier=source_city_tier,
+            destination_city_tier=destination_city_tier,
+            train_class=classes[cls_idx],
+            train_type=types[type_idx],
+            historical_rush_index=historical[cls_idx]
+        )
+
+        rush_confidence = rush_proba.max(axis=1)
+        high = np.flatnonzero(self.rush_labels == "High")
+        high_proba = rush_proba[:, high[0]] if high.size else np.zeros(len(cls_idx))
+
+        # Confirmation over the full class x type x quota grid
+        pair_idx, quota_idx = np.divmod(np.arange(len(cls_idx) * len(quotas)), len(quotas))
+        opt_cls = cls_idx[pair_idx]
+
+        confirmation = self.predict_confirmation_batch(
+            current_waitlist_position=current_waitlist_position,
+            days_to_journey=days_before_festival,
+            train_type=types[type_idx[pair_idx]],
+            quota=quotas[quota_idx],
+            train_class=classes[opt_cls],
+            historical_rush_index=historical[opt_cls]
+        )
+
+        # Best confirmation first, lower chance of high rush breaks ties
+        order = np.lexsort((high_proba[pair_idx], -np.round(confirmation, 3)))
+
+        options = [
+            {
+                "train_class": classes[opt_cls[i]],
+                "train_type": types[type_idx[pair_idx[i]]],
+                "quota": quotas[quota_idx[i]],
+                "rush_level": rush_levels[pair_idx[i]],
+                "rush_confidence": round(float(rush_confidence[pair_idx[i]]), 3),
+                "high_rush_probability": round(float(high_proba[pair_idx[i]]), 3),
+                "confirmation_probability": round(float(confirmation[i]), 3)
+            }
+            for i in order
+        ]
+
+        return {
+            "festival": festival,
+            "days_before_festival": days_before_festival,
+            "current_waitlist_position": current_waitlist_position,
+            "evaluated": len(options),
+            "options": options
+        }
+
+    def _generate_recommendations(self, rush_level, days_before, booking_window, 
+                                 confirmation_prob, train_class):
+        """Generate actionable recommendations"""
+        codes = self._recommendation_codes(
+            rush_level, days_before, booking_window, confirmation_prob, train_class
+        )
+        return render(codes, **booking_window)
+
+    def _recommendation_codes(self, rush_level, days_before, booking_window,
+                              confirmation_prob, train_class):
+        """Recommendation codes for a single advisory from the rule table"""
+        return recommendation_codes({
+            "rush_level": [rush_level],
+            "days_before": [days_before],
+            "optimal_min": [booking_window["optimal_min"]],
+            "optimal_max": [booking_window["optimal_max"]],
+            "confirmation_probability": [np.nan if confirmation_prob is None else confirmation_prob],
+            "train_class": [train_class]
+        })[0]
+
+    def _estimate_historical_rush(self, festival, distance, src_tier, dst_tier, train_class):
+        """Estimate historical rush index based on route and festival characteristics"""
+        
+        base = FESTIVAL_WEIGHTS.get(festival, 70)
+        class_factor = CLASS_WEIGHTS.get(train_class, 70)
+        distance_factor = min(20, distance / 100)
+        tier_factor = (4 - src_tier + 4 - dst_tier) * 3
+
+        return min(100, base * 0.5 + class_factor * 0.3 + distance_factor + tier_factor)
+
+    def _estimate_historical_rush_batch(self, festival, distance, src_tier, dst_tier, train_class):
+        """Vectorized _estimate_historical_rush over scalars or arrays"""
+        return estimate_historical_rush(festival, distance, src_tier, dst_tier, train_class)
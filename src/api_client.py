@@ -0,0 +1,180 @@
+"""
+HTTP client for the prediction service.
+
+AdvisorClient exposes the advisor methods the dashboard uses
+(get_complete_advisory, get_batch_advisory, rush_curve, rank_alternatives
+and model_version) on top of the Flask API, so a dashboard can run without
+loading any models. One keep-alive requests.Session is shared by every
+call, with a bounded connection pool, per-request timeouts and retries with
+backoff on connection errors and 502/503/504. Every endpoint used is a pure
+prediction, so retrying a POST is safe.
+
+Usage:
+    client = AdvisorClient("http://localhost:3000")
+    client.get_complete_advisory(festival="Diwali", days_before_festival=20, ...)
+"""
+
+import threading
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Fields of a /api/advisory/batch journey, in get_batch_advisory order
+BATCH_FIELDS = (
+    "festival", "days_before_festival", "route_distance_km", "source_city_tier",
+    "destination_city_tier", "train_class", "train_type",
+    "current_waitlist_position", "quota"
+)
+
+
+class ApiError(RuntimeError):
+    """The service answered with an error; details maps field -> message for 400s"""
+
+    def __init__(self, status, message, details=None):
+        self.status = status
+        self.details = details or {}
+        super().__init__(f"HTTP {status}: {message}")
+
+
+def _to_builtin(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class AdvisorClient:
+    """
+    Pooled, retrying client for one prediction service. timeout is a
+    (connect, read) pair in seconds; model_version is refreshed from the
+    X-Model-Version response header and re-checked every version_ttl seconds.
+    """
+
+    def __init__(self, base_url, timeout=(3.05, 30), retries=3, backoff=0.3,
+                 pool_size=10, version_ttl=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.version_ttl = version_ttl
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+
+        self._lock = threading.Lock()
+        self._model_version = None
+        self._version_checked = 0.0
+
+    def close(self):
+        self.session.close()
+
+    def _note_version(self, response):
+        version = response.headers.get("X-Model-Version")
+        if version:
+            with self._lock:
+                self._model_version = version
+                self._version_checked = time.monotonic()
+
+    def _request(self, method, path, payload=None):
+        response = self.session.request(
+            method, f"{self.base_url}{path}", json=payload, timeout=self.timeout
+        )
+        self._note_version(response)
+
+        try:
+            body = response.json()
+        except ValueError:
+            raise ApiError(response.status_code, response.text[:200] or response.reason) from None
+        if not isinstance(body, dict):
+            raise ApiError(response.status_code, "expected a JSON object")
+
+        if response.status_code >= 400 or body.get("success") is False:
+            raise ApiError(response.status_code, body.get("error", response.reason), body.get("details"))
+        return body
+
+    def _post(self, path, payload):
+        return self._request("POST", path, payload)["data"]
+
+    @property
+    def model_version(self):
+        """Version of the model bundle the service is serving"""
+        if self._model_version is None or time.monotonic() - self._version_checked > self.version_ttl:
+            self._request("GET", "/health")
+        return self._model_version
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def get_complete_advisory(self, **params):
+        return self._post("/api/advisory", {k: _to_builtin(v) for k, v in params.items()})
+
+    def get_batch_advisory(self, festival, days_before_festival, route_distance_km,
+                           source_city_tier, destination_city_tier, train_class,
+                           train_type, current_waitlist_position=0, quota="General",
+                           with_uncertainty=False, with_attributions=False):
+        """
+        Same contract as BaseAdvisor.get_batch_advisory: scalars or
+        equal-length arrays in, a dict of NumPy columns out
+        """
+
+        values = (festival, days_before_festival, route_distance_km, source_city_tier,
+                  destination_city_tier, train_class, train_type,
+                  current_waitlist_position, quota)
+        arrays = np.broadcast_arrays(*(np.asarray(v) for v in values))
+        columns = [np.atleast_1d(a).tolist() for a in arrays]
+
+        journeys = [dict(zip(BATCH_FIELDS, row)) for row in zip(*columns)]
+        data = self._post("/api/advisory/batch", {"journeys": journeys,
+                                                  "with_uncertainty": with_uncertainty,
+                                                  "with_attributions": with_attributions})
+
+        return {
+            name: np.array([np.nan if v is None else v for v in col])
+            if name == "confirmation_probability" else np.array(col)
+            for name, col in data["columns"].items()
+        }
+
+    def rush_curve(self, festival, route_distance_km, source_city_tier,
+                   destination_city_tier, train_class, train_type,
+                   days_range=range(0, 121)):
+        days = list(days_range)
+        if not days:
+            raise ValueError("days_range must contain at least one day")
+        if days != list(range(days[0], days[-1] + 1)):
+            raise ValueError("days_range must be a contiguous ascending range")
+
+        return self._post("/api/rush-curve", {
+            "festival": festival,
+            "route_distance_km": _to_builtin(route_distance_km),
+            "source_city_tier": _to_builtin(source_city_tier),
+            "destination_city_tier": _to_builtin(destination_city_tier),
+            "train_class": train_class,
+            "train_type": train_type,
+            "days_min": days[0],
+            "days_max": days[-1]
+        })
+
+    def rank_alternatives(self, festival, days_before_festival, route_distance_km,
+                          source_city_tier, destination_city_tier,
+                          current_waitlist_position=1, top_n=None):
+        return self._post("/api/alternatives", {
+            "festival": festival,
+            "days_before_festival": _to_builtin(days_before_festival),
+            "route_distance_km": _to_builtin(route_distance_km),
+            "source_city_tier": _to_builtin(source_city_tier),
+            "destination_city_tier": _to_builtin(destination_city_tier),
+            "current_waitlist_position": _to_builtin(current_waitlist_position),
+            "top_n": top_n
+        })
@@ -1,42 +1,181 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, g
 from flask_cors import CORS
 import sys
 import os
+import threading
+import time
+
+import numpy as np
 
 # Add the current directory to sys.path to import advisor
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from advisor import FestiveTravelAdvisor
+from model_registry import ModelRegistry
+from experiments import ModelExperiment
+from heatmap import HeatmapStore
+from recommendations import RULE_CODES, TEMPLATES
+from cache import DiskCache, advisory_cache_key
+from drift import DriftMonitor
+from validation import (ValidationError, validate_alternatives, validate_heatmap, validate_predict,
+                        validate_predict_batch, validate_rush_curve)
+from warmup import warm_cache_once
+from request_log import RequestLogger
+from route_graph import fill_route_fields, load_route_graph
+from serialization import respond
 
 app = Flask(__name__)
 CORS(app)
 
 # Initialize advisor with models from the correct directory
-# Since we run from the project root, ml/models is correct
-advisor = FestiveTravelAdvisor(model_dir="ml/models")
+# Since we run from the project root, ml/models is correct.
+# The registry hot-swaps the advisor when retrained artifacts land there.
+registry = ModelRegistry(
+    model_dir="ml/models",
+    loader=FestiveTravelAdvisor,
+    poll_interval=float(os.environ.get("MODEL_RELOAD_INTERVAL", 30))
+).start_watcher()
+
+# Optional candidate bundle for A/B traffic and shadow scoring
+experiment = None
+if os.environ.get("CANDIDATE_MODEL_DIR"):
+    experiment = ModelExperiment(
+        primary=registry,
+        candidate=ModelRegistry(
+            model_dir=os.environ["CANDIDATE_MODEL_DIR"],
+            poll_interval=float(os.environ.get("MODEL_RELOAD_INTERVAL", 30))
+        ).start_watcher(),
+        candidate_share=float(os.environ.get("CANDIDATE_TRAFFIC_SHARE", 0)),
+        shadow=os.environ.get("CANDIDATE_SHADOW", "0") == "1",
+        shadow_sample=float(os.environ.get("CANDIDATE_SHADOW_SAMPLE", 1))
+    )
+
+# Advisory cache on local disk, shared by every worker process on the host.
+# Keys carry the model version, so a model swap never serves stale results.
+advisory_cache = None
+if os.environ.get("ADVISORY_CACHE", "1") == "1":
+    advisory_cache = DiskCache(
+        path=os.environ.get("ADVISORY_CACHE_PATH", "data/cache/advisories.sqlite"),
+        max_bytes=int(os.environ.get("ADVISORY_CACHE_MAX_MB", 256)) * 1024 * 1024
+    )
+
+# Fill the cache from historical traffic. The cache is shared by every worker
+# on the host, so only the first worker to get here warms it; the others
+# skip straight to serving (or run src/warmup.py as a pre-start step instead)
+if advisory_cache is not None and os.environ.get("WARMUP_LOG"):
+    warmup = warm_cache_once(
+        os.environ["WARMUP_LOG"].split(","),
+        advisory_cache,
+        top_k=int(os.environ.get("WARMUP_TOP_K", 1000)),
+        advisor=registry.current()
+    )
+    if warmup is not None:
+        print(f"🔥 Cache warm-up: {warmup}")
+
+# Served requests and predictions, for retraining and cache warm-up
+request_logger = None
+if os.environ.get("REQUEST_LOG", "1") == "1":
+    request_logger = RequestLogger(
+        log_dir=os.environ.get("REQUEST_LOG_DIR", "data/request_logs")
+    ).start()
+
+# Precomputed festival x route x day slices, filled in lazily per route
+heatmap_store = HeatmapStore(output_dir="data/heatmap")
+
+# City index and route distances, so requests on listed routes may carry only city names
+route_graph = load_route_graph()
+
+# Live request fields against the serving models' training profile. Swapped
+# for a fresh monitor under drift_monitor_lock when the primary models reload.
+drift_monitor = None
+drift_monitor_lock = threading.Lock()
+if os.environ.get("DRIFT_MONITOR", "1") == "1":
+    drift_monitor = DriftMonitor.for_advisor(registry.current())
+
+# Largest /api/advisory/batch request accepted, in journeys
+BATCH_MAX_ROWS = int(os.environ.get("ADVISORY_BATCH_MAX_ROWS", 10000))
+
+def get_cached_advisory(advisor, params, with_uncertainty=False, with_attributions=False):
+    """Complete advisory for validated params and whether it came from the shared cache"""
+    cache_key = None
+    if advisory_cache is not None:
+        # Only set flags enter the key, so plain advisories keep their keys
+        flags = {name: True for name, value in (("with_uncertainty", with_uncertainty),
+                                                ("with_attributions", with_attributions)) if value}
+        cache_key = advisory_cache_key(advisor.model_version, dict(params, **flags))
+        result = advisory_cache.get(cache_key)
+        if result is not None:
+            return result, True
+
+    result = advisor.get_complete_advisory(**params, with_uncertainty=with_uncertainty,
+                                           with_attributions=with_attributions)
+    if cache_key is not None:
+        advisory_cache.set(cache_key, result)
+    return result, False
+
+def observe_inputs(advisor, params=None, columns=None):
+    """Feed validated primary-model requests to the drift monitor"""
+    global drift_monitor
+    monitor = drift_monitor
+    if monitor is None or g.variant != "primary":
+        return
+    if monitor.model_version != advisor.model_version:
+        with drift_monitor_lock:
+            if drift_monitor.model_version != advisor.model_version:
+                if advisor.model_version != registry.version:
+                    # Pinned to models that were swapped out mid-request
+                    return
+                # New models bring a new training profile; start over against it
+                drift_monitor = DriftMonitor.for_advisor(advisor)
+            monitor = drift_monitor
+    if columns is not None:
+        monitor.observe_columns(columns)
+    else:
+        monitor.observe(params)
+
+@app.before_request
+def bind_advisor():
+    # Pin one advisor per request so a model swap never splits a request
+    g.variant = "primary"
+    if experiment is not None and request.endpoint == "predict":
+        g.variant, g.advisor = experiment.choose()
+    else:
+        g.advisor = registry.current()
+
+@app.after_request
+def add_model_headers(response):
+    advisor = g.get("advisor")
+    if advisor is not None:
+        response.headers["X-Model-Version"] = advisor.model_version
+        response.headers["X-Model-Variant"] = g.variant
+    # The registry of the variant that answered, not always the primary's
+    serving = experiment.candidate if g.get("variant") == "candidate" else registry
+    if serving.previous_version:
+        response.headers["X-Previous-Model-Version"] = serving.previous_version
+    return response
 
 @app.route('/api/predict', methods=['POST'])
 def predict():
     try:
-        data = request.get_json()
-
-        # Required fields mapping
-        params = {
-            "festival": data.get("festival"),
-            "days_before_festival": data.get("days_before_festival"),
-            "source_city": data.get("source_city"),
-            "destination_city": data.get("destination_city"),
-            "route_distance_km": data.get("route_distance_km"),
-            "source_city_tier": data.get("source_city_tier"),
-            "destination_city_tier": data.get("destination_city_tier"),
-            "train_class": data.get("train_class"),
-            "train_type": data.get("train_type"),
-            "current_waitlist_position": data.get("current_waitlist_position", 0),
-            "quota": data.get("quota", "General")
-        }
+        advisor = g.advisor
+        data = request.get_json(silent=True)
+
+        # Checked and coerced before any model work
+        params = validate_predict(fill_route_fields(data, route_graph))
+        with_uncertainty = data.get("with_uncertainty") is True
+        with_attributions = data.get("with_attributions") is True
+        observe_inputs(advisor, params)
 
-        # Get complete advisory
-        result = advisor.get_complete_advisory(**params)
+        # Get complete advisory, from the shared cache when possible
+        request_start = time.perf_counter()
+        result, cache_hit = get_cached_advisory(advisor, params, with_uncertainty, with_attributions)
+
+        if experiment is not None:
+            # Cache hits are timed apart so they do not mask model latency,
+            # and still shadow-scored so the comparison sees all traffic
+            experiment.record_latency(g.variant, time.perf_counter() - request_start, cached=cache_hit)
+            if experiment.shadow and g.variant == "primary":
+                experiment.submit_shadow(params, result)
 
         # Extract rush info
         rush_info = result['rush_analysis']
@@ -50,6 +189,29 @@ def predict():
             params['train_class']
         )
 
+        alternatives = [
+            "Consider flying if distance > 1000km",
+            "Check for special festival trains",
+            "Try changing travel dates by 1-2 days"
+        ]
+
+        # Optional data-driven alternatives ranked over class/type/quota
+        if data.get("optimize_alternatives"):
+            ranking = advisor.rank_alternatives(
+                festival=params['festival'],
+                days_before_festival=params['days_before_festival'],
+                route_distance_km=params['route_distance_km'],
+                source_city_tier=params['source_city_tier'],
+                destination_city_tier=params['destination_city_tier'],
+                current_waitlist_position=max(1, params['current_waitlist_position']),
+                top_n=3
+            )
+            alternatives = [
+                f"{opt['train_class']} on {opt['train_type']} ({opt['quota']} quota): "
+                f"{opt['confirmation_probability']:.0%} confirmation chance, {opt['rush_level']} rush"
+                for opt in ranking['options']
+            ]
+
         # Format response for index.html
         response = {
             "success": True,
@@ -58,32 +220,192 @@ def predict():
                     "rush_level": rush_info['rush_level'],
                     "rush_confidence": rush_info['confidence'],
                     "historical_rush_index": round(historical_rush_index, 1),
-                    "confirmation_probability": result['confirmation_probability']
+                    "confirmation_probability": result['confirmation_probability'],
+                    "rush_uncertainty": rush_info.get('uncertainty'),
+                    "rush_factor_contributions": rush_info.get('factor_contributions')
                 },
                 "recommendations": {
                     "risk_level": rush_info['rush_level'],
                     "primary_advice": result['recommendations'][0] if result['recommendations'] else "No primary advice",
                     "booking_timing": result['recommendations'][1] if len(result['recommendations']) > 1 else "No timing advice",
                     "action_items": result['recommendations'][2:] if len(result['recommendations']) > 2 else [],
-                    "alternatives": [
-                        "Consider flying if distance > 1000km",
-                        "Check for special festival trains",
-                        "Try changing travel dates by 1-2 days"
-                    ]
+                    "alternatives": alternatives,
+                    "codes": result['recommendation_codes']
                 }
             }
         }
-        return jsonify(response)
+
+        if request_logger is not None:
+            request_logger.log({
+                "ts": time.time(),
+                "model_version": advisor.model_version,
+                "variant": g.variant,
+                "request": params,
+                "response": {
+                    "rush_level": rush_info['rush_level'],
+                    "rush_confidence": rush_info['confidence'],
+                    "confirmation_probability": result['confirmation_probability'],
+                    "booking_window": result['optimal_booking_window'],
+                    "recommendation_codes": result['recommendation_codes']
+                },
+                "cache_hit": cache_hit,
+                "latency_ms": round((time.perf_counter() - request_start) * 1000, 3)
+            })
+
+        return respond(response)
+
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e), "details": e.errors}), 400
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/advisory', methods=['POST'])
+def advisory():
+    try:
+        data = request.get_json(silent=True)
+        params = validate_predict(fill_route_fields(data, route_graph))
+        observe_inputs(g.advisor, params)
+
+        result, _ = get_cached_advisory(g.advisor, params, data.get("with_uncertainty") is True,
+                                        data.get("with_attributions") is True)
+
+        return respond({"success": True, "data": result})
+
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e), "details": e.errors}), 400
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/advisory/batch', methods=['POST'])
+def advisory_batch():
+    try:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict) and isinstance(data.get("journeys"), list):
+            data = dict(data, journeys=[fill_route_fields(j, route_graph) for j in data["journeys"]])
+        columns = validate_predict_batch(data, max_rows=BATCH_MAX_ROWS)
+        n_rows = len(columns["festival"])
+        observe_inputs(g.advisor, columns=columns)
+        del columns["source_city"], columns["destination_city"]
+
+        # One vectorized pass per model over every journey in the request
+        result = g.advisor.get_batch_advisory(
+            **{name: np.asarray(values) for name, values in columns.items()},
+            with_uncertainty=data.get("with_uncertainty") is True,
+            with_attributions=data.get("with_attributions") is True
+        )
+
+        return respond({"success": True, "data": {"count": n_rows, "columns": result}})
+
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e), "details": e.errors}), 400
 
     except Exception as e:
         import traceback
         print(traceback.format_exc())
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/rush-curve', methods=['POST'])
+def rush_curve():
+    try:
+        advisor = g.advisor
+        data = validate_rush_curve(request.get_json(silent=True))
+
+        days_min, days_max = data.pop("days_min"), data.pop("days_max")
+        if days_min > days_max:
+            raise ValidationError({"days_max": "must not be less than days_min"})
+        days_range = range(days_min, days_max + 1)
+
+        curve = advisor.rush_curve(**data, days_range=days_range)
+
+        return respond({"success": True, "data": curve})
+
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e), "details": e.errors}), 400
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/alternatives', methods=['POST'])
+def route_alternatives():
+    try:
+        advisor = g.advisor
+        data = validate_alternatives(request.get_json(silent=True))
+
+        ranking = advisor.rank_alternatives(**data)
+
+        return respond({"success": True, "data": ranking})
+
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e), "details": e.errors}), 400
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/heatmap', methods=['GET'])
+def heatmap():
+    try:
+        advisor = g.advisor
+        args = validate_heatmap(request.args.to_dict())
+        festival = args["festival"]
+        source_city = args["source_city"]
+        destination_city = args["destination_city"]
+
+        routes = [
+            route for route in heatmap_store.routes
+            if source_city in (None, route["from"]) and destination_city in (None, route["to"])
+        ]
+
+        return respond({
+            "success": True,
+            "data": {
+                "model_version": advisor.model_version,
+                "days_before_festival": list(range(
+                    heatmap_store.config["days_min"], heatmap_store.config["days_max"] + 1
+                )),
+                "routes": [
+                    heatmap_store.to_dict(route, festival=festival, advisor=advisor)
+                    for route in routes
+                ]
+            }
+        })
+
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e), "details": e.errors}), 400
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/recommendations/templates', methods=['GET'])
+def recommendation_templates():
+    return jsonify({"success": True, "data": {"rules": RULE_CODES, "templates": TEMPLATES}})
+
 @app.route('/health', methods=['GET'])
 def health():
     return jsonify({"status": "healthy"})
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify({
+        "models": registry.stats(),
+        "alternatives_cache": g.advisor.alternatives_cache.stats(),
+        "advisory_cache": advisory_cache.stats() if advisory_cache is not None else None,
+        "request_log": request_logger.stats() if request_logger is not None else None,
+        "experiment": experiment.stats() if experiment is not None else None,
+        "input_drift": drift_monitor.report() if drift_monitor is not None else None
+    })
+
 @app.route('/')
 def index():
     return send_file(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'index.html'))
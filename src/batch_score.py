@@ -0,0 +1,193 @@
+"""
+Offline batch scoring of journey files.
+
+Reads a CSV or Parquet file with the get_complete_advisory columns in
+fixed-size chunks, scores each chunk with the vectorized get_batch_advisory
+on a pool of worker processes and appends the advisory columns to a CSV or
+Parquet output as chunks complete, in input order. Only a bounded number of
+chunks is in flight at once, so memory stays flat however large the input.
+
+A journey_date column may stand in for days_before_festival; the festival
+calendar converts it. Likewise source_city and destination_city may stand
+in for the route distance and tiers, which come from the route graph.
+
+Parquet input or output needs pyarrow.
+
+Usage:
+    python src/batch_score.py season_plan.parquet advisories.parquet --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from festival_calendar import default_calendar
+from model_registry import load_advisor
+from route_graph import ROUTE_FIELDS, load_route_graph
+
+REQUIRED_COLUMNS = (
+    "festival", "days_before_festival", "route_distance_km", "source_city_tier",
+    "destination_city_tier", "train_class", "train_type"
+)
+OPTIONAL_COLUMNS = {"current_waitlist_position": 0, "quota": "General"}
+
+
+def _is_parquet(path):
+    return path.endswith((".parquet", ".pq"))
+
+
+def _require_pyarrow(path):
+    if pq is None:
+        raise RuntimeError(f"Reading or writing {path} needs pyarrow (pip install pyarrow)")
+
+
+def iter_chunks(path, chunk_size):
+    """Yield the input file as DataFrames of at most chunk_size rows"""
+
+    if _is_parquet(path):
+        _require_pyarrow(path)
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def score_frame(advisor, frame):
+    """Input columns followed by the advisory columns for one chunk"""
+
+    dated = "days_before_festival" not in frame.columns and "journey_date" in frame.columns
+    routed = [col for col in ROUTE_FIELDS if col not in frame.columns]
+    if not {"source_city", "destination_city"} <= set(frame.columns):
+        routed = []
+    derived = routed + (["days_before_festival"] if dated else [])
+    required = [col for col in REQUIRED_COLUMNS if col not in derived]
+
+    missing = [col for col in required if col not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+
+    inputs = {col: frame[col].to_numpy() for col in required}
+    if dated:
+        inputs.update(default_calendar().features(
+            inputs["festival"], frame["journey_date"].to_numpy()
+        ))
+    if routed:
+        # Vectorized join against the memory-mapped distance matrix
+        route = load_route_graph().lookup_batch(
+            frame["source_city"].to_numpy(), frame["destination_city"].to_numpy()
+        )
+        inputs.update((col, route[col]) for col in routed)
+    for col, default in OPTIONAL_COLUMNS.items():
+        if col in frame.columns:
+            inputs[col] = frame[col].fillna(default).to_numpy()
+        else:
+            inputs[col] = default
+
+    advisory = advisor.get_batch_advisory(**inputs)
+    return pd.concat([frame.reset_index(drop=True), pd.DataFrame(advisory)], axis=1)
+
+
+class _Writer:
+    """Appends scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._parquet = None
+        if _is_parquet(path):
+            _require_pyarrow(path)
+
+    def write(self, frame):
+        if _is_parquet(self.path):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self.rows else "w",
+                         header=not self.rows, index=False)
+        self.rows += len(frame)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+_worker_advisor = None
+
+
+def _init_worker(model_dir):
+    global _worker_advisor
+    _worker_advisor = load_advisor(model_dir)
+
+
+def _score_task(frame):
+    return score_frame(_worker_advisor, frame)
+
+
+def score_file(input_path, output_path, model_dir="ml/models", workers=1,
+               chunk_size=100_000, max_in_flight=None):
+    """Score input_path into output_path; returns a small run summary"""
+
+    start = time.perf_counter()
+    writer = _Writer(output_path)
+    chunks = iter_chunks(input_path, chunk_size)
+
+    try:
+        if workers == 1:
+            advisor = load_advisor(model_dir)
+            for frame in chunks:
+                writer.write(score_frame(advisor, frame))
+        else:
+            max_in_flight = max_in_flight or 2 * workers
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(model_dir,)) as pool:
+                pending = deque()
+                for frame in chunks:
+                    pending.append(pool.submit(_score_task, frame))
+                    if len(pending) >= max_in_flight:
+                        writer.write(pending.popleft().result())
+                while pending:
+                    writer.write(pending.popleft().result())
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": writer.rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(writer.rows / seconds, 1) if seconds else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a journey file into advisories")
+    parser.add_argument("input", help="CSV or Parquet file of journeys")
+    parser.add_argument("output", help="CSV or Parquet file to write")
+    parser.add_argument("--model-dir", default="ml/models")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    summary = score_file(args.input, args.output, model_dir=args.model_dir,
+                         workers=args.workers, chunk_size=args.chunk_size)
+    print(f"✅ Scored {summary['rows']} journeys in {summary['seconds']}s "
+          f"({summary['rows_per_second']} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Small thread-safe in-process LRU cache for reusing prediction results
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Bumped whenever the advisory payload changes shape, so cached entries in
+# the old format are never served
+ADVISORY_FORMAT_VERSION = 4
+
+
+def advisory_cache_key(model_version, params):
+    """Canonical cache key for an advisory request, namespaced by model version"""
+    payload = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return f"{model_version}:v{ADVISORY_FORMAT_VERSION}:{payload}"
+
+
+class DiskCache:
+    """
+    Disk-backed key-value cache shared by every worker process on a host.
+
+    Entries live in a SQLite database in WAL mode, so readers never block
+    each other or the writer. Values are JSON. Each entry records its size
+    and last access time, and the least recently used entries are evicted
+    once the total size exceeds max_bytes. Access times are refreshed at
+    most once per touch_interval seconds to keep reads mostly read-only.
+
+    Writes that still find the database locked after busy_timeout seconds
+    are dropped and counted as write_errors: a cache write must never fail
+    the request that computed the value.
+    """
+
+    def __init__(self, path="data/cache/advisories.sqlite", max_bytes=256 * 1024 * 1024,
+                 touch_interval=60, evict_check_every=256, busy_timeout=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.evict_check_every = evict_check_every
+        self.busy_timeout = busy_timeout
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sets_since_check = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_errors = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        conn = self._connection()
+        row = conn.execute("SELECT value, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return default
+
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            try:
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                conn.commit()
+            except sqlite3.OperationalError:
+                # Another process holds the write lock; recency can wait
+                pass
+
+        return json.loads(row[0])
+
+    def _write_failed(self, conn):
+        conn.rollback()
+        with self._lock:
+            self.write_errors += 1
+
+    def set(self, key, value):
+        """Store value under key; False if the write was dropped under lock contention"""
+
+        blob = json.dumps(value, separators=(",", ":")).encode()
+        conn = self._connection()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time())
+            )
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Busy timeout ran out with another worker writing
+            self._write_failed(conn)
+            return False
+
+        with self._lock:
+            self._sets_since_check += 1
+            check = self._sets_since_check >= self.evict_check_every
+            if check:
+                self._sets_since_check = 0
+        if check:
+            self.evict()
+        return True
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+
+        conn = self._connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        # Free down to 90% so eviction does not run on every insert. One
+        # statement drops the oldest entries whose running size total, before
+        # each of them, is still short of the excess
+        excess = total - int(self.max_bytes * 0.9)
+        try:
+            removed = conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM ("
+                "  SELECT key, SUM(size) OVER (ORDER BY accessed, key) - size AS freed_before"
+                "  FROM entries)"
+                " WHERE freed_before < ?)",
+                (excess,)
+            ).rowcount
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Retried on a later check
+            self._write_failed(conn)
+            return 0
+
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute("DELETE FROM entries")
+        conn.commit()
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self):
+        count, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "write_errors": self.write_errors
+        }
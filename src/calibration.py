@@ -0,0 +1,121 @@
+"""
+Isotonic calibration for the confirmation probability regressor.
+
+The gradient boosting regressor's raw output is not a calibrated
+probability, which matters most around the 0.3 / 0.7 thresholds the
+recommendations use. At training time an isotonic regression is fitted on
+held-out predictions and stored as two lookup arrays (confirm_calibration.npz
+next to the models). Serving applies it to a whole batch with np.interp,
+which reproduces the isotonic fit exactly, and needs no sklearn.
+
+Usage:
+    python src/calibration.py --model-dir ml/models   # (re)fit for existing models
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+CALIBRATION_FILE = "confirm_calibration.npz"
+
+
+def fit_isotonic(raw, target):
+    """Lookup arrays (x, y) of an increasing isotonic map from raw predictions to targets"""
+    from sklearn.isotonic import IsotonicRegression
+
+    isotonic = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+    isotonic.fit(np.asarray(raw, dtype=np.float64), np.asarray(target, dtype=np.float64))
+    return isotonic.X_thresholds_.astype(np.float64), isotonic.y_thresholds_.astype(np.float64)
+
+
+def apply_calibration(raw, calibration):
+    """Calibrated probabilities for a batch of raw predictions; calibration may be None"""
+    if calibration is None:
+        return np.clip(raw, 0, 1)
+    x, y = calibration
+    return np.clip(np.interp(raw, x, y), 0, 1)
+
+
+def save_calibration(model_dir, calibration):
+    x, y = calibration
+    np.savez(os.path.join(model_dir, CALIBRATION_FILE), x=x, y=y)
+
+
+def load_calibration(model_dir):
+    """(x, y) lookup arrays from model_dir, or None when the models are uncalibrated"""
+    path = os.path.join(model_dir, CALIBRATION_FILE)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as stored:
+        return stored["x"], stored["y"]
+
+
+def reliability(probabilities, target, bins=10):
+    """Mean absolute gap between predicted and observed values over equal-width bins"""
+    probabilities = np.asarray(probabilities)
+    target = np.asarray(target)
+    idx = np.minimum((probabilities * bins).astype(int), bins - 1)
+    counts = np.bincount(idx, minlength=bins)
+    gap = np.abs(np.bincount(idx, probabilities, bins) - np.bincount(idx, target, bins))
+    return float(gap.sum() / counts.sum())
+
+
+def split_holdout(raw, target, seed=42):
+    """Halves of a held-out set: one to fit the calibration, one to evaluate it"""
+    order = np.random.default_rng(seed).permutation(len(raw))
+    fit, evaluate = order[: len(order) // 2], order[len(order) // 2:]
+    return (raw[fit], target[fit]), (raw[evaluate], target[evaluate])
+
+
+def calibrate(raw, target):
+    """
+    Fit on half of the held-out predictions and report the reliability gap
+    before and after on the other half. Returns (calibration, report).
+    """
+
+    raw = np.asarray(raw, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    (fit_raw, fit_target), (eval_raw, eval_target) = split_holdout(raw, target)
+
+    calibration = fit_isotonic(fit_raw, fit_target)
+    report = {
+        "raw_gap": reliability(np.clip(eval_raw, 0, 1), eval_target),
+        "calibrated_gap": reliability(apply_calibration(eval_raw, calibration), eval_target),
+        "points": int(len(calibration[0])),
+    }
+    return calibration, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the confirmation calibration for trained models")
+    parser.add_argument("--model-dir", default="ml/models")
+    parser.add_argument("--data", default="data/processed/enhanced_festive_travel_data.csv")
+    args = parser.parse_args()
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    from advisor import FestiveTravelAdvisor
+
+    advisor = FestiveTravelAdvisor(model_dir=args.model_dir)
+    df = pd.read_csv(args.data)
+    columns = {col: df[col].to_numpy() for col in advisor.confirm_features}
+    raw = advisor._predict_confirmation(columns, len(df))
+
+    # Same held-out rows the training script evaluates on
+    _, raw_test, _, y_test = train_test_split(
+        raw, df["confirmation_probability"].to_numpy(), test_size=0.2, random_state=42
+    )
+    calibration, report = calibrate(raw_test, y_test)
+    save_calibration(args.model_dir, calibration)
+
+    print(f"✅ Saved {CALIBRATION_FILE} ({report['points']} points); reliability gap "
+          f"{report['raw_gap']:.4f} -> {report['calibrated_gap']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
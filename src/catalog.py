@@ -0,0 +1,27 @@
+# Enhanced festival data with typical travel patterns. peak_days are
+# days_before_festival offsets; festival dates live in festival_calendar.py.
+# The shipped dataset and models were built from these peak_days: changing
+# them means regenerating the data and retraining, and advisors refuse to
+# load models saved with other offsets (feature_spec.check_peak_days).
+FESTIVALS = {
+    "Diwali": {"rush_multiplier": 0.95, "peak_days": [3, 4, 5], "duration": 5},
+    "Holi": {"rush_multiplier": 0.75, "peak_days": [1, 2], "duration": 3},
+    "Durga Puja": {"rush_multiplier": 0.85, "peak_days": [5, 6, 7], "duration": 10},
+    "Chhath Puja": {"rush_multiplier": 0.90, "peak_days": [1, 2], "duration": 4},
+    "Eid-ul-Fitr": {"rush_multiplier": 0.80, "peak_days": [1], "duration": 3},
+    "Christmas": {"rush_multiplier": 0.70, "peak_days": [24, 25], "duration": 3},
+    "Pongal": {"rush_multiplier": 0.72, "peak_days": [1, 2], "duration": 4}
+}
+
+# Popular routes with typical rush patterns
+POPULAR_ROUTES = [
+    {"from": "Delhi", "to": "Patna", "tier_from": 1, "tier_to": 2, "distance": 1000, "base_rush": 0.85},
+    {"from": "Mumbai", "to": "Kolkata", "tier_from": 1, "tier_to": 1, "distance": 2000, "base_rush": 0.75},
+    {"from": "Bangalore", "to": "Chennai", "tier_from": 1, "tier_to": 1, "distance": 350, "base_rush": 0.65},
+    {"from": "Delhi", "to": "Lucknow", "tier_from": 1, "tier_to": 2, "distance": 500, "base_rush": 0.80},
+    {"from": "Mumbai", "to": "Ahmedabad", "tier_from": 1, "tier_to": 2, "distance": 500, "base_rush": 0.70},
+]
+
+TRAIN_CLASSES = ["Sleeper", "3AC", "2AC", "1AC", "General"]
+TRAIN_TYPES = ["Express", "Superfast", "Rajdhani", "Shatabdi", "Duronto", "Mail"]
+QUOTAS = ["General", "Tatkal", "Ladies", "Senior Citizen", "Premium Tatkal"]
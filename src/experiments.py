@@ -0,0 +1,180 @@
+"""
+A/B and shadow evaluation of a candidate model bundle in the serving path.
+
+A configurable share of /api/predict traffic is answered by the candidate
+(A/B). In shadow mode the candidate additionally scores a sampled share of
+the requests the primary answered, whether or not they came from the
+advisory cache, on a background executor after the response has been
+built, so users never wait for it. Both modes record per-model latency,
+with cache hits kept apart from computed advisories so the variants are
+compared like for like, and how often the two bundles disagree. Shadow
+scoring runs off the request path on a shared executor, so its latency is
+kept in its own window rather than mixed into the candidate's served one.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class LatencyStats:
+    """Rolling latency window for one model variant"""
+
+    def __init__(self, window=2048):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def summary(self):
+        with self._lock:
+            count = self.count
+            ms = np.array(self._samples) * 1000
+        if not ms.size:
+            return {"count": count}
+        return {
+            "count": count,
+            "mean_ms": round(float(ms.mean()), 3),
+            "p50_ms": round(float(np.percentile(ms, 50)), 3),
+            "p95_ms": round(float(np.percentile(ms, 95)), 3),
+            "p99_ms": round(float(np.percentile(ms, 99)), 3)
+        }
+
+
+def compare_advisories(primary, candidate):
+    """Disagreement between two get_complete_advisory results"""
+
+    p_conf = primary["confirmation_probability"]
+    c_conf = candidate["confirmation_probability"]
+
+    return {
+        "rush_level_differs": primary["rush_analysis"]["rush_level"] != candidate["rush_analysis"]["rush_level"],
+        "confirmation_abs_diff": abs(p_conf - c_conf) if p_conf is not None and c_conf is not None else None,
+        "booking_days_diff": abs(primary["optimal_booking_window"]["recommended"]
+                                 - candidate["optimal_booking_window"]["recommended"]),
+        "recommendations_differ": primary["recommendation_codes"] != candidate["recommendation_codes"]
+    }
+
+
+class ModelExperiment:
+    """
+    Routes traffic between a primary and a candidate ModelRegistry and
+    records latency and disagreement. shadow_sample is the share of primary
+    requests the candidate also scores in shadow mode.
+    """
+
+    def __init__(self, primary, candidate, candidate_share=0.0, shadow=False,
+                 shadow_sample=1.0, max_workers=2, max_pending=256):
+        self.primary = primary
+        self.candidate = candidate
+        self.candidate_share = candidate_share
+        self.shadow = shadow
+        self.shadow_sample = shadow_sample
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shadow")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.latency = {"primary": LatencyStats(), "candidate": LatencyStats()}
+        self.cached_latency = {"primary": LatencyStats(), "candidate": LatencyStats()}
+        self.shadow_latency = LatencyStats()
+        self.compared = 0
+        self.rush_disagreements = 0
+        self.recommendation_disagreements = 0
+        self.confirmation_diffs = deque(maxlen=2048)
+        self.booking_diffs = deque(maxlen=2048)
+        self.shadow_errors = 0
+        self.shadow_dropped = 0
+
+    def choose(self):
+        """Pick the variant and advisor that answers this request"""
+        if self.candidate_share > 0 and random.random() < self.candidate_share:
+            return "candidate", self.candidate.current()
+        return "primary", self.primary.current()
+
+    def record_latency(self, variant, seconds, cached=False):
+        (self.cached_latency if cached else self.latency)[variant].record(seconds)
+
+    def submit_shadow(self, params, primary_result):
+        """Score a sampled share of params with the candidate off the request thread"""
+
+        if self.shadow_sample < 1 and random.random() >= self.shadow_sample:
+            return False
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.shadow_dropped += 1
+                return False
+            self._pending += 1
+
+        self._executor.submit(self._run_shadow, self.candidate.current(), params, primary_result)
+        return True
+
+    def _run_shadow(self, advisor, params, primary_result):
+        try:
+            start = time.perf_counter()
+            result = advisor.get_complete_advisory(**params)
+            self.shadow_latency.record(time.perf_counter() - start)
+            self.record_comparison(primary_result, result)
+        except Exception:
+            with self._lock:
+                self.shadow_errors += 1
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def record_comparison(self, primary_result, candidate_result):
+        diff = compare_advisories(primary_result, candidate_result)
+        with self._lock:
+            self.compared += 1
+            self.rush_disagreements += diff["rush_level_differs"]
+            self.recommendation_disagreements += diff["recommendations_differ"]
+            if diff["confirmation_abs_diff"] is not None:
+                self.confirmation_diffs.append(diff["confirmation_abs_diff"])
+            self.booking_diffs.append(diff["booking_days_diff"])
+
+    def drain(self):
+        """Wait for queued shadow work (tests and shutdown)"""
+        self._executor.shutdown(wait=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="shadow")
+
+    def stats(self):
+        with self._lock:
+            compared = self.compared
+            rush_disagreements = self.rush_disagreements
+            recommendation_disagreements = self.recommendation_disagreements
+            confirmation_diffs = list(self.confirmation_diffs)
+            booking_diffs = list(self.booking_diffs)
+            pending, dropped, errors = self._pending, self.shadow_dropped, self.shadow_errors
+
+        return {
+            "candidate_share": self.candidate_share,
+            "shadow": self.shadow,
+            "shadow_sample": self.shadow_sample,
+            "primary_version": self.primary.version,
+            "candidate_version": self.candidate.version,
+            "latency": {name: stats.summary() for name, stats in self.latency.items()},
+            "cached_latency": {name: stats.summary() for name, stats in self.cached_latency.items()},
+            "shadow_latency": self.shadow_latency.summary(),
+            "disagreement": {
+                "compared": compared,
+                "rush_level_rate": round(rush_disagreements / max(1, compared), 4),
+                "recommendations_rate": round(recommendation_disagreements / max(1, compared), 4),
+                "confirmation_mean_abs_diff": round(float(np.mean(confirmation_diffs)), 4)
+                if confirmation_diffs else None,
+                "booking_days_mean_abs_diff": round(float(np.mean(booking_diffs)), 3)
+                if booking_diffs else None
+            },
+            "shadow_pending": pending,
+            "shadow_dropped": dropped,
+            "shadow_errors": errors
+        }
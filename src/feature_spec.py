@@ -0,0 +1,101 @@
+"""
+Declarative feature spec shared by training and serving.
+
+Training scripts build their encoders, scalers and model inputs from these
+lists, and the advisors refuse to load artifacts whose saved feature lists
+disagree with them. Both sides turn a spec entry plus the fitted encoder and
+scaler parameters into a features.CompiledTransform, so a column can never
+be encoded or scaled differently in the two places.
+
+peak_day_proximity is derived from the catalog's festival peak offsets, so
+training saves the offsets it used and the advisors check them the same way.
+"""
+
+import json
+import os
+
+from catalog import FESTIVALS
+
+PEAK_DAYS_FILE = "peak_days.json"
+
+CATEGORICAL_COLUMNS = (
+    "festival", "train_class", "train_type", "quota",
+    "ticket_status", "source_city", "destination_city"
+)
+
+# Every model gets its own StandardScaler over exactly its feature columns
+MODEL_SPECS = {
+    "rush": {
+        "features": [
+            "festival", "days_before_festival", "route_distance_km",
+            "source_city_tier", "destination_city_tier", "peak_day_proximity",
+            "train_class", "train_type", "historical_rush_index"
+        ],
+        "target": "rush_level",
+        "scaled": True
+    },
+    "confirm": {
+        "features": [
+            "current_waitlist_position", "days_to_journey", "train_type",
+            "quota", "train_class", "historical_rush_index", "ticket_status"
+        ],
+        "target": "confirmation_probability",
+        "scaled": True
+    },
+    "booking": {
+        "features": [
+            "festival", "route_distance_km", "source_city_tier",
+            "destination_city_tier", "train_class", "historical_rush_index"
+        ],
+        "target": "optimal_booking_days",
+        "scaled": True,
+        # Window bounds: quantile models of each bound's offset from the
+        # target, over the same features
+        "quantiles": {
+            "lower": {"target": "optimal_booking_window_min", "alpha": 0.1},
+            "upper": {"target": "optimal_booking_window_max", "alpha": 0.9},
+        }
+    },
+    # Legacy transport-mode predictor behind ml/predict_rush.py
+    "multimodal_rush": {
+        "features": ["festival", "transport_mode", "distance_km", "historical_rush_index"],
+        "target": "rush_level",
+        "scaled": False
+    },
+}
+
+
+def check_features(model, features):
+    """Raise ValueError if saved artifacts were trained on other features than the spec"""
+    expected = MODEL_SPECS[model]["features"]
+    if list(features) != expected:
+        raise ValueError(
+            f"{model} model was trained on {list(features)}, feature spec expects {expected}"
+        )
+
+
+def catalog_peak_days():
+    return {name: list(info["peak_days"]) for name, info in FESTIVALS.items()}
+
+
+def save_peak_days(model_dir, peak_days):
+    with open(os.path.join(model_dir, PEAK_DAYS_FILE), "w") as f:
+        json.dump(peak_days, f, indent=2)
+
+
+def load_peak_days(model_dir):
+    """Peak offsets saved with the models, or None for models trained without them"""
+    path = os.path.join(model_dir, PEAK_DAYS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_peak_days(peak_days):
+    """Raise ValueError if models were trained on other festival peak offsets than the catalog's"""
+    expected = catalog_peak_days()
+    if peak_days != expected:
+        raise ValueError(
+            f"models were trained with peak_days {peak_days}, catalog has {expected}"
+        )
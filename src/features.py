@@ -0,0 +1,116 @@
+"""
+Feature helpers shared by the sklearn advisor and the NumPy-only runtime.
+
+Only NumPy is imported here so the lightweight inference path stays fast
+to import.
+"""
+
+import numpy as np
+
+from catalog import FESTIVALS
+
+FESTIVAL_WEIGHTS = {
+    "Diwali": 95, "Chhath Puja": 90, "Durga Puja": 85,
+    "Eid-ul-Fitr": 80, "Holi": 75, "Christmas": 70, "Pongal": 72
+}
+
+CLASS_WEIGHTS = {
+    "General": 85, "Sleeper": 80, "3AC": 70, "2AC": 60, "1AC": 50
+}
+
+
+def map_values(mapping, values, default):
+    """Look up a scalar or an array of keys in a dict, one lookup per distinct key"""
+    if np.ndim(values) == 0:
+        return mapping.get(values.item() if isinstance(values, np.ndarray) else values, default)
+    uniques, inverse = np.unique(np.asarray(values), return_inverse=True)
+    return np.array([mapping.get(u, default) for u in uniques], dtype=np.float64)[inverse]
+
+
+def batch_size(columns):
+    """Number of rows implied by a dict of scalar and array columns"""
+    return max([np.size(v) for v in columns.values() if np.ndim(v) > 0], default=1)
+
+
+def estimate_historical_rush(festival, distance, src_tier, dst_tier, train_class):
+    """Vectorized historical rush index estimate over scalars or arrays"""
+
+    base = map_values(FESTIVAL_WEIGHTS, festival, 70)
+    class_factor = map_values(CLASS_WEIGHTS, train_class, 70)
+    distance_factor = np.minimum(20, np.asarray(distance, dtype=np.float64) / 100)
+    tier_factor = (8 - np.asarray(src_tier) - np.asarray(dst_tier)) * 3
+
+    return np.minimum(100, base * 0.5 + class_factor * 0.3 + distance_factor + tier_factor)
+
+
+PEAK_DAYS = {name: info["peak_days"] for name, info in FESTIVALS.items()}
+
+
+def peak_offsets(festivals, peak_days=PEAK_DAYS):
+    """
+    (n_festivals, width) peak offsets, padded to equal length by repeating
+    each festival's first one. Unknown festivals peak on the day itself.
+    """
+    width = max(len(peak_days.get(name, [0])) for name in festivals)
+    return np.array([(list(peak_days.get(name, [0])) * width)[:width] for name in festivals],
+                    dtype=np.int64)
+
+
+def default_peak_day_proximity(festival, days_before_festival, peak_days=PEAK_DAYS):
+    """
+    Days to the nearest catalog peak offset of each journey's festival, the
+    definition the training data uses. festival and days_before_festival
+    may be scalars or arrays.
+    """
+    uniques, inverse = np.unique(np.asarray(festival), return_inverse=True)
+    peaks = peak_offsets(uniques.tolist(), peak_days)[inverse.reshape(np.shape(festival))]
+    offsets = np.asarray(days_before_festival)[..., None]
+    return np.abs(offsets - peaks).min(axis=-1)
+
+
+class CompiledTransform:
+    """
+    Encode (and optionally standard-scale) one model's feature columns.
+
+    Built once from a feature list, the label vocabularies and the fitted
+    scaler parameters. Categorical columns become a lookup table of codes
+    that are already scaled, numeric columns a single scaling step, so a
+    batch never goes through DataFrame column selection. Unseen labels
+    encode as code 0, or raise ValueError when strict, as LabelEncoder does.
+    """
+
+    def __init__(self, features, label_index, mean=None, scale=None, strict=False):
+        self.features = list(features)
+        self.strict = strict
+        n = len(self.features)
+        self.mean = np.zeros(n) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scale = np.ones(n) if scale is None else np.asarray(scale, dtype=np.float64)
+
+        self._lookups = {}
+        for j, col in enumerate(self.features):
+            if col in label_index:
+                table = {
+                    label: (code - self.mean[j]) / self.scale[j]
+                    for label, code in label_index[col].items()
+                }
+                self._lookups[j] = (table, (0 - self.mean[j]) / self.scale[j])
+
+    def __call__(self, columns, n_rows):
+        """(n_rows, n_features) model input from scalar or array columns"""
+
+        X = np.empty((n_rows, len(self.features)), dtype=np.float64)
+
+        for j, col in enumerate(self.features):
+            values = columns[col]
+            if j in self._lookups:
+                table, unseen = self._lookups[j]
+                labels = np.asarray(values).astype(str)
+                if self.strict:
+                    unknown = [u for u in np.unique(labels).tolist() if u not in table]
+                    if unknown:
+                        raise ValueError(f"Unknown {col}: {', '.join(unknown)}")
+                X[:, j] = map_values(table, labels, unseen)
+            else:
+                X[:, j] = (np.asarray(values, dtype=np.float64) - self.mean[j]) / self.scale[j]
+
+        return X
@@ -0,0 +1,180 @@
+"""
+Festival calendar: journey dates -> days_before_festival and peak proximity.
+
+Every known festival date is held in one sorted int64 index keyed by
+(festival code, day number), so a batch of journey dates for any mix of
+festivals is converted with a single np.searchsorted: the next occurrence of
+each journey's festival on or after its date. Nothing loops per row, so
+millions of dates convert in well under a second.
+
+Christmas falls on a fixed date and is generated for every year in range.
+The lunar festivals (and Pongal, which moves between January 14 and 15)
+come from FESTIVAL_DATES; extend it, or pass dates=..., for later years.
+
+Usage:
+    python src/festival_calendar.py   # micro-benchmark
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from features import PEAK_DAYS, peak_offsets
+
+# Main festival day, from the published Indian holiday calendars
+FESTIVAL_DATES = {
+    "Diwali": [
+        "2020-11-14", "2021-11-04", "2022-10-24", "2023-11-12", "2024-10-31", "2025-10-20",
+        "2026-11-08", "2027-10-29", "2028-10-17", "2029-11-05", "2030-10-26",
+    ],
+    "Holi": [
+        "2020-03-10", "2021-03-29", "2022-03-18", "2023-03-08", "2024-03-25", "2025-03-14",
+        "2026-03-04", "2027-03-22", "2028-03-11", "2029-03-01", "2030-03-20",
+    ],
+    # Vijayadashami, the last day of the puja
+    "Durga Puja": [
+        "2020-10-25", "2021-10-15", "2022-10-05", "2023-10-24", "2024-10-12", "2025-10-02",
+        "2026-10-20", "2027-10-09", "2028-09-27", "2029-10-16", "2030-10-06",
+    ],
+    # Sandhya Arghya, the evening offering
+    "Chhath Puja": [
+        "2020-11-20", "2021-11-10", "2022-10-30", "2023-11-19", "2024-11-07", "2025-10-27",
+        "2026-11-15", "2027-11-04", "2028-10-23", "2029-11-11", "2030-10-31",
+    ],
+    "Eid-ul-Fitr": [
+        "2020-05-25", "2021-05-14", "2022-05-03", "2023-04-22", "2024-04-11", "2025-03-31",
+        "2026-03-21", "2027-03-10", "2028-02-27", "2029-02-15", "2030-02-05",
+    ],
+    "Pongal": [
+        "2020-01-15", "2021-01-14", "2022-01-14", "2023-01-15", "2024-01-15", "2025-01-14",
+        "2026-01-15", "2027-01-15", "2028-01-15", "2029-01-14", "2030-01-14",
+    ],
+}
+
+# Festivals on the same (month, day) every year
+FIXED_DATES = {"Christmas": (12, 25)}
+
+DEFAULT_YEARS = range(2020, 2031)
+
+# Keys are festival code * _STRIDE + day number, shifted to stay non-negative
+_STRIDE = np.int64(1) << 32
+_SHIFT = np.int64(1) << 31
+
+
+def to_days(dates):
+    """Day numbers (days since 1970-01-01) for date strings, dates or datetime64 values"""
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+
+
+class FestivalCalendar:
+    """
+    Sorted (festival, date) index with vectorized lookups. peak_days maps a
+    festival to the days_before_festival offsets where travel peaks, as in
+    catalog.FESTIVALS.
+    """
+
+    def __init__(self, dates=FESTIVAL_DATES, fixed=FIXED_DATES, years=DEFAULT_YEARS, peak_days=None):
+        if peak_days is None:
+            peak_days = PEAK_DAYS
+
+        occurrences = {name: list(days) for name, days in dates.items()}
+        for name, (month, day) in fixed.items():
+            occurrences[name] = [f"{year:04d}-{month:02d}-{day:02d}" for year in years]
+
+        self.festivals = sorted(occurrences)
+        self._code = {name: code for code, name in enumerate(self.festivals)}
+
+        keys = [code * _STRIDE + to_days(occurrences[name]) + _SHIFT
+                for code, name in enumerate(self.festivals)]
+        self._keys = np.sort(np.concatenate(keys))
+
+        self._peaks = peak_offsets(self.festivals, peak_days)
+
+    def festival_dates(self, festival):
+        """Known dates of one festival, ascending"""
+        code = self._codes(festival)
+        days = self._keys[self._keys // _STRIDE == code] % _STRIDE - _SHIFT
+        return days.astype("datetime64[D]")
+
+    def _codes(self, festival):
+        """Festival codes for a name or an array of names, one lookup per distinct name"""
+        uniques, inverse = np.unique(np.asarray(festival), return_inverse=True)
+        unknown = [str(u) for u in uniques if u not in self._code]
+        if unknown:
+            raise ValueError(f"Unknown festival: {', '.join(unknown)}")
+        codes = np.array([self._code[u] for u in uniques], dtype=np.int64)[inverse]
+        return codes.reshape(np.shape(festival))
+
+    def days_before(self, festival, journey_dates):
+        """
+        Days from each journey date to the next occurrence of its festival
+        (0 on the festival day). festival is a name or an array of names.
+        """
+        return self._days_before(festival, self._codes(festival), to_days(journey_dates))
+
+    def _days_before(self, festival, codes, days):
+        queries = codes * _STRIDE + days + _SHIFT
+
+        pos = np.searchsorted(self._keys, queries, side="left")
+        found = self._keys[np.minimum(pos, len(self._keys) - 1)]
+        outside = (pos == len(self._keys)) | (found // _STRIDE != codes)
+        if np.any(outside):
+            names, dates, outside = (np.broadcast_to(a, np.shape(queries)).ravel()
+                                     for a in (festival, days, outside))
+            first = np.flatnonzero(outside)[0]
+            raise ValueError(f"No known {names[first]} date on or after "
+                             f"{dates[first].astype('datetime64[D]')}")
+        return found - queries
+
+    def peak_day_proximity(self, festival, days_before_festival):
+        """
+        Days to the nearest peak travel offset of each journey's festival;
+        the same values as features.default_peak_day_proximity
+        """
+        return self._proximity(self._codes(festival), days_before_festival)
+
+    def _proximity(self, codes, days_before_festival):
+        offsets = np.asarray(days_before_festival)[..., None]
+        return np.abs(offsets - self._peaks[codes]).min(axis=-1)
+
+    def features(self, festival, journey_dates):
+        """Model inputs derived from journey dates, as arrays"""
+        codes = self._codes(festival)
+        days_before = self._days_before(festival, codes, to_days(journey_dates))
+        return {
+            "days_before_festival": days_before,
+            "peak_day_proximity": self._proximity(codes, days_before),
+        }
+
+
+_default_calendar = None
+
+
+def default_calendar():
+    """Shared calendar built from FESTIVAL_DATES, created on first use"""
+    global _default_calendar
+    if _default_calendar is None:
+        _default_calendar = FestivalCalendar()
+    return _default_calendar
+
+
+def benchmark(n_rows=1_000_000, seed=0):
+    """Seconds to convert n_rows random journey dates for a mix of festivals"""
+
+    rng = np.random.default_rng(seed)
+    calendar = default_calendar()
+    festival = rng.choice(calendar.festivals, n_rows)
+    dates = np.datetime64("2024-01-01") + rng.integers(0, 5 * 365, n_rows)
+
+    start = time.perf_counter()
+    calendar.features(festival, dates)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    seconds = benchmark()
+    print(f"⏱️ 1,000,000 journey dates -> features in {seconds * 1000:.0f} ms")
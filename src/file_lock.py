@@ -0,0 +1,43 @@
+"""
+Advisory file locks for coordinating processes on one host.
+
+Gunicorn workers import app.py independently, so work that must happen once
+per host (cache warm-up) or writes that must not interleave (the heatmap
+manifest) take an flock on a sidecar .lock file. Locks are released when
+the holder closes the file or dies. On platforms without fcntl the locks
+degrade to no-ops, which is safe for the single-process dev server.
+"""
+
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+@contextlib.contextmanager
+def file_lock(path, blocking=True):
+    """
+    Hold an exclusive lock on path for the duration of the block. Yields
+    True once held, or False if blocking is off and another process holds it.
+    """
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "a") as f:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
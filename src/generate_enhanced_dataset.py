@@ -1,34 +1,17 @@
 import random
+import os
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
 random.seed(42)
 np.random.seed(42)
 
-# Enhanced festival data with typical travel patterns
-FESTIVALS = {
-    "Diwali": {"rush_multiplier": 0.95, "peak_days": [3, 4, 5], "duration": 5},
-    "Holi": {"rush_multiplier": 0.75, "peak_days": [1, 2], "duration": 3},
-    "Durga Puja": {"rush_multiplier": 0.85, "peak_days": [5, 6, 7], "duration": 10},
-    "Chhath Puja": {"rush_multiplier": 0.90, "peak_days": [1, 2], "duration": 4},
-    "Eid-ul-Fitr": {"rush_multiplier": 0.80, "peak_days": [1], "duration": 3},
-    "Christmas": {"rush_multiplier": 0.70, "peak_days": [24, 25], "duration": 3},
-    "Pongal": {"rush_multiplier": 0.72, "peak_days": [1, 2], "duration": 4}
-}
-
-# Popular routes with typical rush patterns
-POPULAR_ROUTES = [
-    {"from": "Delhi", "to": "Patna", "tier_from": 1, "tier_to": 2, "distance": 1000, "base_rush": 0.85},
-    {"from": "Mumbai", "to": "Kolkata", "tier_from": 1, "tier_to": 1, "distance": 2000, "base_rush": 0.75},
-    {"from": "Bangalore", "to": "Chennai", "tier_from": 1, "tier_to": 1, "distance": 350, "base_rush": 0.65},
-    {"from": "Delhi", "to": "Lucknow", "tier_from": 1, "tier_to": 2, "distance": 500, "base_rush": 0.80},
-    {"from": "Mumbai", "to": "Ahmedabad", "tier_from": 1, "tier_to": 2, "distance": 500, "base_rush": 0.70},
-]
-
-TRAIN_CLASSES = ["Sleeper", "3AC", "2AC", "1AC", "General"]
-TRAIN_TYPES = ["Express", "Superfast", "Rajdhani", "Shatabdi", "Duronto", "Mail"]
-QUOTAS = ["General", "Tatkal", "Ladies", "Senior Citizen", "Premium Tatkal"]
+# Festival, route and train catalog shared with the serving code
+from catalog import FESTIVALS, POPULAR_ROUTES, TRAIN_CLASSES, TRAIN_TYPES, QUOTAS
 
 def generate_waitlist_confirmation_probability(waitlist_pos, days_to_journey, train_type, quota):
     """Calculate realistic confirmation probability based on multiple factors"""
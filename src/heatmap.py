@@ -0,0 +1,263 @@
+"""
+Festival x route x day rush / confirmation heatmap for capacity planning.
+
+Each route in the route catalog (POPULAR_ROUTES plus the local routes file
+behind the route graph) is one slice covering every festival and day.
+Slices are computed in parallel over a process pool and stored as columnar
+.npz files next to a manifest, so adding a route (or changing the models)
+recomputes only the slices whose fingerprint changed. Every app worker may
+write slices, so manifest updates happen under a file lock and land with an
+atomic replace.
+
+Usage:
+    python src/heatmap.py --workers 4 --output data/heatmap --routes data/routes.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor import FestiveTravelAdvisor, model_bundle_version
+from catalog import FESTIVALS
+from file_lock import file_lock
+from route_graph import ROUTES_FILE, read_routes
+
+DEFAULT_CONFIG = {
+    "days_min": 0,
+    "days_max": 120,
+    "train_class": "Sleeper",
+    "train_type": "Express",
+    "quota": "General",
+    "waitlist_position": 20
+}
+
+
+def route_key(route):
+    return f"{route['from']}-{route['to']}".replace(" ", "_")
+
+
+def slice_fingerprint(route, festivals, config, model_version):
+    payload = json.dumps([route, festivals, config, model_version], sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def compute_slice(advisor, route, festivals, config):
+    """Score every festival x day cell of one route in one batched pass per model"""
+
+    days = np.arange(config["days_min"], config["days_max"] + 1)
+    festival_idx, day_idx = np.divmod(np.arange(len(festivals) * len(days)), len(days))
+    festival_col = np.asarray(festivals)[festival_idx]
+    day_col = days[day_idx]
+
+    historical = advisor._estimate_historical_rush_batch(
+        festival_col, route["distance"], route["tier_from"],
+        route["tier_to"], config["train_class"]
+    )
+
+    _, probabilities = advisor.predict_rush_batch(
+        festival=festival_col,
+        days_before_festival=day_col,
+        route_distance_km=route["distance"],
+        source_city_tier=route["tier_from"],
+        destination_city_tier=route["tier_to"],
+        train_class=config["train_class"],
+        train_type=config["train_type"],
+        historical_rush_index=historical
+    )
+
+    confirmation = advisor.predict_confirmation_batch(
+        current_waitlist_position=config["waitlist_position"],
+        days_to_journey=day_col,
+        train_type=config["train_type"],
+        quota=config["quota"],
+        train_class=config["train_class"],
+        historical_rush_index=historical
+    )
+
+    high = np.flatnonzero(advisor.rush_labels == "High")
+    high_proba = probabilities[:, high[0]] if high.size else np.zeros(len(day_col))
+    shape = (len(festivals), len(days))
+
+    return {
+        "festivals": np.asarray(festivals),
+        "days_before_festival": days.astype(np.int16),
+        "rush_labels": advisor.rush_labels.astype(str),
+        "rush_level": probabilities.argmax(axis=1).astype(np.int8).reshape(shape),
+        "high_rush_probability": high_proba.astype(np.float32).reshape(shape),
+        "confirmation_probability": confirmation.astype(np.float32).reshape(shape)
+    }
+
+
+# Process-pool workers each hold their own advisor
+_worker_advisor = None
+
+
+def _init_worker(model_dir):
+    global _worker_advisor
+    _worker_advisor = FestiveTravelAdvisor(model_dir=model_dir)
+
+
+def _compute_slice_task(route, festivals, config):
+    return compute_slice(_worker_advisor, route, festivals, config)
+
+
+class HeatmapStore:
+    """
+    Columnar heatmap slices on disk, one .npz per route plus a manifest of
+    fingerprints. Stale or missing slices are recomputed individually.
+    """
+
+    def __init__(self, output_dir="data/heatmap", routes=None, festivals=None, config=None,
+                 routes_file=ROUTES_FILE):
+        self.output_dir = output_dir
+        self.routes = routes if routes is not None else read_routes(routes_file)
+        self.festivals = festivals if festivals is not None else list(FESTIVALS)
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        self.manifest_path = os.path.join(output_dir, "manifest.json")
+        self._loaded = {}
+
+    def _read_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {"slices": {}}
+
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _slice_path(self, route):
+        return os.path.join(self.output_dir, f"{route_key(route)}.npz")
+
+    def _fingerprint(self, route, model_version):
+        return slice_fingerprint(route, self.festivals, self.config, model_version)
+
+    def stale_routes(self, model_version):
+        """Routes whose stored slice is missing or was built from other inputs"""
+        slices = self._read_manifest()["slices"]
+        return [
+            route for route in self.routes
+            if slices.get(route_key(route), {}).get("fingerprint") != self._fingerprint(route, model_version)
+            or not os.path.exists(self._slice_path(route))
+        ]
+
+    def _save_slice(self, route, data, model_version):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = self._slice_path(route)
+        tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp.npz"
+        np.savez(tmp_path, **data)
+        os.replace(tmp_path, path)
+
+        # Read-modify-write across threads and processes, one writer at a time
+        with file_lock(self.manifest_path + ".lock"):
+            manifest = self._read_manifest()
+            manifest["slices"][route_key(route)] = {
+                "file": os.path.basename(path),
+                "fingerprint": self._fingerprint(route, model_version),
+                "model_version": model_version
+            }
+            self._write_manifest(manifest)
+            self._loaded.pop(route_key(route), None)
+
+    def build(self, model_dir="ml/models", workers=None, force=False, model_version=None):
+        """Recompute stale slices in parallel; returns the rebuilt route keys"""
+
+        if model_version is None:
+            model_version = model_bundle_version(model_dir)
+
+        routes = self.routes if force else self.stale_routes(model_version)
+        if not routes:
+            return []
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_dir,)) as pool:
+            futures = [
+                (route, pool.submit(_compute_slice_task, route, self.festivals, self.config))
+                for route in routes
+            ]
+            for route, future in futures:
+                self._save_slice(route, future.result(), model_version)
+
+        return [route_key(route) for route in routes]
+
+    def get_slice(self, route, advisor=None):
+        """
+        Load one route slice, recomputing it in-process with advisor when it
+        is missing or stale
+        """
+
+        key = route_key(route)
+        version = advisor.model_version if advisor is not None else None
+
+        cached = self._loaded.get(key)
+        if cached is not None and version in (None, cached[0]):
+            return cached[1]
+
+        if advisor is not None and route in self.stale_routes(version):
+            data = compute_slice(advisor, route, self.festivals, self.config)
+            self._save_slice(route, data, version)
+        elif not os.path.exists(self._slice_path(route)):
+            raise FileNotFoundError(f"No heatmap slice for route {key}. Run src/heatmap.py first")
+
+        with np.load(self._slice_path(route)) as stored:
+            data = {name: stored[name] for name in stored.files}
+        stored_version = self._read_manifest()["slices"].get(key, {}).get("model_version")
+        self._loaded[key] = (stored_version, data)
+        return data
+
+    def to_dict(self, route, festival=None, advisor=None):
+        """
+        Per-festival view of a route slice, optionally for one festival.
+        Probabilities stay float32 arrays for serialization.encode_json.
+        """
+
+        data = self.get_slice(route, advisor=advisor)
+        festivals = data["festivals"].tolist()
+        rows = [festivals.index(festival)] if festival in festivals else range(len(festivals))
+        labels = data["rush_labels"]
+
+        return {
+            "from": route["from"],
+            "to": route["to"],
+            "distance_km": route["distance"],
+            "festivals": {
+                festivals[i]: {
+                    "rush_level": labels[data["rush_level"][i]].tolist(),
+                    "high_rush_probability": np.round(data["high_rush_probability"][i], 3),
+                    "confirmation_probability": np.round(data["confirmation_probability"][i], 3)
+                }
+                for i in rows
+            }
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the festival x route x day heatmap")
+    parser.add_argument("--model-dir", default="ml/models")
+    parser.add_argument("--output", default="data/heatmap")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--routes", default=ROUTES_FILE, help="Local routes JSON added to the catalog")
+    parser.add_argument("--force", action="store_true", help="Recompute every slice")
+    args = parser.parse_args()
+
+    store = HeatmapStore(output_dir=args.output, routes_file=args.routes)
+    rebuilt = store.build(model_dir=args.model_dir, workers=args.workers, force=args.force)
+
+    if rebuilt:
+        print(f"✅ Rebuilt {len(rebuilt)} slice(s): {', '.join(rebuilt)}")
+    else:
+        print("✅ Heatmap is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Inference-only advisor that needs nothing but NumPy.
+
+The trained sklearn models, label encoders and scalers are exported once
+into a bundle directory (bundle.json + arrays.npz). LiteAdvisor serves the
+same API as FestiveTravelAdvisor from that bundle without importing pandas,
+joblib or sklearn, which keeps cold start for short-lived workers small.
+
+Usage:
+    python src/lite_advisor.py export --model-dir ml/models --bundle-dir ml/models/lite
+    python src/lite_advisor.py bench --model-dir ml/models --bundle-dir ml/models/lite
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor_base import BaseAdvisor, model_bundle_version
+from feature_spec import check_features, check_peak_days
+from features import CompiledTransform
+from tree_engine import TreeEnsemble
+
+BUNDLE_FORMAT_VERSION = 1
+
+MODELS = ("rush", "confirm", "booking")
+
+
+def export_bundle(advisor, bundle_dir):
+    """Export a loaded FestiveTravelAdvisor into a NumPy/JSON bundle"""
+
+    ensembles = {
+        "rush": TreeEnsemble.from_sklearn(
+            advisor.rush_model.estimators_, normalize=True, aggregate="mean"
+        ),
+        "confirm": _boosting_ensemble(advisor.confirm_model),
+        # Recommended days and window bounds stacked into one multi-output
+        # ensemble, so serving walks every booking tree in a single pass
+        "booking": TreeEnsemble.stack([
+            _boosting_ensemble(model)
+            for model in (advisor.booking_model, *advisor.booking_quantile_models)
+        ]),
+    }
+    scalers = {
+        "rush": advisor.rush_scaler,
+        "confirm": advisor.confirm_scaler,
+        "booking": advisor.booking_scaler,
+    }
+    features = {
+        "rush": list(advisor.rush_features),
+        "confirm": list(advisor.confirm_features),
+        "booking": list(advisor.booking_features),
+    }
+
+    arrays = {}
+    meta = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "source_model_version": advisor.model_version,
+        "features": features,
+        "label_classes": {
+            col: [str(c) for c in encoder.classes_]
+            for col, encoder in advisor.label_encoders.items()
+        },
+        "rush_labels": [str(label) for label in advisor.rush_labels],
+        "rush_feature_info": advisor.rush_feature_info,
+        "input_profile": advisor.input_profile,
+        "peak_days": advisor.peak_days,
+        "ensembles": {},
+    }
+
+    for name in MODELS:
+        tree_arrays, tree_meta = ensembles[name].to_arrays(name)
+        arrays.update(tree_arrays)
+        meta["ensembles"][name] = tree_meta
+        arrays[f"{name}_scaler_mean"] = np.asarray(scalers[name].mean_, dtype=np.float64)
+        arrays[f"{name}_scaler_scale"] = np.asarray(scalers[name].scale_, dtype=np.float64)
+
+    if advisor.confirm_calibration is not None:
+        arrays["confirm_calibration_x"], arrays["confirm_calibration_y"] = advisor.confirm_calibration
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    np.savez_compressed(os.path.join(bundle_dir, "arrays.npz"), **arrays)
+    with open(os.path.join(bundle_dir, "bundle.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    return bundle_dir
+
+
+def _boosting_ensemble(model):
+    """Flatten a fitted GradientBoostingRegressor"""
+    init = getattr(model.init_, "constant_", 0.0)
+    return TreeEnsemble.from_sklearn(
+        model.estimators_[:, 0], aggregate="sum",
+        scale=float(model.learning_rate), offset=float(np.ravel(init)[0])
+    )
+
+
+class LiteAdvisor(BaseAdvisor):
+    """
+    FestiveTravelAdvisor API served from an exported NumPy/JSON bundle
+    """
+
+    def __init__(self, bundle_dir="ml/models/lite"):
+        with open(os.path.join(bundle_dir, "bundle.json")) as f:
+            meta = json.load(f)
+
+        if meta.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format in {bundle_dir}")
+
+        with np.load(os.path.join(bundle_dir, "arrays.npz")) as stored:
+            arrays = {name: stored[name] for name in stored.files}
+
+        self.bundle_dir = bundle_dir
+        self.model_dir = bundle_dir
+        self.model_version = model_bundle_version(bundle_dir)
+        self.source_model_version = meta["source_model_version"]
+
+        self.ensembles = {
+            name: TreeEnsemble.from_arrays(arrays, name, meta["ensembles"][name])
+            for name in MODELS
+        }
+
+        self.rush_features = meta["features"]["rush"]
+        self.confirm_features = meta["features"]["confirm"]
+        self.booking_features = meta["features"]["booking"]
+        for name in MODELS:
+            check_features(name, meta["features"][name])
+        self.peak_days = meta.get("peak_days")
+        if self.peak_days is not None:
+            check_peak_days(self.peak_days)
+
+        self.rush_ensemble = self.ensembles["rush"]
+        self.confirm_calibration = None
+        if "confirm_calibration_x" in arrays:
+            self.confirm_calibration = (arrays["confirm_calibration_x"], arrays["confirm_calibration_y"])
+        self.rush_labels = np.array(meta["rush_labels"])
+        self.rush_feature_info = meta["rush_feature_info"]
+        self.input_profile = meta.get("input_profile")
+        self._label_index = {
+            col: {label: i for i, label in enumerate(classes)}
+            for col, classes in meta["label_classes"].items()
+        }
+        self.transforms = {
+            name: CompiledTransform(
+                meta["features"][name], self._label_index,
+                arrays[f"{name}_scaler_mean"], arrays[f"{name}_scaler_scale"]
+            )
+            for name in MODELS
+        }
+
+        self._init_shared()
+
+    def _predict_rush_proba(self, columns, n_rows):
+        X = self.transforms["rush"](columns, n_rows)
+        return self.ensembles["rush"].predict(X)
+
+    def _predict_confirmation(self, columns, n_rows):
+        X = self.transforms["confirm"](columns, n_rows)
+        return self.ensembles["confirm"].predict(X)[:, 0]
+
+    def _predict_booking_window(self, columns, n_rows):
+        X = self.transforms["booking"](columns, n_rows)
+        return self.ensembles["booking"].predict(X)
+
+
+_BENCH_SNIPPETS = {
+    "sklearn": (
+        "from advisor import FestiveTravelAdvisor as A; a = A(model_dir={path!r})"
+    ),
+    "lite": (
+        "from lite_advisor import LiteAdvisor as A; a = A(bundle_dir={path!r})"
+    ),
+}
+
+_BENCH_TEMPLATE = """
+import sys, time, io, contextlib
+sys.path.insert(0, {src!r})
+t0 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    {snippet}
+t1 = time.perf_counter()
+a.predict_rush_level("Diwali", 20, 1000, 1, 2, "Sleeper", "Superfast")
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1, int("pandas" in sys.modules), int("sklearn" in sys.modules))
+"""
+
+
+def benchmark_startup(model_dir, bundle_dir, repeats=3):
+    """
+    Time import + model load and the first prediction for both paths, each
+    in a fresh interpreter so import caches do not leak between runs
+    """
+
+    src = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+
+    for name, path in (("sklearn", model_dir), ("lite", bundle_dir)):
+        code = _BENCH_TEMPLATE.format(
+            src=src, snippet=_BENCH_SNIPPETS[name].format(path=path)
+        )
+        runs = []
+        for _ in range(repeats):
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                 text=True, check=True)
+            runs.append([float(v) for v in out.stdout.split()])
+        runs = np.array(runs)
+        results[name] = {
+            "load_seconds": float(np.median(runs[:, 0])),
+            "first_prediction_seconds": float(np.median(runs[:, 1])),
+            "imports_pandas": bool(runs[0, 2]),
+            "imports_sklearn": bool(runs[0, 3]),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy-only inference bundle tools")
+    parser.add_argument("command", choices=["export", "bench"])
+    parser.add_argument("--model-dir", default="ml/models")
+    parser.add_argument("--bundle-dir", default="ml/models/lite")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        from advisor import FestiveTravelAdvisor
+        export_bundle(FestiveTravelAdvisor(model_dir=args.model_dir), args.bundle_dir)
+        print(f"✅ Exported lightweight bundle to {args.bundle_dir}")
+        return
+
+    results = benchmark_startup(args.model_dir, args.bundle_dir)
+    print("\n⏱️ Cold start (import + load, median of 3 fresh interpreters)")
+    for name, r in results.items():
+        print(f"  - {name:8s} load {r['load_seconds'] * 1000:8.1f} ms | "
+              f"first prediction {r['first_prediction_seconds'] * 1000:7.1f} ms | "
+              f"pandas={r['imports_pandas']} sklearn={r['imports_sklearn']}")
+    speedup = results["sklearn"]["load_seconds"] / results["lite"]["load_seconds"]
+    print(f"\n🚀 Lightweight path starts {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
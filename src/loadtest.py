@@ -0,0 +1,553 @@
+"""
+End-to-end load tests for the advisory API.
+
+Starts the service (src/app.py under gunicorn or the Flask dev server, or a
+stand-in stub with canned responses and configurable latency) for each
+configuration in a matrix of worker count x advisory cache on/off x single
+or batch requests, and drives it with open-loop Poisson arrivals at a
+target rate. Requests are sent on schedule whether or not earlier ones have
+returned, so a saturated server shows up as growing latency, measured from
+the scheduled send time, instead of a politely slower client.
+
+Each run records latency percentiles, error rates and status codes, plus CPU
+and RSS per server process (gunicorn master and workers) sampled from /proc
+(Linux only). Request mixes are synthetic, drawn from the catalog, or
+replayed from request logs. Results are written as JSON plus a markdown
+comparison table. /api/advisory/batch never reads the advisory cache, so
+batch mode runs once per worker count with the cache off and reports the
+cache column as n/a.
+
+Usage:
+    python src/loadtest.py run --workers 1,4 --cache on,off --mode single,batch --rate 50 --duration 30
+    python src/loadtest.py run --server dev --log data/request_logs/*.jsonl.gz
+    python src/loadtest.py run --url http://127.0.0.1:3000 --mode single   # already running
+    python src/loadtest.py stub --port 3000 --latency-ms 20                # stand-in API
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from catalog import FESTIVALS, POPULAR_ROUTES, QUOTAS, TRAIN_CLASSES, TRAIN_TYPES
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SRC_DIR)
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+# ===============================
+# REQUEST MIXES
+# ===============================
+
+def synthetic_requests(n, seed=0):
+    """n /api/predict payloads drawn from the catalog"""
+
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(n):
+        route = rng.choice(POPULAR_ROUTES)
+        payloads.append({
+            "festival": rng.choice(list(FESTIVALS)),
+            "days_before_festival": rng.randint(0, 120),
+            "source_city": route["from"],
+            "destination_city": route["to"],
+            "route_distance_km": route["distance"],
+            "source_city_tier": route["tier_from"],
+            "destination_city_tier": route["tier_to"],
+            "train_class": rng.choice(TRAIN_CLASSES),
+            "train_type": rng.choice(TRAIN_TYPES),
+            "current_waitlist_position": rng.choice([0, 0, rng.randint(1, 300)]),
+            "quota": rng.choice(QUOTAS),
+        })
+    return payloads
+
+
+def logged_requests(paths, limit=None):
+    """
+    Validated /api/predict payloads replayed from request logs, in log order,
+    with route fields filled for requests that carry only city names
+    """
+    from warmup import iter_log_requests
+
+    return list(itertools.islice(iter_log_requests(paths), limit))
+
+
+def build_bodies(payloads, mode, batch_size=50):
+    """(path, encoded body, journeys) per request for single or batch mode"""
+
+    if mode == "single":
+        return [("/api/advisory", json.dumps(p).encode(), 1) for p in payloads]
+    if mode == "batch":
+        return [
+            ("/api/advisory/batch", json.dumps({"journeys": payloads[i:i + batch_size]}).encode(),
+             len(payloads[i:i + batch_size]))
+            for i in range(0, len(payloads), batch_size)
+        ]
+    raise ValueError(f"Unknown mode {mode!r}")
+
+
+# ===============================
+# OPEN-LOOP LOAD GENERATION
+# ===============================
+
+def poisson_schedule(rate, duration, seed=0):
+    """Send offsets in seconds for Poisson arrivals at rate per second"""
+
+    rng = np.random.default_rng(seed)
+    # Draw comfortably more gaps than needed, then cut at duration
+    gaps = rng.exponential(1.0 / rate, int(rate * duration * 1.5) + 20)
+    offsets = np.cumsum(gaps)
+    while offsets[-1] < duration:
+        offsets = np.concatenate([offsets, offsets[-1] + np.cumsum(rng.exponential(1.0 / rate, len(gaps)))])
+    return offsets[offsets < duration]
+
+
+def run_load(url, bodies, rate, duration, max_in_flight=256, timeout=10.0, seed=0):
+    """
+    Replay bodies (cycled) against url on a Poisson schedule. Returns one
+    record per scheduled request: scheduled, sent and done times (seconds
+    from start), HTTP status (the exception name when the request failed
+    on the client side, None when dropped) and journeys carried.
+    """
+
+    schedule = poisson_schedule(rate, duration, seed)
+    records = [None] * len(schedule)
+    local = threading.local()
+    in_flight = threading.Semaphore(max_in_flight)
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def send(i, scheduled, start, body):
+        path, data, journeys = body
+        sent = time.perf_counter() - start
+        status = "Error"
+        try:
+            response = session().post(url + path, data=data, timeout=timeout,
+                                      headers={"Content-Type": "application/json"})
+            status = response.status_code
+        except Exception as e:
+            # Any client-side failure is an error of this run, never a crash
+            status = type(e).__name__
+        finally:
+            in_flight.release()
+            records[i] = (scheduled, sent, time.perf_counter() - start, status, journeys)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        start = time.perf_counter()
+        for i, (scheduled, body) in enumerate(zip(schedule, itertools.cycle(bodies))):
+            delay = scheduled - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+            # Open loop: never wait for a slot; a full client counts as a drop
+            if not in_flight.acquire(blocking=False):
+                records[i] = (scheduled, None, None, None, body[2])
+                continue
+            pool.submit(send, i, scheduled, start, body)
+
+    return records
+
+
+def summarize(records, duration):
+    """Latency percentiles (ms), error rate and throughput for run_load records"""
+
+    # A record the sender never filled in counts as a client-side error
+    records = [r if r is not None else (None, None, 0.0, "Error", 0) for r in records]
+    done = [r for r in records if r[2] is not None]
+    ok = [r for r in done if isinstance(r[3], int) and r[3] < 400]
+    latency = np.array([(r[2] - r[0]) * 1000 for r in ok])
+    service = np.array([(r[2] - r[1]) * 1000 for r in ok])
+
+    def stats(values):
+        if not values.size:
+            return None
+        return {
+            **{f"p{p:g}": round(float(np.percentile(values, p)), 2) for p in PERCENTILES},
+            "mean": round(float(values.mean()), 2),
+            "max": round(float(values.max()), 2),
+        }
+
+    statuses = {}
+    for r in done:
+        key = str(r[3])
+        statuses[key] = statuses.get(key, 0) + 1
+
+    return {
+        "scheduled": len(records),
+        "completed": len(ok),
+        "errors": len(done) - len(ok),
+        "dropped": len(records) - len(done),
+        "error_rate": round((len(records) - len(ok)) / len(records), 4) if records else None,
+        "throughput_rps": round(len(ok) / duration, 2),
+        "journeys_per_second": round(sum(r[4] for r in ok) / duration, 2),
+        "latency_ms": stats(latency),
+        "service_ms": stats(service),
+        "status_codes": statuses,
+    }
+
+
+# ===============================
+# PER-PROCESS CPU / RSS
+# ===============================
+
+def _read_proc(pid):
+    """(cpu seconds, rss bytes) of one process from /proc, or None once it is gone"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    # utime and stime are fields 14 and 15 of stat, 12 and 13 after the command
+    return (int(fields[11]) + int(fields[12])) / ticks, rss_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _children(pid):
+    children = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        children.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    return children
+
+
+class ProcessSampler:
+    """
+    Background sampler of CPU and RSS for a server process and its direct
+    children (gunicorn workers). Needs Linux /proc; elsewhere reports None.
+    """
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._samples = {}
+
+    def _sample(self):
+        now = time.perf_counter()
+        for pid in [self.pid] + _children(self.pid):
+            reading = _read_proc(pid)
+            if reading is not None:
+                self._samples.setdefault(pid, []).append((now, *reading))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if os.path.isdir("/proc"):
+            self._sample()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Per-process CPU percent over the sampled span and mean/peak RSS"""
+        if self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+        processes = []
+        for pid, samples in sorted(self._samples.items()):
+            times, cpu, rss = (np.array(column) for column in zip(*samples))
+            span = times[-1] - times[0]
+            processes.append({
+                "pid": pid,
+                "role": "main" if pid == self.pid else "worker",
+                "cpu_percent": round(float((cpu[-1] - cpu[0]) / span * 100), 1) if span > 0 else None,
+                "rss_mb_mean": round(float(rss.mean()) / 2 ** 20, 1),
+                "rss_mb_peak": round(float(rss.max()) / 2 ** 20, 1),
+            })
+        return processes
+
+
+# ===============================
+# SERVERS UNDER TEST
+# ===============================
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_command(server, port, workers=1, stub_options=()):
+    if server == "gunicorn":
+        return [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}",
+                "--chdir", BASE_DIR, "--pythonpath", SRC_DIR, "app:app"]
+    if server == "dev":
+        return [sys.executable, "-c",
+                f"import sys; sys.path.insert(0, {SRC_DIR!r}); import app; "
+                f"app.app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    if server == "stub":
+        return [sys.executable, os.path.abspath(__file__), "stub", "--port", str(port), *stub_options]
+    raise ValueError(f"Unknown server {server!r}")
+
+
+class ServerProcess:
+    """One server under test, started with the configuration's environment"""
+
+    def __init__(self, server, workers=1, cache=True, stub_options=(), startup_timeout=60):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._tmp = tempfile.TemporaryDirectory(prefix="loadtest-")
+        env = dict(
+            os.environ,
+            ADVISORY_CACHE="1" if cache else "0",
+            # Every run starts from a cold cache of its own
+            ADVISORY_CACHE_PATH=os.path.join(self._tmp.name, "advisories.sqlite"),
+            REQUEST_LOG="0",
+        )
+        self._log = open(os.path.join(self._tmp.name, "server.log"), "w+")
+        self.process = subprocess.Popen(
+            server_command(server, self.port, workers, stub_options), cwd=BASE_DIR, env=env,
+            stdout=self._log, stderr=subprocess.STDOUT
+        )
+        self._wait_ready(startup_timeout)
+
+    def _wait_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if requests.get(self.url + "/health", timeout=1).ok:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+
+        self.stop()
+        self._log.seek(0)
+        raise RuntimeError(f"Server did not become ready:\n{self._log.read()[-2000:]}")
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self._log.close()
+        self._tmp.cleanup()
+
+
+def run_config(config, payloads, rate, duration, batch_size=50, warmup_requests=20,
+               url=None, stub_options=(), **load_kwargs):
+    """Start the configured server (unless url is given), load it and summarize"""
+
+    bodies = build_bodies(payloads, config["mode"], batch_size)
+    server = None
+    if url is None:
+        server = ServerProcess(config["server"], config["workers"], bool(config["cache"]), stub_options)
+        url = server.url
+
+    try:
+        # Import-time and first-request costs stay out of the measurement
+        with requests.Session() as session:
+            for path, data, _ in bodies[:warmup_requests]:
+                session.post(url + path, data=data, headers={"Content-Type": "application/json"})
+
+        sampler = ProcessSampler(server.process.pid).start() if server is not None else None
+        records = run_load(url, bodies, rate, duration, **load_kwargs)
+        processes = sampler.stop() if sampler is not None else None
+    finally:
+        if server is not None:
+            server.stop()
+
+    return {"config": config, "rate": rate, "duration": duration,
+            **summarize(records, duration), "processes": processes}
+
+
+def config_matrix(server, workers=(1,), cache=(True,), modes=("single",)):
+    """
+    Worker x cache x mode configs. Batch requests bypass the advisory cache,
+    so batch mode gets one config per worker count with cache None (off).
+    """
+
+    configs = []
+    for w, c, m in itertools.product(workers, cache, modes):
+        config = {"server": server, "workers": w, "cache": None if m == "batch" else c, "mode": m}
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+CACHE_LABELS = {True: "on", False: "off", None: "n/a"}
+
+
+def format_report(results):
+    """Markdown table comparing run_config results"""
+
+    lines = [
+        "| server | workers | cache | mode | rps | journeys/s | p50 ms | p99 ms | errors | dropped | CPU % | RSS MB |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        c, latency, processes = r["config"], r["latency_ms"] or {}, r["processes"] or []
+        cpu = sum(p["cpu_percent"] or 0 for p in processes) if processes else None
+        rss = sum(p["rss_mb_peak"] for p in processes) if processes else None
+        lines.append(
+            f"| {c['server']} | {c['workers']} | {CACHE_LABELS[c['cache']]} | {c['mode']} "
+            f"| {r['throughput_rps']} | {r['journeys_per_second']} | {latency.get('p50', '-')} "
+            f"| {latency.get('p99', '-')} | {r['error_rate']:.2%} | {r['dropped']} "
+            f"| {'-' if cpu is None else round(cpu, 1)} | {'-' if rss is None else round(rss, 1)} |"
+        )
+    return "\n".join(lines)
+
+
+# ===============================
+# STAND-IN API
+# ===============================
+
+def make_stub_server(port=0, latency_ms=20.0, per_journey_ms=1.0, error_rate=0.0, busy=False):
+    """
+    Threaded HTTP server answering /health and the advisory endpoints with
+    canned responses after a fixed delay (plus per_journey_ms per batch
+    journey). busy spins instead of sleeping, to stand in for CPU-bound work.
+    """
+
+    canned = json.dumps({"success": True, "data": {
+        "rush_analysis": {"rush_level": "High", "confidence": 0.9},
+        "confirmation_probability": 0.42,
+        "optimal_booking_window": {"optimal_min": 45, "optimal_max": 60, "recommended": 52},
+        "recommendations": [], "recommendation_codes": [],
+    }}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Model-Version", "stub")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, b'{"status": "healthy"}')
+            else:
+                self._reply(404, b'{"success": false, "error": "not found"}')
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path not in ("/api/predict", "/api/advisory", "/api/advisory/batch"):
+                return self._reply(404, b'{"success": false, "error": "not found"}')
+
+            journeys = len(json.loads(body)["journeys"]) if self.path.endswith("/batch") else 1
+            delay = (latency_ms + per_journey_ms * (journeys - 1)) / 1000
+            if busy:
+                end = time.perf_counter() + delay
+                while time.perf_counter() < end:
+                    pass
+            else:
+                time.sleep(delay)
+
+            if random.random() < error_rate:
+                return self._reply(500, b'{"success": false, "error": "stub failure"}')
+            self._reply(200, canned)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the advisory API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run a configuration matrix and write a report")
+    run.add_argument("--server", choices=["gunicorn", "dev", "stub"], default="gunicorn")
+    run.add_argument("--url", help="Load an already running server instead of starting one")
+    run.add_argument("--workers", default="1", help="Comma-separated gunicorn worker counts")
+    run.add_argument("--cache", default="on", help="Comma-separated: on, off")
+    run.add_argument("--mode", default="single", help="Comma-separated: single, batch")
+    run.add_argument("--batch-size", type=int, default=50)
+    run.add_argument("--rate", type=float, default=20, help="Target HTTP requests per second")
+    run.add_argument("--duration", type=float, default=30, help="Seconds of load per configuration")
+    run.add_argument("--max-in-flight", type=int, default=256)
+    run.add_argument("--timeout", type=float, default=10)
+    run.add_argument("--log", nargs="*", help="Replay request logs instead of a synthetic mix")
+    run.add_argument("--requests", type=int, default=5000, help="Size of the synthetic mix")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", default="data/loadtest")
+
+    stub = commands.add_parser("stub", help="Serve the stand-in API")
+    stub.add_argument("--port", type=int, default=3000)
+    stub.add_argument("--latency-ms", type=float, default=20)
+    stub.add_argument("--per-journey-ms", type=float, default=1)
+    stub.add_argument("--error-rate", type=float, default=0)
+    stub.add_argument("--busy", action="store_true", help="Spin the CPU instead of sleeping")
+    args = parser.parse_args()
+
+    if args.command == "stub":
+        server = make_stub_server(args.port, args.latency_ms, args.per_journey_ms,
+                                  args.error_rate, args.busy)
+        print(f"🧪 Stub API on http://127.0.0.1:{server.server_port}")
+        server.serve_forever()
+        return
+
+    payloads = logged_requests(args.log) if args.log else synthetic_requests(args.requests, args.seed)
+    if not payloads:
+        sys.exit("No valid requests to replay")
+
+    configs = config_matrix(
+        args.server,
+        workers=[int(w) for w in args.workers.split(",")],
+        cache=[c.strip() == "on" for c in args.cache.split(",")],
+        modes=[m.strip() for m in args.mode.split(",")],
+    )
+
+    results = []
+    for config in configs:
+        print(f"🚦 {config} at {args.rate}/s for {args.duration}s")
+        results.append(run_config(config, payloads, args.rate, args.duration,
+                                  batch_size=args.batch_size, url=args.url,
+                                  max_in_flight=args.max_in_flight, timeout=args.timeout,
+                                  seed=args.seed))
+
+    os.makedirs(args.output, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    report = format_report(results)
+    with open(os.path.join(args.output, f"loadtest-{stamp}.json"), "w") as f:
+        json.dump(results, f, indent=2)
+    with open(os.path.join(args.output, f"loadtest-{stamp}.md"), "w") as f:
+        f.write(report + "\n")
+    print("\n" + report)
+
+
+if __name__ == "__main__":
+    main()
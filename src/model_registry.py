@@ -0,0 +1,172 @@
+"""
+Active model bundle holder with background hot reload.
+
+Requests take a reference to the current advisor once, at the start of the
+request, and use it to the end. A watcher thread polls the model directory;
+when its content hash changes and stays stable for two polls, the new
+bundle is loaded in the background, validated against a smoke set and then
+swapped in with a single reference assignment. In-flight requests finish on
+the advisor they already hold.
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor_base import model_bundle_version
+
+SMOKE_SET = [
+    dict(festival="Diwali", days_before_festival=20, source_city="Delhi",
+         destination_city="Patna", route_distance_km=1000, source_city_tier=1,
+         destination_city_tier=2, train_class="Sleeper", train_type="Superfast",
+         current_waitlist_position=40, quota="General"),
+    dict(festival="Holi", days_before_festival=5, source_city="Mumbai",
+         destination_city="Kolkata", route_distance_km=2000, source_city_tier=1,
+         destination_city_tier=1, train_class="3AC", train_type="Rajdhani",
+         current_waitlist_position=0, quota="Tatkal"),
+    dict(festival="Pongal", days_before_festival=60, source_city="Bangalore",
+         destination_city="Chennai", route_distance_km=350, source_city_tier=1,
+         destination_city_tier=1, train_class="General", train_type="Express",
+         current_waitlist_position=150, quota="Ladies"),
+]
+
+
+def load_advisor(model_dir):
+    """Load a NumPy bundle (bundle.json) with LiteAdvisor, anything else with sklearn"""
+    if os.path.exists(os.path.join(model_dir, "bundle.json")):
+        from lite_advisor import LiteAdvisor
+        return LiteAdvisor(bundle_dir=model_dir)
+
+    from advisor import FestiveTravelAdvisor
+    return FestiveTravelAdvisor(model_dir=model_dir)
+
+
+def validate_advisor(advisor, smoke_set=SMOKE_SET):
+    """Run the smoke set and raise ValueError on any implausible output"""
+
+    for request in smoke_set:
+        result = advisor.get_complete_advisory(**request)
+        rush = result["rush_analysis"]
+
+        if rush["rush_level"] not in advisor.rush_labels:
+            raise ValueError(f"Unknown rush level {rush['rush_level']!r}")
+        if not 0 <= rush["confidence"] <= 1:
+            raise ValueError(f"Rush confidence out of range: {rush['confidence']}")
+
+        confirmation = result["confirmation_probability"]
+        if confirmation is not None and not (0 <= confirmation <= 1 and math.isfinite(confirmation)):
+            raise ValueError(f"Confirmation probability out of range: {confirmation}")
+
+        window = result["optimal_booking_window"]
+        if not window["optimal_min"] <= window["recommended"] <= window["optimal_max"]:
+            raise ValueError(f"Inconsistent booking window: {window}")
+
+
+class ModelRegistry:
+    """
+    Holds the active advisor for a model directory and hot-swaps it when
+    the artifacts change. loader is any callable taking the directory and
+    defaults to load_advisor.
+    """
+
+    def __init__(self, model_dir, loader=load_advisor, poll_interval=30, smoke_set=SMOKE_SET):
+        self.model_dir = model_dir
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.smoke_set = smoke_set
+
+        self._active = loader(model_dir)
+        self._reload_lock = threading.Lock()
+        self._pending_version = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.previous_version = None
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error = None
+
+    def current(self):
+        """The advisor new requests should use"""
+        return self._active
+
+    @property
+    def version(self):
+        return self._active.model_version
+
+    def check_for_update(self, require_stable=True):
+        """
+        Reload if the model directory changed. With require_stable the new
+        content must be seen on two consecutive checks, so a bundle that is
+        still being written is not picked up. Returns True on a swap.
+        """
+
+        with self._reload_lock:
+            try:
+                on_disk = model_bundle_version(self.model_dir)
+            except OSError as e:
+                self.last_error = str(e)
+                return False
+
+            if on_disk == self._active.model_version:
+                self._pending_version = None
+                return False
+
+            if require_stable and on_disk != self._pending_version:
+                self._pending_version = on_disk
+                return False
+
+            self._pending_version = None
+            return self._load_and_swap()
+
+    def _load_and_swap(self):
+        try:
+            candidate = self.loader(self.model_dir)
+            validate_advisor(candidate, self.smoke_set)
+        except Exception as e:
+            self.failed_reloads += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ Model reload rejected: {self.last_error}")
+            return False
+
+        old = self._active
+        self.previous_version = old.model_version
+        self._active = candidate
+        self.loaded_at = time.time()
+        self.reloads += 1
+        self.last_error = None
+        print(f"✅ Swapped models {old.model_version} -> {candidate.model_version}")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check_for_update()
+
+    def start_watcher(self):
+        if self._thread is None and self.poll_interval > 0:
+            self._thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop_watcher(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        return {
+            "model_dir": self.model_dir,
+            "active_version": self.version,
+            "previous_version": self.previous_version,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+            "watching": self._thread is not None
+        }
@@ -0,0 +1,182 @@
+"""
+Multi-modal (transport mode) rush predictor on the NumPy inference path.
+
+The legacy model behind ml/predict_rush.py scores festival, transport_mode,
+distance_km and historical_rush_index with an sklearn forest and its own
+label encoders. export_multimodal_bundle flattens those artifacts into the
+same bundle.json + arrays.npz layout LiteAdvisor uses, and
+MultiModalRushPredictor serves them in batches with NumPy only, with an LRU
+cache for repeated single requests. Like the legacy encoders, it rejects
+festival or transport_mode values outside the training vocabulary with a
+ValueError instead of scoring them as some other label. The bundle records
+a fingerprint of the pickles it was exported from, so callers can tell when
+a retrained model needs a fresh export.
+
+Usage:
+    python src/multimodal.py export --model ml/rush_model.pkl \
+        --encoders ml/label_encoders.pkl --bundle-dir ml/models/multimodal
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor_base import model_bundle_version
+from cache import LRUCache
+from feature_spec import MODEL_SPECS, check_features
+from features import CompiledTransform, batch_size
+from tree_engine import TreeEnsemble
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_KIND = "multimodal_rush"
+
+FEATURES = MODEL_SPECS["multimodal_rush"]["features"]
+
+
+def sources_fingerprint(paths):
+    """Content hash of the pickles a bundle is exported from"""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def bundle_fingerprint(bundle_dir):
+    """Source fingerprint stored in bundle_dir, or None if there is no bundle or none was stored"""
+    path = os.path.join(bundle_dir, "bundle.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get("source_fingerprint")
+
+
+def export_multimodal_bundle(model, label_encoders, bundle_dir, source_fingerprint=None):
+    """
+    Export a fitted forest classifier and its label encoders into a bundle,
+    recording source_fingerprint (see sources_fingerprint) when given
+    """
+
+    if hasattr(model, "estimators_") and not isinstance(model.estimators_, np.ndarray):
+        ensemble = TreeEnsemble.from_sklearn(model.estimators_, normalize=True, aggregate="mean")
+    elif hasattr(model, "tree_"):
+        ensemble = TreeEnsemble.from_sklearn([model], normalize=True, aggregate="mean")
+    else:
+        raise ValueError(f"Cannot flatten {type(model).__name__}; expected a tree or forest classifier")
+
+    features = [str(f) for f in getattr(model, "feature_names_in_", FEATURES)]
+    check_features("multimodal_rush", features)
+    rush_encoder = label_encoders["rush_level"]
+
+    arrays, ensemble_meta = ensemble.to_arrays("rush")
+    meta = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "kind": BUNDLE_KIND,
+        "source_fingerprint": source_fingerprint,
+        "features": features,
+        "label_classes": {
+            col: [str(c) for c in encoder.classes_]
+            for col, encoder in label_encoders.items()
+            if col in features
+        },
+        "rush_labels": [str(label) for label in rush_encoder.inverse_transform(model.classes_)],
+        "ensembles": {"rush": ensemble_meta},
+    }
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    tmp_path = os.path.join(bundle_dir, "arrays.tmp.npz")
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, os.path.join(bundle_dir, "arrays.npz"))
+
+    # Written last: a bundle.json with the sources' fingerprint means the arrays are complete
+    tmp_path = os.path.join(bundle_dir, "bundle.json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(bundle_dir, "bundle.json"))
+
+    return bundle_dir
+
+
+class MultiModalRushPredictor:
+    """
+    Batched rush prediction for the transport-mode model from a bundle
+    """
+
+    def __init__(self, bundle_dir="ml/models/multimodal", cache_size=4096):
+        with open(os.path.join(bundle_dir, "bundle.json")) as f:
+            meta = json.load(f)
+
+        if meta.get("format_version") != BUNDLE_FORMAT_VERSION or meta.get("kind") != BUNDLE_KIND:
+            raise ValueError(f"{bundle_dir} is not a multi-modal rush bundle")
+
+        with np.load(os.path.join(bundle_dir, "arrays.npz")) as stored:
+            arrays = {name: stored[name] for name in stored.files}
+
+        self.bundle_dir = bundle_dir
+        self.model_version = model_bundle_version(bundle_dir)
+        self.features = meta["features"]
+        self.rush_labels = np.array(meta["rush_labels"])
+        self.ensemble = TreeEnsemble.from_arrays(arrays, "rush", meta["ensembles"]["rush"])
+        self._label_index = {
+            col: {label: i for i, label in enumerate(classes)}
+            for col, classes in meta["label_classes"].items()
+        }
+        self.transform = CompiledTransform(self.features, self._label_index, strict=True)
+        self.cache = LRUCache(maxsize=cache_size)
+
+    def predict_batch(self, festival, transport_mode, distance_km, historical_rush_index):
+        """
+        Vectorized prediction over scalars or arrays. Returns the rush
+        labels and the class probability matrix.
+        """
+
+        columns = {
+            "festival": festival,
+            "transport_mode": transport_mode,
+            "distance_km": distance_km,
+            "historical_rush_index": historical_rush_index
+        }
+        probabilities = self.ensemble.predict(self.transform(columns, batch_size(columns)))
+
+        return self.rush_labels[probabilities.argmax(axis=1)], probabilities
+
+    def predict(self, festival, transport_mode, distance_km, historical_rush_index):
+        """Single prediction in the legacy predict_rush output format"""
+
+        key = (festival, transport_mode, float(distance_km), float(historical_rush_index))
+        result = self.cache.get(key)
+        if result is None:
+            labels, probabilities = self.predict_batch(*key)
+            result = {
+                "predicted_rush_level": str(labels[0]),
+                "confidence": round(float(probabilities[0].max()) * 100, 2)
+            }
+            self.cache.set(key, result)
+
+        return dict(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-modal rush bundle tools")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--model", default="ml/rush_model.pkl")
+    parser.add_argument("--encoders", default="ml/label_encoders.pkl")
+    parser.add_argument("--bundle-dir", default="ml/models/multimodal")
+    args = parser.parse_args()
+
+    import joblib
+    export_multimodal_bundle(
+        joblib.load(args.model), joblib.load(args.encoders), args.bundle_dir,
+        source_fingerprint=sources_fingerprint([args.model, args.encoders])
+    )
+    print(f"✅ Exported multi-modal rush bundle to {args.bundle_dir}")
+
+
+if __name__ == "__main__":
+    main()
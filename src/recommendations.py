@@ -0,0 +1,114 @@
+"""
+Declarative recommendation rules evaluated over NumPy arrays.
+
+Each rule is a recommendation code plus a list of (field, op, value)
+conditions that must all hold. Values wrapped in Ref compare against another
+field of the same row. Evaluating the table over a batch gives a boolean
+matrix of shape (rows, rules); clients receive the codes and render them with
+the shared TEMPLATES table (or their own localized copy).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+Ref = namedtuple("Ref", "field")
+
+TEMPLATES = {
+    "RUSH_HIGH": "⚠️ Very high rush expected. Book as early as possible.",
+    "TATKAL_FALLBACK": "Consider booking Tatkal if regular quota is full.",
+    "RUSH_MEDIUM": "📊 Moderate rush expected. Book within optimal window.",
+    "RUSH_LOW": "✅ Low rush expected. Normal booking should work.",
+    "BOOK_WITHIN_WINDOW": "⏰ Book within {optimal_min}-{optimal_max} days before festival.",
+    "BOOKING_LATE": "🚨 You're booking late! Consider alternate options.",
+    "IN_OPTIMAL_WINDOW": "✅ You're in the optimal booking window!",
+    "CONFIRMATION_LOW": "❌ Low confirmation chances. Consider alternate trains or dates.",
+    "CONFIRMATION_MODERATE": "⚠️ Moderate confirmation chances. Have backup plans ready.",
+    "CONFIRMATION_GOOD": "✅ Good confirmation chances!",
+    "UPGRADE_TO_AC": "💡 Consider upgrading to AC classes for better availability.",
+}
+
+# Order matters: recommendations are emitted in table order
+RULES = [
+    # Rush-based recommendations
+    ("RUSH_HIGH", [("rush_level", "==", "High")]),
+    ("TATKAL_FALLBACK", [("rush_level", "==", "High")]),
+    ("RUSH_MEDIUM", [("rush_level", "==", "Medium")]),
+    ("RUSH_LOW", [("rush_level", "not in", ("High", "Medium"))]),
+
+    # Booking window recommendations
+    ("BOOK_WITHIN_WINDOW", [("days_before", ">", Ref("optimal_max"))]),
+    ("BOOKING_LATE", [("days_before", "<", Ref("optimal_min")),
+                      ("days_before", "<=", Ref("optimal_max"))]),
+    ("IN_OPTIMAL_WINDOW", [("days_before", ">=", Ref("optimal_min")),
+                           ("days_before", "<=", Ref("optimal_max"))]),
+
+    # Confirmation probability recommendations (NaN = not waitlisted)
+    ("CONFIRMATION_LOW", [("confirmation_probability", "<", 0.3)]),
+    ("CONFIRMATION_MODERATE", [("confirmation_probability", ">=", 0.3),
+                               ("confirmation_probability", "<", 0.7)]),
+    ("CONFIRMATION_GOOD", [("confirmation_probability", ">=", 0.7)]),
+
+    # Class-based recommendations
+    ("UPGRADE_TO_AC", [("train_class", "in", ("General", "Sleeper")),
+                       ("rush_level", "==", "High")]),
+]
+
+RULE_CODES = [code for code, _ in RULES]
+
+_OPS = {
+    "==": np.equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "in": lambda a, b: np.isin(a, b),
+    "not in": lambda a, b: ~np.isin(a, b),
+}
+
+
+def evaluate_rules(frame):
+    """
+    Evaluate the rule table over a dict of equal-length arrays.
+    Returns a boolean matrix of shape (rows, len(RULES)).
+    """
+
+    columns = {name: np.asarray(values) for name, values in frame.items()}
+    n_rows = len(next(iter(columns.values())))
+    mask = np.ones((n_rows, len(RULES)), dtype=bool)
+
+    for j, (_, conditions) in enumerate(RULES):
+        for field, op, value in conditions:
+            if isinstance(value, Ref):
+                value = columns[value.field]
+            mask[:, j] &= _OPS[op](columns[field], value)
+
+    return mask
+
+
+def recommendation_codes(frame):
+    """Per-row lists of recommendation codes, in rule table order"""
+    mask = evaluate_rules(frame)
+    codes = np.array(RULE_CODES)
+    return [codes[row].tolist() for row in mask]
+
+
+def recommendation_bits(frame):
+    """Per-row bitmask of matched rules (bit j = RULES[j]), for columnar output"""
+    mask = evaluate_rules(frame)
+    return mask.astype(np.int64) @ (np.int64(1) << np.arange(len(RULES), dtype=np.int64))
+
+
+def decode_bits(bits, sep="|"):
+    """Joined code strings for an array of recommendation bitmasks"""
+    unique, inverse = np.unique(np.asarray(bits), return_inverse=True)
+    codes = np.array(RULE_CODES)
+    joined = np.array([
+        sep.join(codes[(value >> np.arange(len(RULES))) & 1 == 1]) for value in unique
+    ], dtype=object)
+    return joined[inverse]
+
+
+def render(codes, **params):
+    """Render one row's codes into the recommendation strings"""
+    return [TEMPLATES[code].format(**params) for code in codes]
@@ -0,0 +1,184 @@
+"""
+Structured request / prediction log with a non-blocking writer.
+
+Request threads hand records to a bounded in-memory queue and return
+immediately. A background thread drains the queue into gzip-compressed
+JSONL files that rotate by size and age. Files are written as *.part and
+renamed when closed, so readers (retraining, cache warm-up) only ever see
+complete files. The open file is sync-flushed (Z_SYNC_FLUSH) about every
+flush_interval seconds while it has new records, so a worker that is killed
+loses at most that much: its .part file decompresses up to the last flush.
+
+When the queue runs hot the logger samples instead of stalling: above the
+high-water mark only one in sample_every records is kept, tagged with its
+sample_weight, and when the queue is full the record is dropped. Both are
+counted in stats().
+"""
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+
+
+class RequestLogger:
+    """
+    Background JSONL.gz writer for request/response records
+    """
+
+    def __init__(self, log_dir="data/request_logs", max_queue=10000, high_water=0.8,
+                 sample_every=10, rotate_bytes=64 * 1024 * 1024, rotate_seconds=3600,
+                 flush_interval=1.0):
+        self.log_dir = log_dir
+        self.high_water = int(max_queue * high_water)
+        self.sample_every = sample_every
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self._flushed_at = 0.0
+        self._dirty = False
+        self._bytes = 0
+        self._seen_hot = 0
+
+        self.logged = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.written = 0
+        self.files = 0
+        self.write_errors = 0
+
+        os.makedirs(log_dir, exist_ok=True)
+
+    def log(self, record):
+        """Queue a record without blocking; returns False if it was not kept"""
+
+        if self._queue.qsize() >= self.high_water:
+            with self._lock:
+                self._seen_hot += 1
+                keep = self._seen_hot % self.sample_every == 0
+                if not keep:
+                    self.sampled_out += 1
+            if not keep:
+                return False
+            record = dict(record, sample_weight=self.sample_every)
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+        with self._lock:
+            self.logged += 1
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="request-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    def close(self):
+        """Flush everything queued so far and close the current file"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._drain()
+        self._close_file()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._maybe_flush()
+                self._maybe_rotate()
+                continue
+            self._write(record)
+            self._drain()
+            self._maybe_flush()
+
+    def _drain(self):
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._write(record)
+
+    def _write(self, record):
+        try:
+            if self._file is None:
+                self._open_file()
+            line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode()
+            self._file.write(line)
+            self._bytes += len(line)
+            self._dirty = True
+            self.written += 1
+            self._maybe_rotate()
+        except (OSError, TypeError, ValueError) as e:
+            self.write_errors += 1
+            print(f"⚠️ Request log write failed: {e}")
+
+    def _open_file(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"requests-{stamp}-{os.getpid()}-{self.files}.jsonl.gz"
+        self._path = os.path.join(self.log_dir, name)
+        self._file = gzip.open(self._path + ".part", "wb")
+        self._opened_at = self._flushed_at = time.time()
+        self._bytes = 0
+        self.files += 1
+
+    def _maybe_flush(self):
+        if self._file is None or not self._dirty:
+            return
+        if time.time() - self._flushed_at < self.flush_interval:
+            return
+        try:
+            # Ends the current deflate block so everything so far is readable
+            self._file.flush()
+        except OSError as e:
+            self.write_errors += 1
+            print(f"⚠️ Request log flush failed: {e}")
+        self._flushed_at = time.time()
+        self._dirty = False
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._path + ".part", self._path)
+        self._file = None
+        self._dirty = False
+
+    def _maybe_rotate(self):
+        if self._file is None:
+            return
+        if self._bytes >= self.rotate_bytes or time.time() - self._opened_at >= self.rotate_seconds:
+            self._close_file()
+
+    def stats(self):
+        return {
+            "log_dir": self.log_dir,
+            "queued": self._queue.qsize(),
+            "logged": self.logged,
+            "written": self.written,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "files": self.files,
+            "write_errors": self.write_errors
+        }
@@ -0,0 +1,219 @@
+"""
+Route graph: city names -> route distance and city tiers.
+
+Cities from POPULAR_ROUTES, plus the routes in an optional local JSON file
+(a list of entries shaped like POPULAR_ROUTES), are indexed once into
+per-city tiers and a city x city matrix of route distances. Only listed
+routes (either direction) have a distance: chaining routes through hub
+cities overstates real rail distances badly, so other pairs stay unknown
+and requests for them must send route_distance_km. The compiled graph is
+stored as .npy files with a fingerprint of its sources and memory-mapped
+on load, so every worker process shares the same pages. A lookup is one
+dict hit per city plus one matrix read; batch joins map each distinct city
+name once and gather whole columns.
+
+Usage:
+    python src/route_graph.py --routes data/routes.json   # (re)build data/route_graph
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from catalog import POPULAR_ROUTES
+from validation import ValidationError
+
+ROUTES_FILE = os.environ.get("ROUTE_CATALOG_FILE", "data/routes.json")
+GRAPH_DIR = os.environ.get("ROUTE_GRAPH_DIR", "data/route_graph")
+
+ROUTE_FIELDS = ("route_distance_km", "source_city_tier", "destination_city_tier")
+
+# Bumped when the compiled layout or its meaning changes, so stale graphs rebuild
+GRAPH_FORMAT = 2
+
+
+def read_routes(routes_file=None):
+    """POPULAR_ROUTES followed by the routes in routes_file, when it exists"""
+    routes = list(POPULAR_ROUTES)
+    if routes_file and os.path.exists(routes_file):
+        with open(routes_file) as f:
+            routes.extend(json.load(f))
+    return routes
+
+
+def routes_fingerprint(routes):
+    payload = json.dumps({"format": GRAPH_FORMAT, "routes": routes}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+class RouteGraph:
+    """
+    City index, per-city tiers and the route distance matrix (km, inf
+    where no listed route connects two cities)
+    """
+
+    def __init__(self, cities, tiers, distances, fingerprint=None):
+        self.cities = list(cities)
+        self.tiers = tiers
+        self.distances = distances
+        self.fingerprint = fingerprint
+        self._index = {city: i for i, city in enumerate(self.cities)}
+
+    @classmethod
+    def from_routes(cls, routes):
+        cities = sorted({route[end] for route in routes for end in ("from", "to")})
+        index = {city: i for i, city in enumerate(cities)}
+        n = len(cities)
+
+        tiers = np.zeros(n, dtype=np.int8)
+        distances = np.full((n, n), np.inf)
+        np.fill_diagonal(distances, 0.0)
+
+        for route in routes:
+            for end, tier_key in (("from", "tier_from"), ("to", "tier_to")):
+                i = index[route[end]]
+                if tiers[i] and tiers[i] != route[tier_key]:
+                    raise ValueError(f"Conflicting tiers for {route[end]}: "
+                                     f"{tiers[i]} and {route[tier_key]}")
+                tiers[i] = route[tier_key]
+
+            # Routes run both ways; keep the shortest listed distance
+            i, j = index[route["from"]], index[route["to"]]
+            distances[i, j] = distances[j, i] = min(distances[i, j], route["distance"])
+
+        return cls(cities, tiers, distances, fingerprint=routes_fingerprint(routes))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in ("tiers", "distances"):
+            tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+            np.save(tmp_path, getattr(self, name))
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+
+        # Written last: a graph.json matching the sources means the arrays are complete
+        tmp_path = os.path.join(directory, "graph.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"cities": self.cities, "fingerprint": self.fingerprint}, f, indent=2)
+        os.replace(tmp_path, os.path.join(directory, "graph.json"))
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "graph.json")) as f:
+            meta = json.load(f)
+        return cls(
+            meta["cities"],
+            np.load(os.path.join(directory, "tiers.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, "distances.npy"), mmap_mode="r"),
+            fingerprint=meta["fingerprint"]
+        )
+
+    def route(self, source_city, destination_city):
+        """
+        Route fields for one pair of city names: tiers for known cities and
+        the distance when a listed route connects them. Missing keys mean
+        unknown.
+        """
+
+        i, j = self._index.get(source_city), self._index.get(destination_city)
+        fields = {}
+        if i is not None:
+            fields["source_city_tier"] = int(self.tiers[i])
+        if j is not None:
+            fields["destination_city_tier"] = int(self.tiers[j])
+        if i is not None and j is not None and np.isfinite(self.distances[i, j]):
+            fields["route_distance_km"] = float(self.distances[i, j])
+        return fields
+
+    def _indices(self, cities):
+        uniques, inverse = np.unique(np.asarray(cities), return_inverse=True)
+        unknown = [str(u) for u in uniques if u not in self._index]
+        if unknown:
+            raise ValueError(f"Unknown city: {', '.join(unknown)}")
+        return np.array([self._index[u] for u in uniques], dtype=np.int64)[inverse]
+
+    def lookup_batch(self, source_cities, destination_cities):
+        """Route field columns for arrays of city names, raising on unknown or unlisted pairs"""
+
+        i, j = self._indices(source_cities), self._indices(destination_cities)
+        distance = np.asarray(self.distances[i, j])
+
+        unconnected = np.flatnonzero(~np.isfinite(distance))
+        if unconnected.size:
+            k = unconnected[0]
+            raise ValueError(f"No route between {self.cities[i[k]]} and {self.cities[j[k]]}")
+
+        return {
+            "route_distance_km": distance,
+            "source_city_tier": np.asarray(self.tiers[i], dtype=np.int64),
+            "destination_city_tier": np.asarray(self.tiers[j], dtype=np.int64),
+        }
+
+
+def load_route_graph(routes_file=ROUTES_FILE, directory=GRAPH_DIR):
+    """
+    The compiled graph from directory, rebuilt (and stored) first when it is
+    missing or was built from other routes
+    """
+
+    routes = read_routes(routes_file)
+    fingerprint = routes_fingerprint(routes)
+
+    try:
+        graph = RouteGraph.load(directory)
+        if graph.fingerprint == fingerprint:
+            return graph
+    except (OSError, ValueError, KeyError):
+        pass
+
+    graph = RouteGraph.from_routes(routes)
+    try:
+        graph.save(directory)
+    except OSError:
+        # Read-only deployments still serve from the in-memory graph
+        pass
+    return graph
+
+
+def fill_route_fields(data, graph):
+    """
+    A request with route_distance_km and the city tiers filled in from its
+    source_city / destination_city where the caller left them out. Raises
+    ValidationError when the distance is missing and no listed route
+    connects the cities, rather than guessing one.
+    """
+
+    if not isinstance(data, dict):
+        return data
+    missing = [name for name in ROUTE_FIELDS if data.get(name) is None]
+    if not missing or not data.get("source_city") or not data.get("destination_city"):
+        return data
+
+    known = graph.route(data["source_city"], data["destination_city"])
+    if "route_distance_km" in missing and "route_distance_km" not in known:
+        raise ValidationError({"route_distance_km": (
+            f"no catalog route between {data['source_city']} and "
+            f"{data['destination_city']}; send route_distance_km"
+        )})
+    return {**data, **{name: known[name] for name in missing if name in known}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the route graph")
+    parser.add_argument("--routes", default=ROUTES_FILE, help="Extra routes as a JSON list")
+    parser.add_argument("--output", default=GRAPH_DIR)
+    args = parser.parse_args()
+
+    graph = load_route_graph(args.routes, args.output)
+    connected = np.isfinite(graph.distances).sum() - len(graph.cities)
+    print(f"✅ Route graph in {args.output}: {len(graph.cities)} cities, "
+          f"{connected // 2} routes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
+import os
 import streamlit as st
+import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import requests
-from advisor import FestiveTravelAdvisor
+import numpy as np
+from catalog import FESTIVALS
+from route_graph import load_route_graph
 
 # Page configuration
 st.set_page_config(
@@ -106,10 +109,29 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize advisor
+# Initialize advisor. With ADVISOR_API_URL set the dashboard is a thin client
+# of the prediction service and loads no models; otherwise it loads its own.
+ADVISOR_API_URL = os.environ.get("ADVISOR_API_URL")
+
+
 @st.cache_resource
 def load_advisor():
+    if ADVISOR_API_URL:
+        from api_client import AdvisorClient
+        try:
+            client = AdvisorClient(
+                ADVISOR_API_URL,
+                timeout=(3.05, float(os.environ.get("ADVISOR_API_TIMEOUT", 30))),
+                retries=int(os.environ.get("ADVISOR_API_RETRIES", 3))
+            )
+            client.health()
+            return client
+        except Exception as e:
+            st.error(f"⚠️ Prediction service unavailable at {ADVISOR_API_URL}: {e}")
+            return None
+
     try:
+        from advisor import FestiveTravelAdvisor
         return FestiveTravelAdvisor()
     except Exception as e:
         st.error(f"⚠️ Failed to load models: {e}")
@@ -118,6 +140,83 @@ def load_advisor():
 
 advisor = load_advisor()
 
+
+@st.cache_resource
+def load_routes():
+    return load_route_graph()
+
+route_graph = load_routes()
+
+# Cached views. st.cache_data is shared by every session of this process and
+# keyed on the arguments, so analysts looking at the same journey reuse one
+# computation. The advisor itself is not hashed (leading underscore); its
+# model_version is, so a model reload invalidates every cached view.
+CACHE_TTL = int(os.environ.get("DASHBOARD_CACHE_TTL", "3600"))
+CACHE_ENTRIES = int(os.environ.get("DASHBOARD_CACHE_ENTRIES", "1024"))
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_ENTRIES, show_spinner=False)
+def cached_advisory(_advisor, model_version, params):
+    return _advisor.get_complete_advisory(**params, with_uncertainty=True, with_attributions=True)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_ENTRIES, show_spinner=False)
+def cached_rush_curve(_advisor, model_version, festival, distance, source_tier,
+                      dest_tier, train_class, train_type):
+    """Rush across the whole booking horizon in one batched call"""
+    return _advisor.rush_curve(
+        festival=festival,
+        route_distance_km=distance,
+        source_city_tier=source_tier,
+        destination_city_tier=dest_tier,
+        train_class=train_class,
+        train_type=train_type,
+        days_range=range(0, 121)
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_ENTRIES, show_spinner=False)
+def cached_comparison(_advisor, model_version, festival, days_before, distance,
+                      source_tier, dest_tier, waitlist):
+    """Every class x type x quota option, scored in one batched pass per model"""
+    ranking = _advisor.rank_alternatives(
+        festival=festival,
+        days_before_festival=days_before,
+        route_distance_km=distance,
+        source_city_tier=source_tier,
+        destination_city_tier=dest_tier,
+        current_waitlist_position=max(waitlist, 1)
+    )
+    return pd.DataFrame(ranking["options"])
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_ENTRIES, show_spinner=False)
+def cached_route_heatmap(_advisor, model_version, distance, source_tier, dest_tier,
+                         train_class, train_type, quota, waitlist):
+    """Festival x day grid for the journey's route as one batch advisory"""
+    festivals = list(FESTIVALS)
+    days = np.arange(0, 121)
+    festival_idx, day_idx = np.divmod(np.arange(len(festivals) * len(days)), len(days))
+    columns = _advisor.get_batch_advisory(
+        festival=np.asarray(festivals)[festival_idx],
+        days_before_festival=days[day_idx],
+        route_distance_km=distance,
+        source_city_tier=source_tier,
+        destination_city_tier=dest_tier,
+        train_class=train_class,
+        train_type=train_type,
+        current_waitlist_position=max(waitlist, 1),
+        quota=quota
+    )
+    shape = (len(festivals), len(days))
+    return {
+        "festivals": festivals,
+        "days_before_festival": days,
+        "high_rush_probability": columns["rush_probability_high"].reshape(shape),
+        "confirmation_probability": columns["confirmation_probability"].reshape(shape)
+    }
+
+
 # Header
 st.markdown("<h1>🚂 Festive Travel Advisor</h1>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; color: rgba(255,255,255,0.7); font-size: 1.2rem; margin-top: -10px;'>AI-Powered Railway Intelligence Platform</p>", unsafe_allow_html=True)
@@ -143,23 +242,33 @@ with st.sidebar:
     
     col1, col2 = st.columns(2)
     with col1:
-        source_city = st.text_input("From City", value="Mumbai", help="Source city")
+        source_city = st.text_input("From City", value="Delhi", help="Source city")
     with col2:
-        dest_city = st.text_input("To City", value="Delhi", help="Destination city")
+        dest_city = st.text_input("To City", value="Patna", help="Destination city")
     
+    # Distance and tiers default to the route graph when it knows the cities.
+    # Pairs without a listed route start with no distance rather than a guess.
+    known_route = route_graph.route(source_city, dest_city)
+    known_distance = known_route.get("route_distance_km")
+
     distance = st.number_input(
         "Distance (km)",
         min_value=50,
         max_value=5000,
-        value=1400,
+        value=int(known_distance) if known_distance is not None else None,
+        placeholder="Unknown route - enter distance",
         help="Route distance in kilometers"
     )
+    if known_distance is None:
+        st.caption(f"No catalog route between {source_city} and {dest_city}; enter the distance.")
     
     col1, col2 = st.columns(2)
     with col1:
-        source_tier = st.selectbox("Source Tier", [1, 2, 3], format_func=lambda x: f"Tier {x}")
+        source_tier = st.selectbox("Source Tier", [1, 2, 3], format_func=lambda x: f"Tier {x}",
+                                   index=known_route.get("source_city_tier", 1) - 1)
     with col2:
-        dest_tier = st.selectbox("Destination Tier", [1, 2, 3], format_func=lambda x: f"Tier {x}")
+        dest_tier = st.selectbox("Destination Tier", [1, 2, 3], format_func=lambda x: f"Tier {x}",
+                                 index=known_route.get("destination_city_tier", 1) - 1)
     
     st.markdown("## 🚄 Train Preferences")
     
@@ -193,45 +302,48 @@ with st.sidebar:
 if predict_button:
     if not advisor:
         st.error("⚠️ Models not loaded. Cannot generate predictions.")
+    elif distance is None:
+        st.error("⚠️ Enter the route distance to generate an advisory.")
     else:
-        with st.spinner("🧠 Analyzing travel patterns..."):
-            try:
-                # Prepare request data
-                request_data = {
-                    "festival": festival,
-                    "days_before_festival": days_before,
-                    "source_city": source_city,
-                    "destination_city": dest_city,
-                    "route_distance_km": distance,
-                    "source_city_tier": source_tier,
-                    "destination_city_tier": dest_tier,
-                    "train_class": train_class,
-                    "train_type": train_type,
-                    "quota": quota,
-                    "current_waitlist_position": waitlist
-                }
-                
-                # Get prediction
-                result = advisor.get_complete_advisory(**request_data)
-                
-                # Store in session state
-                st.session_state['result'] = result
-                st.session_state['journey_info'] = {
-                    'festival': festival,
-                    'route': f"{source_city} → {dest_city}",
-                    'distance': distance,
-                    'class': train_class,
-                    'type': train_type
-                }
-                
-            except Exception as e:
-                st.error(f"❌ Prediction failed: {str(e)}")
+        # Only the submitted inputs live in session state; every view below
+        # is recomputed from them through the shared caches on each rerun
+        st.session_state['request'] = {
+            "festival": festival,
+            "days_before_festival": int(days_before),
+            "source_city": source_city,
+            "destination_city": dest_city,
+            "route_distance_km": int(distance),
+            "source_city_tier": int(source_tier),
+            "destination_city_tier": int(dest_tier),
+            "train_class": train_class,
+            "train_type": train_type,
+            "quota": quota,
+            "current_waitlist_position": int(waitlist)
+        }
+
+result = None
+if advisor and 'request' in st.session_state:
+    params = st.session_state['request']
+    model_version = advisor.model_version
+    with st.spinner("🧠 Analyzing travel patterns..."):
+        try:
+            result = cached_advisory(advisor, model_version, params)
+        except Exception as e:
+            st.error(f"❌ Prediction failed: {str(e)}")
 
 # Display results if available
-if 'result' in st.session_state:
-    result = st.session_state['result']
-    journey = st.session_state['journey_info']
-    
+if result is not None:
+    journey = {
+        'festival': params['festival'],
+        'route': f"{params['source_city']} → {params['destination_city']}",
+        'distance': params['route_distance_km'],
+        'class': params['train_class'],
+        'type': params['train_type'],
+        'days_before': params['days_before_festival']
+    }
+    route_args = (params['route_distance_km'], params['source_city_tier'],
+                  params['destination_city_tier'])
+
     # Journey summary
     st.markdown("### 📋 Journey Summary")
     col1, col2, col3, col4 = st.columns(4)
@@ -267,7 +379,17 @@ if 'result' in st.session_state:
             <p style='color: rgba(255,255,255,0.7); margin: 0;'>Rush Level</p>
         </div>
         """, unsafe_allow_html=True)
-    
+
+        uncertainty = result['rush_analysis'].get('uncertainty')
+        if uncertainty:
+            spread = (f"{uncertainty['vote_share']:.0%} of trees agree, "
+                      f"{uncertainty['margin'] * 100:.0f} points ahead of "
+                      f"{uncertainty['runner_up']}")
+            if uncertainty['marginal']:
+                st.warning(f"⚖️ Marginal call: could be {uncertainty['runner_up']} Rush. {spread}")
+            else:
+                st.caption(spread)
+
     # Confirmation Probability
     with col2:
         confirm_prob = result.get('confirmation_probability')
@@ -337,9 +459,15 @@ if 'result' in st.session_state:
         st.markdown("### 🔍 Top Influencing Factors")
         
         factors = result['rush_analysis']['top_factors']
+        # Per-request contributions toward the predicted level, when reported
+        contributions = list(result['rush_analysis'].get('factor_contributions', {}).values())[:len(factors)]
+        strongest = max((abs(c) for c in contributions), default=0)
         
         for i, factor in enumerate(factors, 1):
-            importance = (len(factors) - i + 1) / len(factors) * 100
+            if strongest > 0:
+                importance = abs(contributions[i - 1]) / strongest * 100
+            else:
+                importance = (len(factors) - i + 1) / len(factors) * 100
             st.markdown(f"""
             <div style='background: linear-gradient(135deg, rgba(99, 102, 241, 0.1), rgba(236, 72, 153, 0.1)); padding: 12px; border-radius: 8px; margin: 8px 0; border-left: 3px solid {"#6366f1" if i==1 else "#ec4899" if i==2 else "#10b981"}'>
                 <strong>{i}. {factor}</strong>
@@ -351,6 +479,131 @@ if 'result' in st.session_state:
     
     st.markdown("---")
     
+    # Expensive views load progressively below the key predictions, each
+    # from its own cache so a changed input only recomputes what it affects
+    st.markdown("### 📉 Rush Across Travel Days")
+    with st.spinner("📉 Sweeping the booking horizon..."):
+        try:
+            curve = cached_rush_curve(advisor, model_version, params['festival'], *route_args,
+                                      params['train_class'], params['train_type'])
+        except Exception as e:
+            curve = None
+            st.error(f"❌ Rush curve failed: {str(e)}")
+    if curve:
+        level_colors = {'Low': '#10b981', 'Medium': '#f59e0b', 'High': '#ef4444'}
+        fig = go.Figure()
+        for level, probs in curve['probabilities'].items():
+            fig.add_trace(go.Scatter(
+                x=curve['days_before_festival'],
+                y=[p * 100 for p in probs],
+                mode='lines',
+                name=f"{level} Rush",
+                line=dict(color=level_colors.get(level, '#6366f1'), width=3)
+            ))
+        
+        fig.add_vline(
+            x=journey['days_before'],
+            line=dict(color='rgba(255,255,255,0.6)', dash='dash'),
+            annotation_text="Your travel day",
+            annotation_font_color='white'
+        )
+        
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            yaxis=dict(title='Probability (%)', gridcolor='rgba(255,255,255,0.1)'),
+            xaxis=dict(title='Days Before Festival', autorange='reversed'),
+            height=380
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Class / quota comparison for the selected train type
+    st.markdown("### 🎫 Class & Quota Comparison")
+    with st.spinner("🎫 Comparing classes and quotas..."):
+        try:
+            options = cached_comparison(advisor, model_version, params['festival'],
+                                        params['days_before_festival'], *route_args,
+                                        params['current_waitlist_position'])
+        except Exception as e:
+            options = None
+            st.error(f"❌ Class comparison failed: {str(e)}")
+    if options is not None and not options.empty:
+        same_type = options[options['train_type'] == params['train_type']]
+        if same_type.empty:
+            same_type = options
+        grid = same_type.pivot_table(index='train_class', columns='quota',
+                                     values='confirmation_probability', aggfunc='max')
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = px.imshow(
+                grid * 100,
+                color_continuous_scale='RdYlGn',
+                zmin=0, zmax=100,
+                text_auto='.0f',
+                labels=dict(x='Quota', y='Class', color='Confirmation (%)'),
+                aspect='auto'
+            )
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='white'),
+                height=350
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            st.markdown("**Best options on this route**")
+            st.dataframe(
+                options.head(8)[['train_class', 'train_type', 'quota', 'rush_level',
+                                 'confirmation_probability']],
+                hide_index=True,
+                use_container_width=True
+            )
+    
+    st.markdown("---")
+    
+    # Festival x day heatmap for the journey's route
+    st.markdown("### 🗓️ Route Heatmap Across Festivals")
+    with st.spinner("🗓️ Scoring every festival and day for this route..."):
+        try:
+            heat = cached_route_heatmap(advisor, model_version, *route_args,
+                                        params['train_class'], params['train_type'],
+                                        params['quota'], params['current_waitlist_position'])
+        except Exception as e:
+            heat = None
+            st.error(f"❌ Route heatmap failed: {str(e)}")
+    if heat is not None:
+        metric = st.radio(
+            "Show",
+            ["High rush probability", "Confirmation probability"],
+            horizontal=True,
+            label_visibility='collapsed'
+        )
+        values = heat['high_rush_probability'] if metric == "High rush probability" else heat['confirmation_probability']
+        fig = px.imshow(
+            values * 100,
+            x=heat['days_before_festival'],
+            y=heat['festivals'],
+            color_continuous_scale='RdYlGn_r' if metric == "High rush probability" else 'RdYlGn',
+            zmin=0, zmax=100,
+            labels=dict(x='Days Before Festival', y='Festival', color=f"{metric} (%)"),
+            aspect='auto'
+        )
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            xaxis=dict(autorange='reversed'),
+            height=380
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("---")
+    
     # Recommendations
     st.markdown("### 💡 Smart Recommendations")
     
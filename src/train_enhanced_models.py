@@ -6,6 +6,14 @@ from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
 from sklearn.metrics import accuracy_score, classification_report, mean_absolute_error, r2_score
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from calibration import calibrate, save_calibration
+from drift import build_profile, save_profile
+from feature_spec import CATEGORICAL_COLUMNS, MODEL_SPECS, catalog_peak_days, save_peak_days
+from features import CompiledTransform, default_peak_day_proximity
 
 # Load enhanced dataset
 df = pd.read_csv("data/processed/enhanced_festive_travel_data.csv")
@@ -13,34 +21,50 @@ df = pd.read_csv("data/processed/enhanced_festive_travel_data.csv")
 print(f"📊 Loaded {len(df)} samples")
 print(f"Columns: {df.columns.tolist()}\n")
 
+# Serving derives peak_day_proximity from the catalog peak offsets, so the
+# dataset must have been generated from the same ones
+peak_days = catalog_peak_days()
+expected_proximity = default_peak_day_proximity(
+    df["festival"].to_numpy(), df["days_before_festival"].to_numpy(), peak_days
+)
+if not (expected_proximity == df["peak_day_proximity"].to_numpy()).all():
+    raise ValueError("peak_day_proximity in the dataset does not match catalog peak_days; "
+                     "regenerate it with generate_enhanced_dataset.py")
+
 # ===============================
 # PREPROCESSING
 # ===============================
 
-# Separate categorical and numerical columns
-categorical_cols = [
-    "festival", "train_class", "train_type", "quota", 
-    "ticket_status", "source_city", "destination_city"
-]
-
-numerical_cols = [
-    "days_before_festival", "days_to_journey", "route_distance_km",
-    "source_city_tier", "destination_city_tier", "peak_day_proximity",
-    "booking_hour", "current_waitlist_position", "historical_rush_index"
-]
-
-# Create a copy for encoding
-df_encoded = df.copy()
+# Categorical columns and per-model feature lists come from the shared spec
+categorical_cols = list(CATEGORICAL_COLUMNS)
 
 # Label encode categorical columns ONLY
 label_encoders = {}
 for col in categorical_cols:
-    if col in df_encoded.columns:
+    if col in df.columns:
         le = LabelEncoder()
-        df_encoded[col] = le.fit_transform(df_encoded[col].astype(str))
+        le.fit(df[col].astype(str))
         label_encoders[col] = le
 
-# DON'T scale yet - we'll scale per model
+label_index = {
+    col: {label: i for i, label in enumerate(encoder.classes_)}
+    for col, encoder in label_encoders.items()
+}
+
+
+def build_features(model):
+    """Fit the model's scaler and build its inputs with the serving transform"""
+
+    features = MODEL_SPECS[model]["features"]
+    columns = {col: df[col].to_numpy() for col in features}
+
+    encoded = CompiledTransform(features, label_index)(columns, len(df))
+    scaler = StandardScaler().fit(pd.DataFrame(encoded, columns=features))
+
+    transform = CompiledTransform(features, label_index, scaler.mean_, scaler.scale_)
+    return features, scaler, pd.DataFrame(transform(columns, len(df)), columns=features)
+
+
 print("✅ Label encoding completed\n")
 
 # ===============================
@@ -55,21 +79,8 @@ print("=" * 60)
 rush_encoder = LabelEncoder()
 y_rush = rush_encoder.fit_transform(df['rush_level'])
 
-# Features for rush prediction
-rush_features = [
-    "festival", "days_before_festival", "route_distance_km",
-    "source_city_tier", "destination_city_tier", "peak_day_proximity",
-    "train_class", "train_type", "historical_rush_index"
-]
-
-X_rush = df_encoded[rush_features]
-
-# Scale features for this model
-scaler_rush = StandardScaler()
-X_rush = pd.DataFrame(
-    scaler_rush.fit_transform(X_rush),
-    columns=X_rush.columns
-)
+# Features for rush prediction, scaled for this model
+rush_features, scaler_rush, X_rush = build_features("rush")
 
 # Train-test split
 X_train_rush, X_test_rush, y_train_rush, y_test_rush = train_test_split(
@@ -124,20 +135,8 @@ print("\n" + "=" * 60)
 print("TRAINING MODEL 2: Confirmation Probability Prediction")
 print("=" * 60)
 
-# Features for confirmation prediction
-confirm_features = [
-    "current_waitlist_position", "days_to_journey", "train_type",
-    "quota", "train_class", "historical_rush_index", "ticket_status"
-]
-
-X_confirm = df_encoded[confirm_features]
-
-# Scale features for this model
-scaler_confirm = StandardScaler()
-X_confirm = pd.DataFrame(
-    scaler_confirm.fit_transform(X_confirm),
-    columns=X_confirm.columns
-)
+# Features for confirmation prediction, scaled for this model
+confirm_features, scaler_confirm, X_confirm = build_features("confirm")
 
 y_confirm = df['confirmation_probability']
 
@@ -166,6 +165,11 @@ print(f"\n📊 Confirmation Probability Model:")
 print(f"  - Mean Absolute Error: {mae_conf:.4f}")
 print(f"  - R² Score: {r2_conf:.4f}")
 
+# Isotonic calibration fitted on half of the held-out predictions
+confirm_calibration, calibration_report = calibrate(y_pred_conf, y_test_conf)
+print(f"  - Reliability gap: {calibration_report['raw_gap']:.4f} raw, "
+      f"{calibration_report['calibrated_gap']:.4f} calibrated")
+
 # Feature importance
 feature_importance_conf = pd.DataFrame({
     'feature': confirm_features,
@@ -187,19 +191,7 @@ print("=" * 60)
 df['optimal_booking_days'] = (df['optimal_booking_window_min'] + 
                                df['optimal_booking_window_max']) / 2
 
-booking_features = [
-    "festival", "route_distance_km", "source_city_tier",
-    "destination_city_tier", "train_class", "historical_rush_index"
-]
-
-X_booking = df_encoded[booking_features]
-
-# Scale features for this model
-scaler_booking = StandardScaler()
-X_booking = pd.DataFrame(
-    scaler_booking.fit_transform(X_booking),
-    columns=X_booking.columns
-)
+booking_features, scaler_booking, X_booking = build_features("booking")
 
 y_booking = df['optimal_booking_days']
 
@@ -227,6 +219,37 @@ print(f"\n📅 Optimal Booking Window Model:")
 print(f"  - Mean Absolute Error: {mae_book:.2f} days")
 print(f"  - R² Score: {r2_book:.4f}")
 
+# Quantile models for the window bounds, on the same split and features.
+# They predict offsets from the midpoint: quantile boosting only sees the
+# sign of each residual, so raw bounds several festivals apart converge slowly.
+booking_quantile_models = {}
+for bound, quantile in MODEL_SPECS["booking"]["quantiles"].items():
+    y_bound = df[quantile["target"]] - y_booking
+    y_train_bound, y_test_bound = y_bound.loc[y_train_book.index], y_bound.loc[y_test_book.index]
+
+    model = GradientBoostingRegressor(
+        loss="quantile",
+        alpha=quantile["alpha"],
+        n_estimators=100,
+        max_depth=6,
+        learning_rate=0.1,
+        random_state=42
+    )
+    model.fit(X_train_book, y_train_bound)
+    booking_quantile_models[bound] = model
+
+    # Evaluate the absolute bound around the predicted midpoint
+    predicted = y_pred_book + model.predict(X_test_book)
+    y_test_bound = y_test_bound + y_test_book
+    # Served bounds are whole days, rounded outward
+    if bound == "lower":
+        covered = np.floor(predicted) <= y_test_bound
+    else:
+        covered = np.ceil(predicted) >= y_test_bound
+    print(f"  - {bound.title()} bound (q={quantile['alpha']}): MAE "
+          f"{mean_absolute_error(y_test_bound, predicted):.2f} days, "
+          f"{covered.mean():.1%} of windows inside")
+
 # ===============================
 # SAVE ALL MODELS & ARTIFACTS
 # ===============================
@@ -237,6 +260,8 @@ os.makedirs("ml/models", exist_ok=True)
 joblib.dump(rf_rush, "ml/models/rush_classifier.pkl")
 joblib.dump(gb_confirm, "ml/models/confirmation_regressor.pkl")
 joblib.dump(gb_booking, "ml/models/booking_window_regressor.pkl")
+joblib.dump(booking_quantile_models["lower"], "ml/models/booking_lower_regressor.pkl")
+joblib.dump(booking_quantile_models["upper"], "ml/models/booking_upper_regressor.pkl")
 
 # Save encoders and scalers
 joblib.dump(label_encoders, "ml/models/label_encoders.pkl")
@@ -247,6 +272,15 @@ joblib.dump(scaler_rush, "ml/models/rush_scaler.pkl")
 joblib.dump(scaler_confirm, "ml/models/confirm_scaler.pkl")
 joblib.dump(scaler_booking, "ml/models/booking_scaler.pkl")
 
+# Confirmation calibration lookup arrays
+save_calibration("ml/models", confirm_calibration)
+
+# Training distribution of request fields, for drift monitoring
+save_profile("ml/models", build_profile(df))
+
+# Festival peak offsets behind peak_day_proximity
+save_peak_days("ml/models", peak_days)
+
 # Save feature lists
 joblib.dump(rush_features, "ml/models/rush_features.pkl")
 joblib.dump(confirm_features, "ml/models/confirm_features.pkl")
@@ -259,9 +293,14 @@ print("\nSaved files:")
 print("  - ml/models/rush_classifier.pkl")
 print("  - ml/models/confirmation_regressor.pkl")
 print("  - ml/models/booking_window_regressor.pkl")
+print("  - ml/models/booking_lower_regressor.pkl")
+print("  - ml/models/booking_upper_regressor.pkl")
 print("  - ml/models/label_encoders.pkl")
 print("  - ml/models/rush_target_encoder.pkl")
 print("  - ml/models/rush_scaler.pkl")
 print("  - ml/models/confirm_scaler.pkl")
 print("  - ml/models/booking_scaler.pkl")
+print("  - ml/models/confirm_calibration.npz")
+print("  - ml/models/input_profile.json")
+print("  - ml/models/peak_days.json")
 print("  - ml/models/*_features.pkl")
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+NumPy-only evaluation of flattened tree ensembles.
+
+An ensemble of T trees is stored as padded (T, max_nodes) arrays of split
+feature, threshold and child indices plus a (T, max_nodes, K) array of node
+values, so a whole batch is routed through every tree at once with one
+vectorized step per tree level. Trees are exported from fitted sklearn
+estimators through their public ``tree_`` attributes; sklearn itself is
+never imported here.
+
+Per-row feature attributions use path contributions (Saabas): every split
+on a row's path credits the change in node value to the split feature, so
+the attributions plus the root value add up exactly to the prediction.
+Path sums are precomputed for every node once, which makes explaining a
+batch a gather on the leaf indices from apply().
+"""
+
+import numpy as np
+
+ARRAY_NAMES = ("feature", "threshold", "left", "right", "value")
+
+
+class TreeEnsemble:
+    """
+    Flattened tree ensemble.
+
+    aggregate is "mean" (random forest probabilities) or "sum" (gradient
+    boosting); predictions are offset + scale * aggregate(tree values).
+    scale and offset may be per-output arrays, as for stacked ensembles.
+    """
+
+    def __init__(self, feature, threshold, left, right, value,
+                 aggregate="mean", scale=1.0, offset=0.0):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.aggregate = aggregate
+        self.scale = scale
+        self.offset = offset
+
+        self.n_trees = feature.shape[0]
+        self._tree_idx = np.arange(self.n_trees)
+        self.max_depth = self._max_depth()
+        self._path_table = None
+
+    @classmethod
+    def from_sklearn(cls, estimators, normalize=False, aggregate="mean",
+                     scale=1.0, offset=0.0):
+        """Flatten fitted sklearn decision trees into padded arrays"""
+
+        trees = [est.tree_ for est in estimators]
+        n_nodes = max(tree.node_count for tree in trees)
+        n_outputs = trees[0].value.shape[-1]
+
+        feature = np.full((len(trees), n_nodes), -2, dtype=np.int32)
+        threshold = np.zeros((len(trees), n_nodes), dtype=np.float64)
+        left = np.full((len(trees), n_nodes), -1, dtype=np.int32)
+        right = np.full((len(trees), n_nodes), -1, dtype=np.int32)
+        value = np.zeros((len(trees), n_nodes, n_outputs), dtype=np.float64)
+
+        for t, tree in enumerate(trees):
+            n = tree.node_count
+            feature[t, :n] = tree.feature
+            threshold[t, :n] = tree.threshold
+            left[t, :n] = tree.children_left
+            right[t, :n] = tree.children_right
+            node_value = tree.value[:, 0, :]
+            if normalize:
+                node_value = node_value / node_value.sum(axis=1, keepdims=True)
+            value[t, :n] = node_value
+
+        return cls(feature, threshold, left, right, value,
+                   aggregate=aggregate, scale=scale, offset=offset)
+
+    @classmethod
+    def stack(cls, ensembles):
+        """
+        One multi-output ensemble from single-output "sum" ensembles over the
+        same features, so every model is evaluated in one pass. Output j is
+        ensembles[j]'s prediction.
+        """
+
+        if any(e.aggregate != "sum" or e.value.shape[2] != 1 for e in ensembles):
+            raise ValueError("Only single-output sum ensembles can be stacked")
+
+        n_nodes = max(e.feature.shape[1] for e in ensembles)
+
+        def pad(array, fill):
+            width = [(0, 0), (0, n_nodes - array.shape[1])] + [(0, 0)] * (array.ndim - 2)
+            return np.pad(array, width, constant_values=fill)
+
+        value = np.zeros((sum(e.n_trees for e in ensembles), n_nodes, len(ensembles)))
+        start = 0
+        for j, e in enumerate(ensembles):
+            value[start:start + e.n_trees, :e.value.shape[1], j] = e.value[:, :, 0]
+            start += e.n_trees
+
+        return cls(
+            np.concatenate([pad(e.feature, -2) for e in ensembles]),
+            np.concatenate([pad(e.threshold, 0.0) for e in ensembles]),
+            np.concatenate([pad(e.left, -1) for e in ensembles]),
+            np.concatenate([pad(e.right, -1) for e in ensembles]),
+            value,
+            aggregate="sum",
+            scale=np.array([e.scale for e in ensembles], dtype=np.float64),
+            offset=np.array([e.offset for e in ensembles], dtype=np.float64)
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix, meta):
+        return cls(*(arrays[f"{prefix}_{name}"] for name in ARRAY_NAMES),
+                   aggregate=meta["aggregate"], scale=np.asarray(meta["scale"]),
+                   offset=np.asarray(meta["offset"]))
+
+    def to_arrays(self, prefix):
+        arrays = {f"{prefix}_{name}": getattr(self, name) for name in ARRAY_NAMES}
+        meta = {"aggregate": self.aggregate, "scale": np.asarray(self.scale).tolist(),
+                "offset": np.asarray(self.offset).tolist()}
+        return arrays, meta
+
+    def _max_depth(self):
+        depth = np.zeros(self.feature.shape, dtype=np.int32)
+        # Children always come after their parent in sklearn's node order
+        for node in range(self.feature.shape[1]):
+            for children in (self.left[:, node], self.right[:, node]):
+                has_child = children >= 0
+                depth[has_child, children[has_child]] = depth[has_child, node] + 1
+        return int(depth.max())
+
+    def apply(self, X):
+        """Leaf index reached in every tree, shape (n_rows, n_trees)"""
+
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.zeros((X.shape[0], self.n_trees), dtype=np.int32)
+
+        for _ in range(self.max_depth):
+            feature = self.feature[self._tree_idx, node]
+            go_left = X[rows, feature] <= self.threshold[self._tree_idx, node]
+            child = np.where(go_left, self.left[self._tree_idx, node],
+                             self.right[self._tree_idx, node])
+            node = np.where(child >= 0, child, node)
+
+        return node
+
+    def tree_values(self, X, leaves=None):
+        """Per-tree outputs, shape (n_rows, n_trees, n_outputs)"""
+        if leaves is None:
+            leaves = self.apply(X)
+        return self.value[self._tree_idx, leaves]
+
+    def _aggregate(self, values):
+        return values.mean(axis=1) if self.aggregate == "mean" else values.sum(axis=1)
+
+    def _path_contributions(self, n_features):
+        """Root-to-node contribution sums, shape (n_trees, max_nodes, n_features, n_outputs)"""
+
+        table = self._path_table
+        if table is not None and table.shape[2] == n_features:
+            return table
+
+        n_trees, n_nodes = self.feature.shape
+        table = np.zeros((n_trees, n_nodes, n_features, self.value.shape[2]))
+        # Children always come after their parent in sklearn's node order
+        for node in range(n_nodes):
+            for children in (self.left[:, node], self.right[:, node]):
+                trees = np.flatnonzero(children >= 0)
+                if trees.size == 0:
+                    continue
+                child = children[trees]
+                table[trees, child] = table[trees, node]
+                table[trees, child, self.feature[trees, node]] += (
+                    self.value[trees, child] - self.value[trees, node]
+                )
+
+        self._path_table = table
+        return table
+
+    def contributions(self, leaves, n_features, chunk_size=256):
+        """
+        Path attributions for the rows that reached leaves (apply() output).
+        Returns the bias, shape (n_outputs,), and per-feature contributions,
+        shape (n_rows, n_features, n_outputs); bias plus the contributions
+        summed over features equals predict() for each row.
+        """
+
+        table = self._path_contributions(n_features)
+        bias = self.offset + self.scale * self._aggregate(self.value[None, :, 0])[0]
+
+        out = np.empty((leaves.shape[0], n_features, self.value.shape[2]))
+        # Chunked so the (rows, trees, features, outputs) gather stays small
+        for start in range(0, leaves.shape[0], chunk_size):
+            block = leaves[start:start + chunk_size]
+            out[start:start + len(block)] = self.scale * self._aggregate(table[self._tree_idx, block])
+
+        return bias, out
+
+    def combine(self, values):
+        """Ensemble output from tree_values output"""
+        return self.offset + self.scale * self._aggregate(values)
+
+    def predict(self, X):
+        """Ensemble output, shape (n_rows, n_outputs)"""
+        return self.combine(self.tree_values(X))
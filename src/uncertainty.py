@@ -0,0 +1,65 @@
+"""
+Rush prediction uncertainty from the forest's per-tree outputs.
+
+A random forest's class probabilities are the mean of its trees' outputs,
+so how much the trees disagree comes out of the same batched pass
+(TreeEnsemble.tree_values) at no extra model cost. vote_uncertainty
+summarizes it per row:
+
+- vote_share: fraction of trees whose own top class is the predicted class
+- margin: forest probability of the predicted class minus the runner-up's
+- runner_up_share: fraction of trees that rank the runner-up above the
+  predicted class
+- marginal: runner_up_share exceeds marginal_share, i.e. the call would
+  flip on a plausible resample of the forest
+
+These describe the forest's own disagreement; they are not calibrated
+against outcomes. There is nothing to calibrate them on: the rush labels
+are a deterministic function of the inputs and the forest classifies the
+held-out split perfectly, so any outcome-based (e.g. conformal) interval
+collapses to a point. Its leaf probabilities are also nearly 0/1, so a
+quantile interval over the trees is zero-width for almost every row and is
+not reported.
+"""
+
+import numpy as np
+
+# A call is marginal when more than this share of trees prefers the runner-up
+MARGINAL_SHARE = 0.1
+
+
+def vote_uncertainty(votes, probabilities, marginal_share=MARGINAL_SHARE):
+    """
+    votes is the (n_rows, n_trees, n_classes) per-tree output and
+    probabilities its ensemble mean. Returns a dict of per-row arrays.
+    """
+
+    if not 0 <= marginal_share < 1:
+        raise ValueError("marginal_share must be in [0, 1)")
+
+    rows = np.arange(votes.shape[0])
+    top = probabilities.argmax(axis=1)
+    others = np.where(np.arange(probabilities.shape[1]) == top[:, None], -np.inf, probabilities)
+    runner_up = others.argmax(axis=1)
+
+    runner_up_share = (votes[rows, :, runner_up] > votes[rows, :, top]).mean(axis=1)
+
+    return {
+        "vote_share": (votes.argmax(axis=2) == top[:, None]).mean(axis=1),
+        "margin": probabilities[rows, top] - probabilities[rows, runner_up],
+        "runner_up": runner_up,
+        "runner_up_share": runner_up_share,
+        "marginal": runner_up_share > marginal_share,
+    }
+
+
+def row_uncertainty(summary, labels, i=0):
+    """JSON-ready view of row i of a vote_uncertainty summary"""
+
+    return {
+        "vote_share": round(float(summary["vote_share"][i]), 3),
+        "margin": round(float(summary["margin"][i]), 3),
+        "runner_up": str(labels[summary["runner_up"][i]]),
+        "runner_up_share": round(float(summary["runner_up_share"][i]), 3),
+        "marginal": bool(summary["marginal"][i]),
+    }
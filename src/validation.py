@@ -0,0 +1,245 @@
+"""
+Request validation and coercion for the API.
+
+A schema is a dict of field name -> Field. compile_schema turns it once into
+a tuple of (name, converter, required, default) entries whose converters
+are plain closures with the bounds and allowed values bound in, so
+validating a request is one pass over the fields with no reflection. Bad
+requests raise ValidationError with a message per field, which the API
+returns as a 400 before any model work is done.
+
+Usage:
+    python src/validation.py   # micro-benchmark
+"""
+
+import math
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from catalog import FESTIVALS, QUOTAS, TRAIN_CLASSES, TRAIN_TYPES
+
+_MISSING = object()
+
+
+class ValidationError(ValueError):
+    """Request failed validation; errors maps field name -> message"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(f"{field}: {msg}" for field, msg in errors.items()))
+
+
+class Field:
+    """
+    One request field. kind is "int", "float", "enum" or "str"; minimum
+    and maximum bound numbers, choices lists enum values.
+    """
+
+    def __init__(self, kind, required=True, default=None, minimum=None, maximum=None, choices=None):
+        self.kind = kind
+        self.required = required
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = choices
+
+
+def _number_converter(kind, minimum, maximum):
+    label = "an integer" if kind == "int" else "a number"
+
+    def convert(value):
+        if isinstance(value, bool):
+            raise ValueError(f"must be {label}")
+        if isinstance(value, str):
+            try:
+                value = float(value.strip())
+            except ValueError:
+                raise ValueError(f"must be {label}") from None
+        elif not isinstance(value, (int, float)):
+            raise ValueError(f"must be {label}")
+
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                raise ValueError(f"must be {label}")
+            if kind == "int" and not value.is_integer():
+                raise ValueError(f"must be {label}")
+
+        # Integral numbers stay ints so equal requests share one cache key
+        value = int(value) if kind == "int" or float(value).is_integer() else float(value)
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise ValueError(f"must be between {minimum} and {maximum}")
+        return value
+
+    return convert
+
+
+def _enum_converter(choices):
+    allowed = frozenset(choices)
+    listing = ", ".join(choices)
+
+    def convert(value):
+        if not isinstance(value, str) or value not in allowed:
+            raise ValueError(f"must be one of: {listing}")
+        return value
+
+    return convert
+
+
+def _str_converter(value):
+    if not isinstance(value, str):
+        raise ValueError("must be a string")
+    return value.strip()
+
+
+def compile_schema(schema):
+    """Compile a dict of Fields into a validator callable"""
+
+    compiled = []
+    for name, field in schema.items():
+        if field.kind in ("int", "float"):
+            convert = _number_converter(field.kind, field.minimum, field.maximum)
+        elif field.kind == "enum":
+            convert = _enum_converter(field.choices)
+        elif field.kind == "str":
+            convert = _str_converter
+        else:
+            raise ValueError(f"Unknown field kind {field.kind!r} for {name}")
+        compiled.append((name, convert, field.required, field.default))
+    compiled = tuple(compiled)
+
+    def validate(data):
+        """Coerced copy of data restricted to the schema fields"""
+
+        if not isinstance(data, dict):
+            raise ValidationError({"body": "must be a JSON object"})
+
+        params = {}
+        errors = None
+        for name, convert, required, default in compiled:
+            value = data.get(name, _MISSING)
+            if value is _MISSING or value is None:
+                if required:
+                    errors = errors or {}
+                    errors[name] = "is required"
+                else:
+                    params[name] = default
+                continue
+            try:
+                params[name] = convert(value)
+            except ValueError as e:
+                errors = errors or {}
+                errors[name] = str(e)
+
+        if errors:
+            raise ValidationError(errors)
+        return params
+
+    return validate
+
+
+ROUTE_FIELDS = {
+    "festival": Field("enum", choices=list(FESTIVALS)),
+    "route_distance_km": Field("float", minimum=1, maximum=5000),
+    "source_city_tier": Field("int", minimum=1, maximum=3),
+    "destination_city_tier": Field("int", minimum=1, maximum=3),
+}
+
+PREDICT_SCHEMA = {
+    "festival": ROUTE_FIELDS["festival"],
+    "days_before_festival": Field("int", minimum=0, maximum=120),
+    "source_city": Field("str", required=False),
+    "destination_city": Field("str", required=False),
+    "route_distance_km": ROUTE_FIELDS["route_distance_km"],
+    "source_city_tier": ROUTE_FIELDS["source_city_tier"],
+    "destination_city_tier": ROUTE_FIELDS["destination_city_tier"],
+    "train_class": Field("enum", choices=TRAIN_CLASSES),
+    "train_type": Field("enum", choices=TRAIN_TYPES),
+    "current_waitlist_position": Field("int", required=False, default=0, minimum=0, maximum=1000),
+    "quota": Field("enum", required=False, default="General", choices=QUOTAS),
+}
+
+RUSH_CURVE_SCHEMA = {
+    **ROUTE_FIELDS,
+    "train_class": PREDICT_SCHEMA["train_class"],
+    "train_type": PREDICT_SCHEMA["train_type"],
+    "days_min": Field("int", required=False, default=0, minimum=0, maximum=120),
+    "days_max": Field("int", required=False, default=120, minimum=0, maximum=120),
+}
+
+ALTERNATIVES_SCHEMA = {
+    **ROUTE_FIELDS,
+    "days_before_festival": PREDICT_SCHEMA["days_before_festival"],
+    "current_waitlist_position": Field("int", required=False, default=1, minimum=1, maximum=1000),
+    "top_n": Field("int", required=False, minimum=1, maximum=1000),
+}
+
+HEATMAP_SCHEMA = {
+    "festival": Field("enum", required=False, choices=list(FESTIVALS)),
+    "source_city": Field("str", required=False),
+    "destination_city": Field("str", required=False),
+}
+
+validate_predict = compile_schema(PREDICT_SCHEMA)
+validate_rush_curve = compile_schema(RUSH_CURVE_SCHEMA)
+validate_alternatives = compile_schema(ALTERNATIVES_SCHEMA)
+validate_heatmap = compile_schema(HEATMAP_SCHEMA)
+
+
+def validate_predict_batch(data, max_rows=10_000):
+    """
+    Validate {"journeys": [...]} where each journey is a /api/predict
+    payload. Returns the coerced journeys as a dict of columns.
+    """
+
+    journeys = data.get("journeys") if isinstance(data, dict) else None
+    if not isinstance(journeys, list) or not journeys:
+        raise ValidationError({"journeys": "must be a non-empty list"})
+    if len(journeys) > max_rows:
+        raise ValidationError({"journeys": f"must not contain more than {max_rows} items"})
+
+    columns = {name: [] for name in PREDICT_SCHEMA}
+    errors = {}
+    for i, journey in enumerate(journeys):
+        try:
+            params = validate_predict(journey)
+        except ValidationError as e:
+            errors.update((f"journeys[{i}].{field}", msg) for field, msg in e.errors.items())
+            continue
+        for name, value in params.items():
+            columns[name].append(value)
+
+    if errors:
+        raise ValidationError(errors)
+    return columns
+
+
+def benchmark(number=100_000):
+    """Mean microseconds per validate_predict call for a valid and an invalid request"""
+
+    valid = {
+        "festival": "Diwali", "days_before_festival": "20", "source_city": "Delhi",
+        "destination_city": "Patna", "route_distance_km": 1000, "source_city_tier": 1,
+        "destination_city_tier": 2, "train_class": "Sleeper", "train_type": "Superfast",
+        "current_waitlist_position": 40, "quota": "General"
+    }
+    invalid = dict(valid, days_before_festival="soon", train_class="Business")
+
+    def reject():
+        try:
+            validate_predict(invalid)
+        except ValidationError:
+            pass
+
+    return {
+        "valid_us": timeit.timeit(lambda: validate_predict(valid), number=number) / number * 1e6,
+        "invalid_us": timeit.timeit(reject, number=number) / number * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print(f"⏱️ validate_predict: {results['valid_us']:.2f} µs valid, "
+          f"{results['invalid_us']:.2f} µs rejected")
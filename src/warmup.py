@@ -0,0 +1,182 @@
+"""
+Advisory cache warm-up from historical request logs.
+
+Streams a JSONL request log (plain or .gz), counts requests by their
+canonical cache key, keeps the top-K most frequent and precomputes their
+advisories into the shared DiskCache in parallel batches. Each batch is
+scored with one vectorized get_batch_advisory pass. Requests already
+cached for the current model version are skipped, so re-running after a
+deploy only fills what is missing.
+
+Each log line is either a /api/predict payload or a request log record
+carrying the payload under "request". Payloads go through the same route
+filling and validation as /api/predict, so keys match the service's and
+requests carrying only city names are warmed too; invalid ones are skipped.
+
+Run it as a pre-start step, or set WARMUP_LOG and let the first app worker
+on the host do it (warm_cache_once); other workers start serving at once.
+
+Usage:
+    python src/warmup.py --log data/request_logs/requests.jsonl.gz --top-k 5000 --workers 4
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache import DiskCache, advisory_cache_key
+from file_lock import file_lock
+from model_registry import load_advisor
+from route_graph import fill_route_fields, load_route_graph
+from validation import ValidationError, validate_predict
+
+
+def _complete_lines(f):
+    """Lines of f, stopping quietly at the end of a truncated gzip stream"""
+    try:
+        yield from f
+    except EOFError:
+        # The .part file of a killed logger: readable up to its last flush
+        return
+
+
+def iter_log_requests(paths, graph=None):
+    """
+    Yield validated /api/predict parameters from one or more JSONL logs,
+    with route fields filled from graph (the default route graph if None)
+    """
+
+    graph = graph if graph is not None else load_route_graph()
+    for path in paths:
+        opener = gzip.open if path.endswith((".gz", ".gz.part")) else open
+        with opener(path, "rt") as f:
+            for line in _complete_lines(f):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                try:
+                    yield validate_predict(fill_route_fields(record.get("request", record), graph))
+                except ValidationError:
+                    continue
+
+
+def top_requests(paths, top_k):
+    """The top_k most frequent distinct requests, most frequent first"""
+
+    counts = Counter()
+    params_by_key = {}
+    for params in iter_log_requests(paths):
+        key = advisory_cache_key("", params)
+        counts[key] += 1
+        params_by_key.setdefault(key, params)
+
+    return [params_by_key[key] for key, _ in counts.most_common(top_k)]
+
+
+def _warm_batch(advisor, cache, batch):
+    keys = [advisory_cache_key(advisor.model_version, params) for params in batch]
+    missing = [i for i, key in enumerate(keys) if cache.get(key) is None]
+    if not missing:
+        return 0
+
+    try:
+        advisories = advisor.get_complete_advisories([batch[i] for i in missing])
+    except Exception as e:
+        print(f"⚠️ Skipping warm-up batch of {len(missing)} requests: {e}")
+        return 0
+
+    for i, advisory in zip(missing, advisories):
+        cache.set(keys[i], advisory)
+    return len(missing)
+
+
+_worker_advisor = None
+_worker_cache = None
+
+
+def _init_worker(model_dir, cache_path):
+    global _worker_advisor, _worker_cache
+    _worker_advisor = load_advisor(model_dir)
+    _worker_cache = DiskCache(cache_path)
+
+
+def _warm_batch_task(batch):
+    return _warm_batch(_worker_advisor, _worker_cache, batch)
+
+
+def warm_cache(log_paths, cache, top_k=1000, advisor=None, model_dir="ml/models",
+               workers=1, batch_size=64):
+    """
+    Precompute the top_k most frequent logged requests into cache.
+
+    With workers=1 the given advisor (or one loaded from model_dir) scores
+    in-process; otherwise each worker process loads its own copy of the
+    models from model_dir and writes into the same cache file.
+    """
+
+    start = time.perf_counter()
+    requests = top_requests(log_paths, top_k)
+    batches = [requests[i:i + batch_size] for i in range(0, len(requests), batch_size)]
+
+    if workers == 1:
+        advisor = advisor if advisor is not None else load_advisor(model_dir)
+        computed = sum(_warm_batch(advisor, cache, batch) for batch in batches)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_dir, cache.path)) as pool:
+            computed = sum(pool.map(_warm_batch_task, batches))
+
+    return {
+        "requests": len(requests),
+        "computed": computed,
+        "already_cached": len(requests) - computed,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
+def warm_cache_once(log_paths, cache, lock_path=None, **kwargs):
+    """
+    warm_cache unless another process on the host is already warming this
+    cache; then returns None without waiting for it
+    """
+
+    lock_path = lock_path or f"{cache.path}.warmup.lock"
+    with file_lock(lock_path, blocking=False) as held:
+        if not held:
+            return None
+        return warm_cache(log_paths, cache, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the advisory cache from request logs")
+    parser.add_argument("--log", nargs="+", required=True, help="JSONL request log(s), .gz allowed")
+    parser.add_argument("--top-k", type=int, default=1000)
+    parser.add_argument("--model-dir", default="ml/models")
+    parser.add_argument("--cache-path", default="data/cache/advisories.sqlite")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    summary = warm_cache(
+        args.log, DiskCache(args.cache_path), top_k=args.top_k, model_dir=args.model_dir,
+        workers=args.workers, batch_size=args.batch_size
+    )
+    print(f"✅ Warmed {summary['computed']} advisories "
+          f"({summary['already_cached']} already cached) in {summary['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
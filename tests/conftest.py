@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+
+MODEL_DIR = os.path.join(BASE_DIR, "ml", "models")
+
+
+@pytest.fixture(scope="session")
+def advisor():
+    """Shared advisor instance; skips model tests until models are trained"""
+    if not os.path.exists(os.path.join(MODEL_DIR, "rush_classifier.pkl")):
+        pytest.skip("Models not trained. Run src/train_enhanced_models.py first")
+
+    from advisor import FestiveTravelAdvisor
+    return FestiveTravelAdvisor(model_dir=MODEL_DIR)
@@ -0,0 +1,158 @@
+"""
+Tests for the HTTP advisor client against a live local API server
+"""
+
+import os
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("requests")
+
+from flask import Flask, g, jsonify
+from werkzeug.serving import make_server
+
+from api_client import AdvisorClient, ApiError
+from model_registry import SMOKE_SET
+
+from conftest import BASE_DIR
+
+
+def _serve(flask_app):
+    server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+@pytest.fixture(scope="module")
+def client(advisor):
+    os.environ.setdefault("ADVISORY_CACHE", "0")
+    os.environ.setdefault("REQUEST_LOG", "0")
+    cwd = os.getcwd()
+    os.chdir(BASE_DIR)
+    try:
+        import app
+    finally:
+        os.chdir(cwd)
+
+    server, url = _serve(app.app)
+    client = AdvisorClient(url, retries=0)
+    yield client
+    client.close()
+    server.shutdown()
+
+
+def test_client_matches_in_process_advisor(client, advisor):
+    assert client.model_version == advisor.model_version
+
+    for request in SMOKE_SET:
+        assert client.get_complete_advisory(**request) == advisor.get_complete_advisory(**request)
+
+    # Route fields come from the route graph when only city names are sent
+    by_city = {k: v for k, v in SMOKE_SET[0].items()
+               if k not in ("route_distance_km", "source_city_tier", "destination_city_tier")}
+    assert client.get_complete_advisory(**by_city) == advisor.get_complete_advisory(**SMOKE_SET[0])
+
+    # Per-request attributions only when asked for
+    assert "factor_contributions" not in client.get_complete_advisory(**SMOKE_SET[0])["rush_analysis"]
+    explained = client.get_complete_advisory(**SMOKE_SET[0], with_attributions=True)
+    assert explained == advisor.get_complete_advisory(**SMOKE_SET[0], with_attributions=True)
+
+    route = dict(festival="Diwali", route_distance_km=1000, source_city_tier=1,
+                 destination_city_tier=2, train_class="Sleeper", train_type="Express")
+    assert client.rush_curve(**route, days_range=range(5, 30)) == \
+        advisor.rush_curve(**route, days_range=range(5, 30))
+
+    ranking = client.rank_alternatives("Holi", 10, 800, 1, 2, current_waitlist_position=30, top_n=5)
+    expected = advisor.rank_alternatives("Holi", 10, 800, 1, 2, current_waitlist_position=30, top_n=5)
+    assert ranking["options"] == [
+        {k: (str(v) if isinstance(v, np.str_) else v) for k, v in opt.items()}
+        for opt in expected["options"]
+    ]
+
+
+def test_batch_advisory_over_http(client, advisor):
+    days = np.arange(0, 121)
+    kwargs = dict(festival="Durga Puja", days_before_festival=days, route_distance_km=1500,
+                  source_city_tier=1, destination_city_tier=3, train_class="3AC",
+                  train_type="Superfast", current_waitlist_position=np.where(days % 2, 25, 0))
+
+    remote = client.get_batch_advisory(**kwargs)
+    local = advisor.get_batch_advisory(**kwargs)
+
+    assert remote.keys() == local.keys()
+    for name in local:
+        np.testing.assert_array_equal(remote[name], local[name])
+
+
+def test_metrics_report_input_drift(client, advisor):
+    client.get_complete_advisory(**dict(SMOKE_SET[0], source_city="Surat"))
+
+    drift = client.session.get(f"{client.base_url}/metrics").json()["input_drift"]
+    assert drift["model_version"] == advisor.model_version
+    assert drift["requests"] >= 1
+    assert ["Surat", 1] in drift["fields"]["source_city"]["top_unseen"]
+
+
+def test_drift_monitor_ignores_swapped_out_models(client, advisor):
+    import app
+
+    monitor = app.drift_monitor
+    with app.app.test_request_context():
+        g.variant = "primary"
+        # A request still pinned to models the registry has replaced
+        app.observe_inputs(SimpleNamespace(model_version="retired"), SMOKE_SET[0])
+        assert app.drift_monitor is monitor
+
+        requests = monitor.report()["requests"]
+        app.observe_inputs(advisor, SMOKE_SET[0])
+        assert app.drift_monitor is monitor
+        assert monitor.report()["requests"] == requests + 1
+
+
+def test_service_errors_raise_api_error(client):
+    with pytest.raises(ApiError) as info:
+        client.get_complete_advisory(**dict(SMOKE_SET[0], days_before_festival=500))
+    assert info.value.status == 400
+    assert "days_before_festival" in info.value.details
+
+    response = client.session.get(f"{client.base_url}/api/heatmap", params={"festival": "Onam"})
+    assert response.status_code == 400 and "festival" in response.json()["details"]
+
+    # No listed route between the cities: the distance is not guessed
+    by_city = {k: v for k, v in SMOKE_SET[0].items() if k != "route_distance_km"}
+    with pytest.raises(ApiError) as info:
+        client.get_complete_advisory(**dict(by_city, source_city="Patna", destination_city="Lucknow"))
+    assert info.value.status == 400
+    assert "route_distance_km" in info.value.details
+
+    with pytest.raises(ValueError, match="contiguous"):
+        client.rush_curve("Diwali", 1000, 1, 2, "Sleeper", "Express", days_range=[1, 5, 9])
+
+
+def test_unavailable_responses_are_retried():
+    flaky = Flask("flaky")
+    calls = []
+
+    @flaky.route("/health")
+    def health():
+        calls.append(1)
+        if len(calls) < 3:
+            return jsonify({"success": False, "error": "warming up"}), 503
+        return jsonify({"status": "healthy"}), 200, {"X-Model-Version": "abc123"}
+
+    server, url = _serve(flaky)
+    try:
+        client = AdvisorClient(url, retries=3, backoff=0)
+        assert client.model_version == "abc123"
+        assert len(calls) == 3
+
+        calls.clear()
+        with pytest.raises(ApiError) as info:
+            AdvisorClient(url, retries=1, backoff=0).health()
+        assert info.value.status == 503
+    finally:
+        server.shutdown()
@@ -0,0 +1,60 @@
+"""
+Tests for per-request path attributions on the flattened rush forest
+"""
+
+import numpy as np
+
+from model_registry import SMOKE_SET
+from tree_engine import TreeEnsemble
+
+
+def test_single_split_attribution():
+    # Root splits on feature 0 at 0.5; the leaves are pure
+    ensemble = TreeEnsemble(
+        feature=np.array([[0, -2, -2]], dtype=np.int32),
+        threshold=np.array([[0.5, 0.0, 0.0]]),
+        left=np.array([[1, -1, -1]], dtype=np.int32),
+        right=np.array([[2, -1, -1]], dtype=np.int32),
+        value=np.array([[[0.5, 0.5], [1.0, 0.0], [0.0, 1.0]]])
+    )
+    X = np.array([[0.0, 9.0], [1.0, 9.0]])
+
+    bias, contributions = ensemble.contributions(ensemble.apply(X), n_features=2)
+
+    np.testing.assert_allclose(bias, [0.5, 0.5])
+    np.testing.assert_allclose(contributions[:, 0], [[0.5, -0.5], [-0.5, 0.5]])
+    np.testing.assert_allclose(contributions[:, 1], 0)
+
+
+def test_attributions_add_up_to_forest_output(advisor):
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(700, len(advisor.rush_features)))
+    ensemble = advisor.rush_ensemble
+
+    bias, contributions = ensemble.contributions(ensemble.apply(X), len(advisor.rush_features),
+                                                 chunk_size=256)
+
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), ensemble.predict(X), atol=1e-12)
+
+
+def test_factors_are_per_request(advisor):
+    results = [advisor.predict_rush_level(**{k: r[k] for k in (
+        "festival", "days_before_festival", "route_distance_km", "source_city_tier",
+        "destination_city_tier", "train_class", "train_type")}, with_attributions=True)
+        for r in SMOKE_SET]
+
+    for result in results:
+        contributions = result["factor_contributions"]
+        assert set(contributions) == set(advisor.rush_features)
+        assert result["top_factors"] == [
+            name.replace("_", " ").title() for name in list(contributions)[:4]
+        ]
+    assert len({tuple(r["factor_contributions"].values()) for r in results}) == len(results)
+
+    # Attributions are opt-in; the default payload keeps the global factors
+    plain = advisor.predict_rush_level("Diwali", 20, 1000, 1, 2, "Sleeper", "Superfast")
+    explained = advisor.predict_rush_level("Diwali", 20, 1000, 1, 2, "Sleeper", "Superfast",
+                                           with_attributions=True)
+    assert plain["top_factors"] == advisor._top_factors()
+    assert "factor_contributions" not in plain
+    assert explained["probabilities"] == plain["probabilities"]
@@ -0,0 +1,58 @@
+"""
+Tests for offline batch scoring
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_score import score_file
+from model_registry import SMOKE_SET
+
+from conftest import MODEL_DIR
+
+
+def test_batch_advisory_matches_single_requests(advisor):
+    columns = {
+        key: np.array([request[key] for request in SMOKE_SET])
+        for key in SMOKE_SET[0] if key not in ("source_city", "destination_city")
+    }
+    batch = advisor.get_batch_advisory(**columns)
+
+    for i, request in enumerate(SMOKE_SET):
+        single = advisor.get_complete_advisory(**request)
+        assert batch["rush_level"][i] == single["rush_analysis"]["rush_level"]
+        assert batch["rush_confidence"][i] == single["rush_analysis"]["confidence"]
+        assert batch["recommended_booking_days"][i] == single["optimal_booking_window"]["recommended"]
+        assert batch["recommendation_codes"][i] == "|".join(single["recommendation_codes"])
+        if single["confirmation_probability"] is None:
+            assert np.isnan(batch["confirmation_probability"][i])
+        else:
+            assert batch["confirmation_probability"][i] == single["confirmation_probability"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_file_in_chunks(advisor, tmp_path, workers):
+    frame = pd.DataFrame(SMOKE_SET * 5)
+    frame.loc[::4, "quota"] = None
+    source = tmp_path / "journeys.csv"
+    frame.to_csv(source, index=False)
+    target = tmp_path / "advisories.csv"
+
+    summary = score_file(str(source), str(target), model_dir=MODEL_DIR,
+                         workers=workers, chunk_size=4)
+
+    scored = pd.read_csv(target)
+    assert summary["rows"] == len(frame) == len(scored)
+    assert scored["festival"].tolist() == frame["festival"].tolist()
+    assert set(scored["rush_level"]) <= set(advisor.rush_labels)
+    waitlisted = scored["current_waitlist_position"] > 0
+    assert scored.loc[waitlisted, "confirmation_probability"].notna().all()
+    assert scored.loc[~waitlisted, "confirmation_probability"].isna().all()
+
+
+def test_missing_columns_rejected(advisor, tmp_path):
+    source = tmp_path / "journeys.csv"
+    pd.DataFrame([{"festival": "Diwali"}]).to_csv(source, index=False)
+    with pytest.raises(ValueError, match="Missing input columns"):
+        score_file(str(source), str(tmp_path / "out.csv"), model_dir=MODEL_DIR)
@@ -0,0 +1,67 @@
+"""
+Tests for the quantile booking window served from one batched pass
+"""
+
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from advisor import FestiveTravelAdvisor
+from lite_advisor import LiteAdvisor, _boosting_ensemble, export_bundle
+from tree_engine import TreeEnsemble
+
+from conftest import MODEL_DIR
+
+JOURNEYS = dict(
+    festival=np.array(["Diwali", "Holi", "Durga Puja", "Christmas"]),
+    route_distance_km=np.array([1500, 400, 900, 2200]),
+    source_city_tier=np.array([1, 2, 1, 3]),
+    destination_city_tier=np.array([2, 1, 3, 1]),
+    train_class=np.array(["Sleeper", "3AC", "2AC", "General"])
+)
+
+
+def test_stacked_ensemble_matches_each_model(advisor):
+    models = [advisor.booking_model, *advisor.booking_quantile_models]
+    stacked = TreeEnsemble.stack([_boosting_ensemble(model) for model in models])
+
+    X = np.random.default_rng(3).normal(size=(300, len(advisor.booking_features)))
+    frame = pd.DataFrame(X, columns=advisor.booking_features)
+    expected = np.column_stack([model.predict(frame) for model in models])
+
+    np.testing.assert_allclose(stacked.predict(X), expected, atol=1e-9)
+
+
+def test_window_brackets_recommendation(advisor):
+    optimal_min, optimal_max, recommended = advisor.predict_booking_window_batch(**JOURNEYS)
+
+    assert ((optimal_min <= recommended) & (recommended <= optimal_max)).all()
+    # Diwali books further out than Holi, and the band comes from the data
+    assert optimal_min[0] > optimal_max[1]
+    np.testing.assert_array_equal(recommended, advisor.predict_booking_batch(**JOURNEYS).astype(int))
+
+    single = advisor.predict_optimal_booking_window(
+        **{k: v[0] for k, v in JOURNEYS.items()}
+    )
+    assert single == {"optimal_min": optimal_min[0], "optimal_max": optimal_max[0],
+                      "recommended": recommended[0]}
+
+
+def test_lite_bundle_and_fallback(advisor, tmp_path):
+    lite = LiteAdvisor(bundle_dir=export_bundle(advisor, str(tmp_path / "lite")))
+    for got, expected in zip(lite.predict_booking_window_batch(**JOURNEYS),
+                             advisor.predict_booking_window_batch(**JOURNEYS)):
+        np.testing.assert_array_equal(got, expected)
+
+    # Models trained before the quantile bounds keep the ±5-day band
+    model_dir = tmp_path / "models"
+    shutil.copytree(MODEL_DIR, model_dir, ignore=shutil.ignore_patterns(
+        "lite", "booking_lower_regressor.pkl", "booking_upper_regressor.pkl"
+    ))
+    legacy = FestiveTravelAdvisor(model_dir=str(model_dir))
+    optimal_min, optimal_max, recommended = legacy.predict_booking_window_batch(**JOURNEYS)
+
+    days = advisor.predict_booking_batch(**JOURNEYS)
+    np.testing.assert_array_equal(optimal_min, (days - 5).astype(int))
+    np.testing.assert_array_equal(optimal_max, (days + 5).astype(int))
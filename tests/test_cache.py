@@ -0,0 +1,92 @@
+"""
+Tests for the in-process and on-disk prediction caches
+"""
+
+import sqlite3
+
+from cache import DiskCache, LRUCache, advisory_cache_key
+from model_registry import SMOKE_SET
+
+
+def test_lru_evicts_oldest():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_advisory_key_is_canonical():
+    params = dict(SMOKE_SET[0])
+    reordered = dict(reversed(list(params.items())))
+    assert advisory_cache_key("v1", params) == advisory_cache_key("v1", reordered)
+    assert advisory_cache_key("v1", params) != advisory_cache_key("v2", params)
+
+
+def test_disk_cache_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = DiskCache(path)
+    writer.set("k", {"rush_level": "High", "confidence": 0.9})
+
+    # A second instance stands in for another worker process
+    reader = DiskCache(path)
+    assert reader.get("k") == {"rush_level": "High", "confidence": 0.9}
+    assert reader.get("missing") is None
+    assert reader.stats()["hits"] == 1 and reader.stats()["misses"] == 1
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=1000,
+                      touch_interval=0, evict_check_every=1)
+    payload = "x" * 200
+    for i in range(4):
+        cache.set(f"k{i}", payload)
+    cache.get("k0")  # refresh k0 so k1 is now the oldest
+    cache.set("k4", payload)
+    cache.set("k5", payload)
+
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.get("k0") == payload
+    assert cache.get("k1") is None
+    assert cache.evictions >= 1
+
+
+def test_evict_frees_oldest_entries_down_to_ninety_percent(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=10_000,
+                      touch_interval=0, evict_check_every=10_000)
+    for i in range(10):
+        cache.set(f"k{i}", "x" * 1000)
+    cache.max_bytes = 5000
+
+    # 10 x 1002 bytes must drop to at most 4500: the six oldest go
+    assert cache.evict() == 6
+    assert [cache.get(f"k{i}") is None for i in range(10)] == [True] * 6 + [False] * 4
+    assert cache.stats()["bytes"] <= 4500
+    assert cache.evictions == 6
+
+
+def test_locked_writes_are_dropped_not_raised(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = DiskCache(path, max_bytes=100, busy_timeout=0.05)
+    cache.set("old", "x" * 200)
+
+    # Another worker holding the write lock past the busy timeout
+    other = sqlite3.connect(path)
+    other.execute("BEGIN IMMEDIATE")
+    assert cache.set("k", "x" * 200) is False
+    assert cache.evict() == 0
+    assert cache.stats()["write_errors"] == 2
+    other.rollback()
+
+    assert cache.set("k", {"rush_level": "High"}) is True
+    assert cache.get("k") == {"rush_level": "High"}
+
+
+def test_advisory_round_trips_through_disk_cache(advisor, tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    result = advisor.get_complete_advisory(**SMOKE_SET[0])
+    key = advisory_cache_key(advisor.model_version, SMOKE_SET[0])
+    cache.set(key, result)
+    assert cache.get(key) == result
@@ -0,0 +1,51 @@
+"""
+Tests for the isotonic confirmation calibration
+"""
+
+import shutil
+
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+
+from advisor import FestiveTravelAdvisor
+from calibration import (apply_calibration, calibrate, fit_isotonic, load_calibration,
+                         reliability, save_calibration)
+from lite_advisor import LiteAdvisor, export_bundle
+
+from conftest import MODEL_DIR
+
+
+def test_lookup_reproduces_isotonic_fit():
+    rng = np.random.default_rng(0)
+    raw = rng.uniform(-0.1, 1.1, 2000)
+    # Systematically overconfident regressor
+    target = np.clip(raw, 0, 1) ** 2 + rng.normal(0, 0.02, raw.size)
+
+    calibration = fit_isotonic(raw, target)
+    expected = IsotonicRegression(y_min=0, y_max=1, out_of_bounds="clip").fit(raw, target)
+
+    grid = np.linspace(-0.5, 1.5, 101)
+    np.testing.assert_allclose(apply_calibration(grid, calibration), expected.predict(grid))
+    assert (np.diff(apply_calibration(grid, calibration)) >= 0).all()
+
+    fitted, report = calibrate(raw, target)
+    assert report["calibrated_gap"] < report["raw_gap"] / 3
+    assert reliability(apply_calibration(raw, fitted), target) < reliability(np.clip(raw, 0, 1), target)
+
+
+def test_calibration_ships_with_models_and_bundle(advisor, tmp_path):
+    model_dir = tmp_path / "models"
+    shutil.copytree(MODEL_DIR, model_dir, ignore=shutil.ignore_patterns("lite", "*.npz"))
+    assert load_calibration(str(model_dir)) is None
+
+    # A flat calibration makes its effect unmistakable
+    save_calibration(str(model_dir), (np.array([0.0, 1.0]), np.array([0.42, 0.42])))
+    calibrated = FestiveTravelAdvisor(model_dir=str(model_dir))
+    lite = LiteAdvisor(bundle_dir=export_bundle(calibrated, str(tmp_path / "lite")))
+
+    kwargs = dict(current_waitlist_position=np.array([5, 80, 300]), days_to_journey=20,
+                  train_type="Express", quota="General", train_class="Sleeper",
+                  historical_rush_index=70.0)
+    np.testing.assert_allclose(calibrated.predict_confirmation_batch(**kwargs), 0.42)
+    np.testing.assert_allclose(lite.predict_confirmation_batch(**kwargs), 0.42)
+    assert calibrated.model_version != advisor.model_version
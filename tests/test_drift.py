@@ -0,0 +1,77 @@
+"""
+Tests for streaming input drift and out-of-vocabulary monitoring
+"""
+
+import numpy as np
+import pandas as pd
+
+from drift import CountMinSketch, DriftMonitor, build_profile
+from lite_advisor import LiteAdvisor, export_bundle
+
+
+def _requests(n, seed, festivals=("Diwali", "Holi", "Pongal"), cities=("Delhi", "Mumbai"),
+              days=(0, 60)):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "festival": rng.choice(festivals, n),
+        "source_city": rng.choice(cities, n),
+        "days_before_festival": rng.integers(days[0], days[1] + 1, n),
+        "route_distance_km": rng.choice([350.0, 1000.0, 2000.0], n),
+    })
+
+
+def test_sketch_never_undercounts():
+    sketch = CountMinSketch(width=64, depth=4)
+    rng = np.random.default_rng(6)
+    keys = [f"city-{k}" for k in rng.zipf(1.5, 5000) % 500]
+    for key in keys:
+        sketch.add(key)
+
+    exact = pd.Series(keys).value_counts()
+    estimates = np.array([sketch.estimate(key) for key in exact.index])
+    assert (estimates >= exact.to_numpy()).all()
+    assert estimates[0] - exact.iloc[0] <= np.e * len(keys) / 64
+
+
+def test_stable_traffic_is_quiet_and_shifted_traffic_drifts():
+    profile = build_profile(_requests(10_000, seed=0))
+
+    stable = DriftMonitor(profile)
+    for record in _requests(2000, seed=1).to_dict("records"):
+        stable.observe(record)
+    report = stable.report()
+    assert report["requests"] == 2000 and report["drifted"] == []
+    assert report["fields"]["source_city"]["unseen_rate"] == 0
+
+    # Late bookings for Holi from cities the encoders never saw
+    shifted = DriftMonitor(profile)
+    for record in _requests(2000, seed=2, festivals=("Holi",), cities=("Delhi", "Surat", "Indore"),
+                            days=(80, 120)).to_dict("records"):
+        shifted.observe(record)
+    report = shifted.report()
+
+    assert report["drifted"] == ["days_before_festival", "festival", "source_city"]
+    cities = report["fields"]["source_city"]
+    assert 0.6 < cities["unseen_rate"] < 0.73
+    assert {value for value, _ in cities["top_unseen"]} == {"Surat", "Indore"}
+    assert report["fields"]["days_before_festival"]["above_training_range"] > 0
+
+
+def test_batch_observation_matches_per_request():
+    profile = build_profile(_requests(5000, seed=0))
+    batch = _requests(500, seed=3, cities=("Delhi", "Pune"))
+
+    one_by_one, columns = DriftMonitor(profile), DriftMonitor(profile)
+    for record in batch.to_dict("records"):
+        one_by_one.observe(record)
+    columns.observe_columns({col: batch[col].tolist() for col in batch.columns})
+
+    assert columns.report() == one_by_one.report()
+
+
+def test_profile_ships_with_models_and_bundle(advisor, tmp_path):
+    assert set(advisor.input_profile["categorical"]) >= {"festival", "source_city", "train_class"}
+    lite = LiteAdvisor(bundle_dir=export_bundle(advisor, str(tmp_path / "lite")))
+    assert lite.input_profile == advisor.input_profile
+
+    assert DriftMonitor(None, model_version="old").report() == {"model_version": "old", "profile": None}
@@ -0,0 +1,77 @@
+"""
+Tests for A/B routing and shadow scoring
+"""
+
+from experiments import ModelExperiment
+
+
+class StubAdvisor:
+    def __init__(self, rush_level, confirmation):
+        self.rush_level = rush_level
+        self.confirmation = confirmation
+
+    def get_complete_advisory(self, **params):
+        return {
+            "rush_analysis": {"rush_level": self.rush_level},
+            "confirmation_probability": self.confirmation,
+            "optimal_booking_window": {"recommended": 40},
+            "recommendation_codes": ["RUSH_" + self.rush_level.upper()]
+        }
+
+
+class StubRegistry:
+    def __init__(self, advisor, version):
+        self.advisor = advisor
+        self.version = version
+
+    def current(self):
+        return self.advisor
+
+
+def test_shadow_records_disagreement():
+    primary = StubRegistry(StubAdvisor("High", 0.4), "a")
+    candidate = StubRegistry(StubAdvisor("Medium", 0.5), "b")
+    experiment = ModelExperiment(primary, candidate, shadow=True)
+
+    for _ in range(10):
+        variant, advisor = experiment.choose()
+        assert variant == "primary"
+        experiment.submit_shadow({}, advisor.get_complete_advisory())
+    experiment.drain()
+
+    stats = experiment.stats()
+    assert stats["disagreement"]["compared"] == 10
+    assert stats["disagreement"]["rush_level_rate"] == 1.0
+    assert abs(stats["disagreement"]["confirmation_mean_abs_diff"] - 0.1) < 1e-9
+    # Shadow scoring is timed apart from candidate-served traffic
+    assert stats["shadow_latency"]["count"] == 10
+    assert stats["latency"]["candidate"] == {"count": 0}
+
+
+def test_shadow_sampling_and_cached_latency():
+    primary = StubRegistry(StubAdvisor("High", 0.4), "a")
+    candidate = StubRegistry(StubAdvisor("High", 0.4), "b")
+    experiment = ModelExperiment(primary, candidate, shadow=True, shadow_sample=0.25)
+
+    submitted = sum(experiment.submit_shadow({}, primary.advisor.get_complete_advisory())
+                    for _ in range(400))
+    experiment.drain()
+    assert 60 < submitted < 140
+    assert experiment.stats()["disagreement"]["compared"] == submitted
+
+    experiment.record_latency("primary", 0.020)
+    experiment.record_latency("primary", 0.001, cached=True)
+    stats = experiment.stats()
+    assert stats["latency"]["primary"]["p50_ms"] == 20.0
+    assert stats["cached_latency"]["primary"]["p50_ms"] == 1.0
+
+
+def test_traffic_share_routes_to_candidate():
+    primary = StubRegistry(StubAdvisor("High", 0.4), "a")
+    candidate = StubRegistry(StubAdvisor("High", 0.4), "b")
+
+    always = ModelExperiment(primary, candidate, candidate_share=1.0)
+    assert always.choose()[0] == "candidate"
+
+    never = ModelExperiment(primary, candidate, candidate_share=0.0)
+    assert never.choose()[0] == "primary"
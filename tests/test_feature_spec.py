@@ -0,0 +1,74 @@
+"""
+Tests for the shared feature spec and compiled transforms
+"""
+
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from advisor import FestiveTravelAdvisor
+from feature_spec import MODEL_SPECS, catalog_peak_days, check_features, save_peak_days
+from features import CompiledTransform, default_peak_day_proximity
+
+from conftest import BASE_DIR, MODEL_DIR
+
+
+def test_saved_features_follow_spec(advisor):
+    assert advisor.rush_features == MODEL_SPECS["rush"]["features"]
+    assert advisor.confirm_features == MODEL_SPECS["confirm"]["features"]
+    assert advisor.booking_features == MODEL_SPECS["booking"]["features"]
+
+
+@pytest.mark.parametrize("model", ["rush", "confirm", "booking"])
+def test_transform_matches_sklearn_preprocessing(advisor, model):
+    data = pd.read_csv(f"{BASE_DIR}/data/processed/enhanced_festive_travel_data.csv", nrows=500)
+    features = MODEL_SPECS[model]["features"]
+    scaler = {"rush": advisor.rush_scaler, "confirm": advisor.confirm_scaler,
+              "booking": advisor.booking_scaler}[model]
+
+    expected = data[features].copy()
+    for col in features:
+        if col in advisor.label_encoders:
+            expected[col] = advisor.label_encoders[col].transform(expected[col].astype(str))
+    expected = scaler.transform(expected)
+
+    columns = {col: data[col].to_numpy() for col in features}
+    np.testing.assert_array_equal(advisor.transforms[model](columns, len(data)), expected)
+
+
+def test_unseen_labels_encode_as_zero():
+    transform = CompiledTransform(["festival", "distance"], {"festival": {"Diwali": 0, "Holi": 1}},
+                                  mean=[0.5, 100.0], scale=[0.5, 10.0])
+    X = transform({"festival": np.array(["Holi", "Onam"]), "distance": 120}, 2)
+    np.testing.assert_array_equal(X, [[1.0, 2.0], [-1.0, 2.0]])
+
+
+def test_mismatched_artifacts_rejected(advisor, tmp_path):
+    with pytest.raises(ValueError, match="feature spec"):
+        check_features("booking", list(reversed(MODEL_SPECS["booking"]["features"])))
+
+    target = tmp_path / "models"
+    shutil.copytree(MODEL_DIR, target, ignore=shutil.ignore_patterns("lite"))
+    joblib.dump(MODEL_SPECS["rush"]["features"][:-1], target / "rush_features.pkl")
+    with pytest.raises(ValueError, match="rush model was trained on"):
+        FestiveTravelAdvisor(model_dir=str(target))
+
+
+def test_dataset_follows_catalog_peak_days():
+    data = pd.read_csv(f"{BASE_DIR}/data/processed/enhanced_festive_travel_data.csv")
+    proximity = default_peak_day_proximity(data["festival"].to_numpy(),
+                                           data["days_before_festival"].to_numpy())
+    np.testing.assert_array_equal(proximity, data["peak_day_proximity"])
+
+
+def test_mismatched_peak_days_rejected(tmp_path):
+    target = tmp_path / "models"
+    shutil.copytree(MODEL_DIR, target, ignore=shutil.ignore_patterns("lite"))
+    peak_days = catalog_peak_days()
+    peak_days["Christmas"] = [0, 1]
+    save_peak_days(str(target), peak_days)
+    with pytest.raises(ValueError, match="peak_days"):
+        FestiveTravelAdvisor(model_dir=str(target))
@@ -0,0 +1,83 @@
+"""
+Tests for the festival calendar's date -> feature index
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_score import score_frame
+from features import default_peak_day_proximity
+from festival_calendar import FESTIVAL_DATES, FestivalCalendar, default_calendar
+from model_registry import SMOKE_SET
+
+
+def test_matches_brute_force_over_mixed_festivals():
+    calendar = default_calendar()
+    rng = np.random.default_rng(4)
+    festival = rng.choice(calendar.festivals, 5000)
+    dates = np.datetime64("2021-01-01") + rng.integers(0, 8 * 365, 5000)
+
+    features = calendar.features(festival, dates)
+
+    for name, date, days in zip(festival[:300], dates[:300], features["days_before_festival"][:300]):
+        upcoming = [d for d in calendar.festival_dates(name) if d >= date]
+        assert days == (upcoming[0] - date).astype(int)
+    assert calendar.days_before("Diwali", "2024-10-31") == 0
+    assert calendar.days_before("Holi", datetime.date(2025, 3, 13)) == 1
+
+
+def test_fixed_dates_and_peak_offsets():
+    calendar = FestivalCalendar(years=range(1990, 2101))
+    assert calendar.days_before("Christmas", ["1999-12-20", "2099-12-26"]).tolist() == [5, 364]
+
+    # Christmas peaks 24-25 days out, the offsets the models were trained on
+    features = calendar.features("Christmas", ["2024-12-24", "2024-11-30"])
+    assert features["peak_day_proximity"].tolist() == [23, 0]
+
+
+def test_date_and_offset_paths_agree(advisor):
+    calendar = default_calendar()
+    festival = np.repeat(calendar.festivals, 61)
+    days_before = np.tile(np.arange(61), len(calendar.festivals))
+
+    assert (calendar.peak_day_proximity(festival, days_before)
+            == default_peak_day_proximity(festival, days_before)).all()
+    assert default_peak_day_proximity("Diwali", 3) == 0
+
+    # A journey sent by date scores the same as one sent by offset
+    journey_date = np.datetime64("2026-11-08") - np.arange(61)
+    frame = pd.DataFrame(SMOKE_SET[:1] * 61).drop(columns="days_before_festival")
+    frame["festival"] = "Diwali"
+    by_date = score_frame(advisor, frame.assign(journey_date=journey_date))
+    by_offset = score_frame(advisor, frame.assign(days_before_festival=np.arange(61)))
+    columns = [col for col in by_offset.columns if col.startswith("rush_")] + ["recommendation_codes"]
+    pd.testing.assert_frame_equal(by_date[columns], by_offset[columns])
+
+
+def test_rejects_unknown_festivals_and_dates_past_the_index():
+    calendar = default_calendar()
+    with pytest.raises(ValueError, match="Unknown festival"):
+        calendar.days_before(["Diwali", "Onam"], "2024-01-01")
+
+    last = FESTIVAL_DATES["Diwali"][-1]
+    with pytest.raises(ValueError, match="No known Diwali date"):
+        calendar.days_before("Diwali", np.datetime64(last) + 1)
+
+
+def test_batch_scoring_by_journey_date(advisor):
+    frame = pd.DataFrame(SMOKE_SET).drop(columns="days_before_festival")
+    frame["journey_date"] = "2025-09-15"
+
+    scored = score_frame(advisor, frame)
+
+    features = default_calendar().features(frame["festival"].to_numpy(), frame["journey_date"].to_numpy())
+    expected = advisor.get_batch_advisory(**{
+        col: frame[col].to_numpy() for col in (
+            "festival", "route_distance_km", "source_city_tier", "destination_city_tier",
+            "train_class", "train_type", "current_waitlist_position", "quota")
+    }, **features)
+    assert scored["rush_level"].tolist() == list(expected["rush_level"])
+    assert scored["recommendation_codes"].tolist() == list(expected["recommendation_codes"])
@@ -0,0 +1,76 @@
+"""
+Tests for the festival x route x day heatmap slices
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from heatmap import HeatmapStore, route_key
+from catalog import POPULAR_ROUTES
+
+
+def test_slice_matches_rush_curve(advisor, tmp_path):
+    store = HeatmapStore(output_dir=str(tmp_path), festivals=["Diwali", "Holi"])
+    route = POPULAR_ROUTES[0]
+
+    data = store.get_slice(route, advisor=advisor)
+    assert data["high_rush_probability"].shape == (2, 121)
+
+    curve = advisor.rush_curve(
+        festival="Holi",
+        route_distance_km=route["distance"],
+        source_city_tier=route["tier_from"],
+        destination_city_tier=route["tier_to"],
+        train_class=store.config["train_class"],
+        train_type=store.config["train_type"]
+    )
+    expected = np.array(curve["probabilities"].get("High", [0.0] * 121))
+    assert np.allclose(data["high_rush_probability"][1], expected, atol=1e-3)
+
+
+def test_only_new_routes_are_recomputed(advisor, tmp_path):
+    store = HeatmapStore(output_dir=str(tmp_path), routes=POPULAR_ROUTES[:2])
+    for route in store.routes:
+        store.get_slice(route, advisor=advisor)
+
+    first = os.path.join(str(tmp_path), f"{route_key(POPULAR_ROUTES[0])}.npz")
+    mtime = os.path.getmtime(first)
+
+    new_route = {"from": "Howrah", "to": "Guwahati", "tier_from": 1, "tier_to": 2,
+                 "distance": 1000, "base_rush": 0.8}
+    grown = HeatmapStore(output_dir=str(tmp_path), routes=POPULAR_ROUTES[:2] + [new_route])
+
+    assert grown.stale_routes(advisor.model_version) == [new_route]
+    grown.get_slice(new_route, advisor=advisor)
+    assert grown.stale_routes(advisor.model_version) == []
+    assert os.path.getmtime(first) == mtime
+
+
+def test_routes_come_from_the_route_catalog(tmp_path):
+    extra = {"from": "Howrah", "to": "Guwahati", "tier_from": 1, "tier_to": 2,
+             "distance": 1000, "base_rush": 0.8}
+    routes_file = tmp_path / "routes.json"
+    routes_file.write_text(json.dumps([extra]))
+
+    store = HeatmapStore(output_dir=str(tmp_path / "heatmap"), routes_file=str(routes_file))
+    assert store.routes == POPULAR_ROUTES + [extra]
+
+
+def _save_fake_slice(output_dir, i):
+    route = {"from": f"City{i}", "to": "Hub", "tier_from": 1, "tier_to": 1, "distance": 100 + i}
+    HeatmapStore(output_dir=output_dir, routes=[route])._save_slice(
+        route, {"rush_level": np.zeros((1, 1), dtype=np.int8)}, "v1"
+    )
+    return route_key(route)
+
+
+def test_concurrent_writers_keep_every_manifest_entry(tmp_path):
+    output_dir = str(tmp_path)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        keys = list(pool.map(_save_fake_slice, [output_dir] * 24, range(24)))
+
+    with open(os.path.join(output_dir, "manifest.json")) as f:
+        assert sorted(json.load(f)["slices"]) == sorted(keys)
@@ -0,0 +1,76 @@
+"""
+Tests for the NumPy-only inference bundle
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from lite_advisor import LiteAdvisor, export_bundle
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+@pytest.fixture(scope="module")
+def lite(advisor, tmp_path_factory):
+    bundle_dir = str(tmp_path_factory.mktemp("lite"))
+    export_bundle(advisor, bundle_dir)
+    return LiteAdvisor(bundle_dir=bundle_dir)
+
+
+def test_lite_matches_sklearn_predictions(advisor, lite):
+    rng = np.random.default_rng(0)
+    n = 300
+    columns = dict(
+        festival=rng.choice(advisor.categories("festival"), n),
+        days_before_festival=rng.integers(0, 120, n),
+        route_distance_km=rng.integers(100, 3000, n),
+        source_city_tier=rng.integers(1, 4, n),
+        destination_city_tier=rng.integers(1, 4, n),
+        train_class=rng.choice(advisor.categories("train_class"), n),
+        train_type=rng.choice(advisor.categories("train_type"), n)
+    )
+
+    expected_levels, expected_proba = advisor.predict_rush_batch(**columns)
+    levels, proba = lite.predict_rush_batch(**columns)
+    assert (levels == expected_levels).all()
+    assert np.allclose(proba, expected_proba)
+
+    confirm = dict(
+        current_waitlist_position=rng.integers(1, 200, n),
+        days_to_journey=rng.integers(0, 60, n),
+        train_type=columns["train_type"],
+        quota=rng.choice(advisor.categories("quota"), n),
+        train_class=columns["train_class"],
+        historical_rush_index=rng.uniform(30, 100, n)
+    )
+    assert np.allclose(lite.predict_confirmation_batch(**confirm),
+                       advisor.predict_confirmation_batch(**confirm))
+
+
+def test_lite_complete_advisory(advisor, lite):
+    request = dict(
+        festival="Diwali",
+        days_before_festival=20,
+        source_city="Delhi",
+        destination_city="Patna",
+        route_distance_km=1000,
+        source_city_tier=1,
+        destination_city_tier=2,
+        train_class="Sleeper",
+        train_type="Superfast",
+        current_waitlist_position=40
+    )
+    assert lite.get_complete_advisory(**request) == advisor.get_complete_advisory(**request)
+
+
+def test_lite_import_skips_pandas_and_sklearn():
+    code = (
+        f"import sys; sys.path.insert(0, {SRC_DIR!r}); import lite_advisor; "
+        "print(int('pandas' in sys.modules), int('sklearn' in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["0", "0"]
@@ -0,0 +1,118 @@
+"""
+Tests for the open-loop load-test harness, against the stand-in API
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("requests")
+
+from loadtest import (ProcessSampler, build_bodies, config_matrix, format_report, logged_requests,
+                      make_stub_server, poisson_schedule, run_config, run_load, summarize,
+                      synthetic_requests)
+from model_registry import SMOKE_SET
+
+
+@pytest.fixture
+def stub():
+    def start(**options):
+        server = make_stub_server(**options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_poisson_schedule():
+    offsets = poisson_schedule(rate=200, duration=50, seed=1)
+
+    assert (np.diff(offsets) > 0).all() and offsets[-1] < 50
+    assert abs(len(offsets) - 10_000) < 4 * np.sqrt(10_000)
+    assert np.diff(offsets).mean() == pytest.approx(1 / 200, rel=0.05)
+
+
+def test_replayed_logs_fill_route_fields(tmp_path):
+    log = tmp_path / "requests.jsonl"
+    by_city = {k: v for k, v in SMOKE_SET[0].items() if k != "route_distance_km"}
+    log.write_text(json.dumps({"request": by_city}) + "\n")
+
+    assert logged_requests([str(log)])[0]["route_distance_km"] == SMOKE_SET[0]["route_distance_km"]
+
+
+def test_latency_and_errors_against_the_stub(stub):
+    bodies = build_bodies(synthetic_requests(100), "single")
+
+    records = run_load(stub(latency_ms=20), bodies, rate=80, duration=1.0)
+    summary = summarize(records, 1.0)
+    assert summary["errors"] == summary["dropped"] == 0
+    assert summary["completed"] == summary["scheduled"] > 40
+    assert 20 <= summary["latency_ms"]["p50"] <= summary["latency_ms"]["p99"]
+
+    failing = summarize(run_load(stub(latency_ms=1, error_rate=0.5), bodies, rate=80, duration=1.0), 1.0)
+    assert 0.25 < failing["error_rate"] < 0.75
+    assert set(failing["status_codes"]) == {"200", "500"}
+
+
+def test_client_side_failures_are_counted_as_errors():
+    records = [(0.0, 0.0, 0.01, 200, 1), (0.0, 0.0, 0.02, "ReadTimeout", 1),
+               (0.0, None, None, None, 1), None]
+
+    summary = summarize(records, 1.0)
+
+    assert (summary["completed"], summary["errors"], summary["dropped"]) == (1, 2, 1)
+    assert summary["status_codes"] == {"200": 1, "ReadTimeout": 1, "Error": 1}
+
+
+def test_batch_mode_has_no_cache_axis():
+    configs = config_matrix("stub", workers=(1, 2), cache=(True, False), modes=("single", "batch"))
+
+    assert len(configs) == 6
+    assert [c["cache"] for c in configs if c["mode"] == "batch"] == [None, None]
+
+
+def test_open_loop_drops_instead_of_waiting(stub):
+    bodies = build_bodies(synthetic_requests(10), "single")
+
+    summary = summarize(run_load(stub(latency_ms=300), bodies, rate=100, duration=0.5,
+                                 max_in_flight=4), 0.5)
+
+    assert summary["dropped"] > summary["completed"] > 0
+
+
+def test_config_matrix_report_with_process_stats():
+    payloads = synthetic_requests(200)
+    results = [
+        run_config(config, payloads, rate=40, duration=0.8, batch_size=10,
+                   stub_options=("--latency-ms", "5"))
+        for config in config_matrix("stub", modes=("single", "batch"))
+    ]
+
+    single, batch = results
+    assert batch["journeys_per_second"] > 5 * single["journeys_per_second"]
+    report = format_report(results)
+    assert "| stub | 1 | on | single |" in report and "| stub | 1 | n/a | batch |" in report
+
+    if os.path.isdir("/proc"):
+        process = single["processes"][0]
+        assert process["role"] == "main" and process["rss_mb_peak"] > 0
+
+
+def test_sampler_reports_cpu_of_a_busy_process():
+    sampler = ProcessSampler(os.getpid(), interval=0.05).start()
+    if sampler._thread is None:
+        pytest.skip("Needs /proc")
+    total = 0
+    for i in range(3_000_000):
+        total += i
+    processes = sampler.stop()
+
+    assert processes[0]["pid"] == os.getpid() and processes[0]["cpu_percent"] > 10
@@ -0,0 +1,81 @@
+"""
+Tests for hot model reload
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from advisor import FestiveTravelAdvisor
+from advisor_base import model_bundle_version
+from model_registry import ModelRegistry
+
+from conftest import MODEL_DIR
+
+
+@pytest.fixture
+def model_dir(advisor, tmp_path):
+    target = tmp_path / "models"
+    shutil.copytree(MODEL_DIR, target, ignore=shutil.ignore_patterns("lite"))
+    return str(target)
+
+
+def _touch_importance(model_dir):
+    path = os.path.join(model_dir, "rush_feature_importance.json")
+    with open(path) as f:
+        info = json.load(f)
+    info["importance"] = list(reversed(info["importance"]))
+    with open(path, "w") as f:
+        json.dump(info, f)
+
+
+def test_bundle_version_rehashes_only_on_stat_change(tmp_path):
+    artifact = tmp_path / "model.pkl"
+    artifact.write_bytes(b"weights-a")
+    version = model_bundle_version(str(tmp_path))
+
+    # Same name, size and mtime: the cached hash is reused without reading
+    stat = artifact.stat()
+    artifact.write_bytes(b"weights-b")
+    os.utime(artifact, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert model_bundle_version(str(tmp_path)) == version
+
+    os.utime(artifact, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert model_bundle_version(str(tmp_path)) != version
+
+
+def test_swap_after_stable_change(model_dir):
+    registry = ModelRegistry(model_dir, loader=FestiveTravelAdvisor, poll_interval=0)
+    old = registry.current()
+
+    assert registry.check_for_update() is False
+
+    _touch_importance(model_dir)
+    assert registry.check_for_update() is False  # first sighting, wait for stability
+    assert registry.check_for_update() is True
+
+    new = registry.current()
+    assert new is not old
+    assert registry.previous_version == old.model_version
+    assert registry.version == new.model_version != old.model_version
+
+    # A request still holding the old advisor can finish on it
+    assert old.predict_rush_level("Diwali", 20, 1000, 1, 2, "Sleeper", "Superfast")
+
+
+def test_rejected_bundle_keeps_serving(model_dir):
+    registry = ModelRegistry(model_dir, loader=FestiveTravelAdvisor, poll_interval=0)
+    old = registry.current()
+
+    def broken_loader(path):
+        raise ValueError("corrupt bundle")
+
+    registry.loader = broken_loader
+    _touch_importance(model_dir)
+
+    assert registry.check_for_update(require_stable=False) is False
+    assert registry.current() is old
+    assert registry.failed_reloads == 1
+    assert "corrupt bundle" in registry.last_error
@@ -0,0 +1,127 @@
+"""
+Tests for the multi-modal rush predictor bundle
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder
+
+from multimodal import FEATURES, MultiModalRushPredictor, export_multimodal_bundle
+
+
+@pytest.fixture(scope="module")
+def legacy_model():
+    rng = np.random.default_rng(0)
+    n = 400
+    frame = pd.DataFrame({
+        "festival": rng.choice(["Diwali", "Holi", "Pongal"], n),
+        "transport_mode": rng.choice(["Train", "Bus", "Flight"], n),
+        "distance_km": rng.uniform(100, 2500, n),
+        "historical_rush_index": rng.uniform(40, 100, n),
+    })
+    rush = np.where(frame["historical_rush_index"] > 80, "High",
+                    np.where(frame["distance_km"] > 1200, "Medium", "Low"))
+
+    encoders = {}
+    for col in ("festival", "transport_mode"):
+        encoders[col] = LabelEncoder().fit(frame[col])
+        frame[col] = encoders[col].transform(frame[col])
+    encoders["rush_level"] = LabelEncoder().fit(rush)
+
+    model = RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0)
+    model.fit(frame[FEATURES], encoders["rush_level"].transform(rush))
+    return model, encoders
+
+
+def _legacy_predict(model, encoders, **row):
+    data = pd.DataFrame([row])
+    for col, encoder in encoders.items():
+        if col in data.columns:
+            data[col] = encoder.transform(data[col])
+    label = encoders["rush_level"].inverse_transform([model.predict(data)[0]])[0]
+    return {"predicted_rush_level": label,
+            "confidence": round(model.predict_proba(data).max() * 100, 2)}
+
+
+def test_bundle_matches_legacy_predictions(legacy_model, tmp_path):
+    model, encoders = legacy_model
+    predictor = MultiModalRushPredictor(export_multimodal_bundle(model, encoders, str(tmp_path)))
+
+    rows = [
+        dict(festival="Diwali", transport_mode="Train", distance_km=1200.0, historical_rush_index=92.0),
+        dict(festival="Holi", transport_mode="Bus", distance_km=300.0, historical_rush_index=55.0),
+        dict(festival="Pongal", transport_mode="Flight", distance_km=1800.0, historical_rush_index=70.0),
+    ]
+    for row in rows:
+        assert predictor.predict(**row) == _legacy_predict(model, encoders, **row)
+
+    labels, probabilities = predictor.predict_batch(
+        festival=np.array([r["festival"] for r in rows]),
+        transport_mode=np.array([r["transport_mode"] for r in rows]),
+        distance_km=np.array([r["distance_km"] for r in rows]),
+        historical_rush_index=np.array([r["historical_rush_index"] for r in rows]),
+    )
+    frame = pd.DataFrame(rows)
+    for col in ("festival", "transport_mode"):
+        frame[col] = encoders[col].transform(frame[col])
+    np.testing.assert_allclose(probabilities, model.predict_proba(frame[FEATURES]))
+    assert predictor.cache.stats()["size"] == len(rows)
+
+    # Unseen labels fail as they did through the legacy LabelEncoders
+    with pytest.raises(ValueError, match="Unknown transport_mode: Ship"):
+        predictor.predict(festival="Diwali", transport_mode="Ship", distance_km=900.0,
+                          historical_rush_index=80.0)
+    with pytest.raises(ValueError, match="previously unseen"):
+        _legacy_predict(model, encoders, festival="Diwali", transport_mode="Ship",
+                        distance_km=900.0, historical_rush_index=80.0)
+
+
+def test_predict_rush_exports_lazily(legacy_model, tmp_path, monkeypatch):
+    from ml import predict_rush
+
+    model, encoders = legacy_model
+    joblib.dump(model, tmp_path / "rush_model.pkl")
+    joblib.dump(encoders, tmp_path / "label_encoders.pkl")
+    monkeypatch.setattr(predict_rush, "MODEL_PATH", str(tmp_path / "rush_model.pkl"))
+    monkeypatch.setattr(predict_rush, "ENCODERS_PATH", str(tmp_path / "label_encoders.pkl"))
+    monkeypatch.setattr(predict_rush, "BUNDLE_DIR", str(tmp_path / "bundle"))
+    monkeypatch.setattr(predict_rush, "_predictor", None)
+
+    result = predict_rush.predict_rush("Diwali", "Train", 1200, 92)
+
+    assert result == _legacy_predict(model, encoders, festival="Diwali", transport_mode="Train",
+                                     distance_km=1200, historical_rush_index=92)
+    assert (tmp_path / "bundle" / "bundle.json").exists()
+
+
+def test_predict_rush_reexports_retrained_model(legacy_model, tmp_path, monkeypatch):
+    from ml import predict_rush
+
+    model, encoders = legacy_model
+    joblib.dump(model, tmp_path / "rush_model.pkl")
+    joblib.dump(encoders, tmp_path / "label_encoders.pkl")
+    monkeypatch.setattr(predict_rush, "MODEL_PATH", str(tmp_path / "rush_model.pkl"))
+    monkeypatch.setattr(predict_rush, "ENCODERS_PATH", str(tmp_path / "label_encoders.pkl"))
+    monkeypatch.setattr(predict_rush, "BUNDLE_DIR", str(tmp_path / "bundle"))
+    monkeypatch.setattr(predict_rush, "_predictor", None)
+    stale = predict_rush.get_predictor().model_version
+
+    # A retrained pickle replaces the stale bundle on the next load
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame({"festival": rng.integers(0, 3, 200), "transport_mode": rng.integers(0, 3, 200),
+                      "distance_km": rng.uniform(100, 2500, 200),
+                      "historical_rush_index": rng.uniform(40, 100, 200)})[FEATURES]
+    retrained = RandomForestClassifier(n_estimators=5, max_depth=4, random_state=1)
+    retrained.fit(X, rng.integers(0, len(encoders["rush_level"].classes_), 200))
+    joblib.dump(retrained, tmp_path / "rush_model.pkl")
+    monkeypatch.setattr(predict_rush, "_predictor", None)
+    predictor = predict_rush.get_predictor()
+
+    assert predictor.model_version != stale
+    assert predictor.predict("Diwali", "Train", 1200, 92) == _legacy_predict(
+        retrained, encoders, festival="Diwali", transport_mode="Train",
+        distance_km=1200, historical_rush_index=92
+    )
@@ -193,6 +193,87 @@ def test_complete_advisory(advisor):
         return False
 
 
+def test_rush_curve(advisor):
+    """Test 8: Test batched rush curve matches single predictions"""
+    print("\n" + "="*70)
+    print("TEST 8: Rush Curve Sweep")
+    print("="*70)
+    
+    route = dict(
+        festival="Diwali",
+        route_distance_km=1000,
+        source_city_tier=1,
+        destination_city_tier=2,
+        train_class="Sleeper",
+        train_type="Superfast"
+    )
+    
+    curve = advisor.rush_curve(days_range=range(0, 121), **route)
+    
+    assert curve['days_before_festival'] == list(range(0, 121))
+    assert len(curve['rush_level']) == 121
+    
+    for day in (0, 3, 20, 60, 120):
+        single = advisor.predict_rush_level(days_before_festival=day, **route)
+        assert curve['rush_level'][day] == single['rush_level']
+        for level, prob in single['probabilities'].items():
+            assert abs(curve['probabilities'][level][day] - prob) < 1e-3
+    
+    print(f"✅ Rush curve successful!")
+    print(f"   - Days covered: {len(curve['days_before_festival'])}")
+    return True
+
+
+def test_rank_alternatives(advisor):
+    """Test 9: Test class/type/quota alternatives ranking"""
+    print("\n" + "="*70)
+    print("TEST 9: Route Alternatives Ranking")
+    print("="*70)
+    
+    ranking = advisor.rank_alternatives(
+        festival="Diwali",
+        days_before_festival=20,
+        route_distance_km=1000,
+        source_city_tier=1,
+        destination_city_tier=2,
+        current_waitlist_position=40
+    )
+    
+    options = ranking['options']
+    assert ranking['evaluated'] == len(options)
+    
+    probs = [opt['confirmation_probability'] for opt in options]
+    assert probs == sorted(probs, reverse=True)
+    
+    best = options[0]
+    single = advisor.predict_confirmation_probability(
+        current_waitlist_position=40,
+        days_to_journey=20,
+        train_type=best['train_type'],
+        quota=best['quota'],
+        train_class=best['train_class'],
+        historical_rush_index=advisor._estimate_historical_rush(
+            "Diwali", 1000, 1, 2, best['train_class']
+        )
+    )
+    assert abs(single - best['confirmation_probability']) < 1e-3
+    
+    top = advisor.rank_alternatives(
+        festival="Diwali",
+        days_before_festival=20,
+        route_distance_km=1000,
+        source_city_tier=1,
+        destination_city_tier=2,
+        current_waitlist_position=40,
+        top_n=3
+    )
+    assert top['options'] == options[:3]
+    
+    print(f"✅ Alternatives ranking successful!")
+    print(f"   - Options evaluated: {ranking['evaluated']}")
+    return True
+
+
 def main():
     """Run all tests"""
     print("\n" + "🧪 "*30)
@@ -228,6 +309,8 @@ def main():
     results['confirm_pred'] = test_confirmation_prediction(advisor)
     results['booking_pred'] = test_booking_window_prediction(advisor)
     results['complete_advisory'] = test_complete_advisory(advisor)
+    results['rush_curve'] = test_rush_curve(advisor)
+    results['alternatives'] = test_rank_alternatives(advisor)
     
     # Summary
     print("\n" + "="*70)
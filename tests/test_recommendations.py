@@ -0,0 +1,50 @@
+"""
+Tests for the table-driven recommendation engine
+"""
+
+import numpy as np
+
+from recommendations import RULE_CODES, TEMPLATES, evaluate_rules, recommendation_codes, render
+
+
+def test_every_rule_has_a_template():
+    assert set(RULE_CODES) == set(TEMPLATES)
+
+
+def test_single_row_matches_legacy_text():
+    codes = recommendation_codes({
+        "rush_level": ["High"],
+        "days_before": [60],
+        "optimal_min": [30],
+        "optimal_max": [45],
+        "confirmation_probability": [0.5],
+        "train_class": ["Sleeper"]
+    })[0]
+
+    assert render(codes, optimal_min=30, optimal_max=45) == [
+        "⚠️ Very high rush expected. Book as early as possible.",
+        "Consider booking Tatkal if regular quota is full.",
+        "⏰ Book within 30-45 days before festival.",
+        "⚠️ Moderate confirmation chances. Have backup plans ready.",
+        "💡 Consider upgrading to AC classes for better availability.",
+    ]
+
+
+def test_batch_evaluation_matches_rows():
+    frame = {
+        "rush_level": np.array(["High", "Medium", "Low", "Medium"]),
+        "days_before": np.array([10, 30, 50, 45]),
+        "optimal_min": np.array([30, 30, 30, 30]),
+        "optimal_max": np.array([45, 45, 45, 45]),
+        "confirmation_probability": np.array([np.nan, 0.2, 0.9, 0.7]),
+        "train_class": np.array(["3AC", "General", "Sleeper", "2AC"])
+    }
+
+    mask = evaluate_rules(frame)
+    assert mask.shape == (4, len(RULE_CODES))
+
+    batch = recommendation_codes(frame)
+    assert batch[0] == ["RUSH_HIGH", "TATKAL_FALLBACK", "BOOKING_LATE"]
+    assert batch[1] == ["RUSH_MEDIUM", "IN_OPTIMAL_WINDOW", "CONFIRMATION_LOW"]
+    assert batch[2] == ["RUSH_LOW", "BOOK_WITHIN_WINDOW", "CONFIRMATION_GOOD"]
+    assert batch[3] == ["RUSH_MEDIUM", "IN_OPTIMAL_WINDOW", "CONFIRMATION_GOOD"]
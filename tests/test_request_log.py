@@ -0,0 +1,62 @@
+"""
+Tests for the background request logger
+"""
+
+import glob
+import gzip
+import json
+import time
+
+from request_log import RequestLogger
+from warmup import top_requests
+from model_registry import SMOKE_SET
+
+
+def _read_logs(log_dir):
+    records = []
+    for path in sorted(glob.glob(f"{log_dir}/*.jsonl.gz")):
+        with gzip.open(path, "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_records_written_and_rotated(tmp_path):
+    logger = RequestLogger(log_dir=str(tmp_path), rotate_bytes=200, flush_interval=0.05).start()
+    for i, params in enumerate(SMOKE_SET * 3):
+        assert logger.log({"request": params, "latency_ms": float(i)})
+    logger.close()
+
+    records = _read_logs(tmp_path)
+    assert len(records) == len(SMOKE_SET) * 3
+    assert logger.stats()["files"] > 1
+    assert not glob.glob(f"{tmp_path}/*.part")
+
+    # The warm-up job reads these files directly
+    assert len(top_requests(glob.glob(f"{tmp_path}/*.jsonl.gz"), top_k=10)) == len(SMOKE_SET)
+
+
+def test_open_file_is_readable_after_flush_interval(tmp_path):
+    logger = RequestLogger(log_dir=str(tmp_path), flush_interval=0.05).start()
+    for params in SMOKE_SET:
+        logger.log({"request": params})
+    time.sleep(0.3)
+
+    # What a worker killed now would leave behind
+    [part] = glob.glob(f"{tmp_path}/*.jsonl.gz.part")
+    assert len(top_requests([part], top_k=10)) == len(SMOKE_SET)
+    logger.close()
+
+
+def test_overflow_is_sampled_then_dropped(tmp_path):
+    # Not started, so nothing drains the queue
+    logger = RequestLogger(log_dir=str(tmp_path), max_queue=10, high_water=0.5, sample_every=2)
+    kept = sum(logger.log({"i": i}) for i in range(40))
+
+    stats = logger.stats()
+    assert kept == stats["logged"] == 10
+    assert stats["sampled_out"] > 0 and stats["dropped"] > 0
+    assert stats["logged"] + stats["sampled_out"] + stats["dropped"] == 40
+
+    logger.close()
+    weights = [r.get("sample_weight", 1) for r in _read_logs(tmp_path)]
+    assert weights.count(2) == 5
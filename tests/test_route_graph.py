@@ -0,0 +1,92 @@
+"""
+Tests for the compiled route graph
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_score import score_frame
+from catalog import POPULAR_ROUTES
+from model_registry import SMOKE_SET
+from route_graph import RouteGraph, fill_route_fields, load_route_graph
+from validation import ValidationError
+
+ROUTES = [
+    {"from": "A", "to": "B", "tier_from": 1, "tier_to": 2, "distance": 100},
+    {"from": "B", "to": "C", "tier_from": 2, "tier_to": 3, "distance": 200},
+    {"from": "C", "to": "A", "tier_from": 3, "tier_to": 1, "distance": 500},
+    {"from": "D", "to": "E", "tier_from": 1, "tier_to": 1, "distance": 50},
+]
+
+
+def test_only_listed_routes_have_distances():
+    graph = RouteGraph.from_routes(ROUTES)
+
+    # The listed 500 km, not the 300 km chain through B
+    assert graph.route("A", "C") == {"source_city_tier": 1, "destination_city_tier": 3,
+                                     "route_distance_km": 500.0}
+    assert graph.route("C", "A")["route_distance_km"] == 500.0
+    # Known cities without a listed route between them still have tiers
+    assert graph.route("A", "E") == {"source_city_tier": 1, "destination_city_tier": 1}
+    assert "route_distance_km" not in graph.route("A", "D")
+    assert graph.route("A", "Nowhere") == {"source_city_tier": 1}
+
+    with pytest.raises(ValueError, match="Conflicting tiers"):
+        RouteGraph.from_routes(ROUTES + [{"from": "A", "to": "D", "tier_from": 2,
+                                          "tier_to": 1, "distance": 10}])
+
+
+def test_compiled_graph_is_memory_mapped_and_rebuilt_on_change(tmp_path):
+    routes_file, directory = tmp_path / "routes.json", str(tmp_path / "graph")
+    routes_file.write_text(json.dumps(ROUTES))
+
+    built = load_route_graph(str(routes_file), directory)
+    loaded = load_route_graph(str(routes_file), directory)
+    assert isinstance(loaded.distances, np.memmap)
+    np.testing.assert_array_equal(loaded.distances, built.distances)
+    assert loaded.route("Delhi", "Patna")["route_distance_km"] == POPULAR_ROUTES[0]["distance"]
+
+    routes_file.write_text(json.dumps(ROUTES + [{"from": "A", "to": "E", "tier_from": 1,
+                                                 "tier_to": 1, "distance": 10}]))
+    assert load_route_graph(str(routes_file), directory).route("E", "A")["route_distance_km"] == 10.0
+
+
+def test_batch_join_and_request_filling():
+    graph = RouteGraph.from_routes(ROUTES)
+    rng = np.random.default_rng(5)
+    sources, destinations = rng.choice(["A", "B", "C"], 1000), rng.choice(["A", "B", "C"], 1000)
+
+    columns = graph.lookup_batch(sources, destinations)
+    for k in range(0, 1000, 97):
+        expected = graph.route(sources[k], destinations[k])
+        assert {name: columns[name][k] for name in expected} == expected
+
+    with pytest.raises(ValueError, match="No route between A and D"):
+        graph.lookup_batch(["A"], ["D"])
+    with pytest.raises(ValueError, match="Unknown city"):
+        graph.lookup_batch(["A"], ["Z"])
+
+    # Values the caller sent win over the graph
+    filled = fill_route_fields({"source_city": "A", "destination_city": "C", "source_city_tier": 2}, graph)
+    assert filled == {"source_city": "A", "destination_city": "C", "source_city_tier": 2,
+                      "route_distance_km": 500.0, "destination_city_tier": 3}
+
+    # Unlisted pairs need an explicit distance instead of an invented one
+    with pytest.raises(ValidationError, match="send route_distance_km"):
+        fill_route_fields({"source_city": "A", "destination_city": "E"}, graph)
+    filled = fill_route_fields({"source_city": "A", "destination_city": "E", "route_distance_km": 700}, graph)
+    assert filled["route_distance_km"] == 700 and filled["destination_city_tier"] == 1
+
+
+def test_batch_scoring_by_city_names(advisor):
+    frame = pd.DataFrame(SMOKE_SET)
+    by_city = frame.drop(columns=["route_distance_km", "source_city_tier", "destination_city_tier"])
+
+    expected = score_frame(advisor, frame)
+    scored = score_frame(advisor, by_city)
+
+    columns = ["rush_level", "confirmation_probability", "optimal_min", "recommendation_codes"]
+    pd.testing.assert_frame_equal(scored[columns], expected[columns])
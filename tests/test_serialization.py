@@ -0,0 +1,50 @@
+"""
+Tests for response serialization
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+import serialization
+from serialization import encode, encode_json, negotiate
+
+PAYLOAD = {
+    "rush_level": np.array(["High", "Medium"]),
+    "probability": np.array([0.125, 0.5], dtype=np.float32),
+    "count": np.int64(3),
+    "nested": {"ok": True, "value": np.float64(0.25)},
+}
+
+EXPECTED = {
+    "rush_level": ["High", "Medium"],
+    "probability": [0.125, 0.5],
+    "count": 3,
+    "nested": {"ok": True, "value": 0.25},
+}
+
+
+def test_json_handles_numpy():
+    assert json.loads(encode_json(PAYLOAD)) == EXPECTED
+
+
+def test_stdlib_fallback(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(encode_json(PAYLOAD)) == EXPECTED
+
+
+def test_negotiation_defaults_to_json(monkeypatch):
+    assert negotiate(None) == "json"
+    assert negotiate("text/html,application/json") == "json"
+
+    monkeypatch.setattr(serialization, "msgpack", None)
+    assert negotiate("application/msgpack") == "json"
+    assert encode(PAYLOAD, "application/msgpack")[1] == "application/json"
+
+
+def test_msgpack_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    body, mimetype = encode(PAYLOAD, "application/x-msgpack, application/json;q=0.5")
+    assert mimetype == "application/msgpack"
+    assert msgpack.unpackb(body) == EXPECTED
@@ -0,0 +1,69 @@
+"""
+Tests for per-tree vote uncertainty on rush predictions
+"""
+
+import numpy as np
+import pytest
+
+from model_registry import SMOKE_SET
+from uncertainty import vote_uncertainty
+
+
+def test_split_forest_is_marginal():
+    # 6 of 10 trees say class 0 outright, 4 say class 1
+    votes = np.zeros((2, 10, 2))
+    votes[0, :6, 0] = 1
+    votes[0, 6:, 1] = 1
+    # Second row: every tree leans class 1
+    votes[1, :, :] = [0.3, 0.7]
+    summary = vote_uncertainty(votes, votes.mean(axis=1), marginal_share=0.1)
+
+    assert summary["marginal"].tolist() == [True, False]
+    assert summary["vote_share"].tolist() == [0.6, 1.0]
+    assert summary["runner_up"].tolist() == [1, 0]
+    assert summary["runner_up_share"].tolist() == [0.4, 0.0]
+    np.testing.assert_allclose(summary["margin"], [0.2, 0.4])
+
+    # 4 of 10 trees against is not marginal under a looser threshold
+    assert not vote_uncertainty(votes, votes.mean(axis=1), marginal_share=0.4)["marginal"][0]
+    with pytest.raises(ValueError):
+        vote_uncertainty(votes, votes.mean(axis=1), marginal_share=1.5)
+
+
+def test_uncertainty_comes_from_the_same_pass(advisor):
+    rng = np.random.default_rng(1)
+    n = 400
+    columns = dict(
+        festival=rng.choice(advisor.categories("festival"), n),
+        days_before_festival=rng.integers(0, 120, n),
+        route_distance_km=rng.integers(100, 3000, n),
+        source_city_tier=rng.integers(1, 4, n),
+        destination_city_tier=rng.integers(1, 4, n),
+        train_class=rng.choice(advisor.categories("train_class"), n),
+        train_type=rng.choice(advisor.categories("train_type"), n)
+    )
+
+    levels, proba = advisor.predict_rush_batch(**columns)
+    levels_u, proba_u, details = advisor.predict_rush_batch(**columns, with_uncertainty=True)
+    summary = details["uncertainty"]
+
+    assert (levels_u == levels).all()
+    np.testing.assert_allclose(proba_u, proba, atol=1e-12)
+    assert ((0 <= summary["vote_share"]) & (summary["vote_share"] <= 1)).all()
+    assert (summary["runner_up_share"] <= 1 - summary["vote_share"] + 1e-12).all()
+    assert (summary["margin"] >= 0).all()
+
+
+def test_advisory_reports_uncertainty_only_on_request(advisor):
+    plain = advisor.get_complete_advisory(**SMOKE_SET[0])
+    detailed = advisor.get_complete_advisory(**SMOKE_SET[0], with_uncertainty=True)
+
+    assert "uncertainty" not in plain["rush_analysis"]
+    uncertainty = detailed.pop("rush_analysis").pop("uncertainty")
+    assert detailed == {k: v for k, v in plain.items() if k != "rush_analysis"}
+    assert set(uncertainty) == {"vote_share", "margin", "runner_up", "runner_up_share", "marginal"}
+
+    batch = advisor.get_batch_advisory(**{k: v for k, v in SMOKE_SET[0].items()
+                                         if k not in ("source_city", "destination_city")},
+                                      with_uncertainty=True)
+    assert batch["rush_vote_share"][0] == uncertainty["vote_share"]
@@ -0,0 +1,83 @@
+"""
+Tests for request validation and coercion
+"""
+
+import pytest
+
+from model_registry import SMOKE_SET
+from validation import (ValidationError, benchmark, validate_alternatives,
+                        validate_predict, validate_predict_batch, validate_rush_curve)
+
+
+def test_valid_request_is_coerced():
+    data = dict(SMOKE_SET[0], days_before_festival="20", route_distance_km="1000.0",
+                source_city_tier=1.0, extra_field="ignored")
+    del data["quota"]
+
+    params = validate_predict(data)
+
+    assert params["days_before_festival"] == 20
+    assert params["route_distance_km"] == 1000 and isinstance(params["route_distance_km"], int)
+    assert params["source_city_tier"] == 1
+    assert params["quota"] == "General"
+    assert "extra_field" not in params
+    assert params == validate_predict(dict(SMOKE_SET[0], days_before_festival=20))
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("festival", "Onam", "must be one of"),
+    ("days_before_festival", "soon", "must be an integer"),
+    ("days_before_festival", 2.5, "must be an integer"),
+    ("days_before_festival", 500, "between 0 and 120"),
+    ("route_distance_km", float("nan"), "must be a number"),
+    ("source_city_tier", True, "must be an integer"),
+    ("train_class", ["Sleeper"], "must be one of"),
+    ("quota", "VIP", "must be one of"),
+    ("train_type", None, "is required"),
+])
+def test_invalid_fields_rejected(field, value, message):
+    with pytest.raises(ValidationError) as info:
+        validate_predict(dict(SMOKE_SET[0], **{field: value}))
+    assert message in info.value.errors[field]
+
+
+def test_all_errors_reported_together():
+    with pytest.raises(ValidationError) as info:
+        validate_predict({"festival": "Diwali"})
+    assert set(info.value.errors) >= {"days_before_festival", "route_distance_km", "train_class"}
+
+    with pytest.raises(ValidationError) as info:
+        validate_predict(None)
+    assert info.value.errors == {"body": "must be a JSON object"}
+
+
+def test_endpoint_schemas_defaults():
+    route = {key: SMOKE_SET[0][key] for key in
+             ("festival", "route_distance_km", "source_city_tier", "destination_city_tier")}
+
+    curve = validate_rush_curve(dict(route, train_class="3AC", train_type="Express"))
+    assert (curve["days_min"], curve["days_max"]) == (0, 120)
+
+    ranking = validate_alternatives(dict(route, days_before_festival=10))
+    assert ranking["current_waitlist_position"] == 1 and ranking["top_n"] is None
+
+
+def test_validation_costs_microseconds():
+    results = benchmark(number=2000)
+    assert results["valid_us"] < 500 and results["invalid_us"] < 500
+
+
+def test_batch_request_becomes_columns():
+    columns = validate_predict_batch({"journeys": SMOKE_SET})
+
+    assert columns["festival"] == [r["festival"] for r in SMOKE_SET]
+    assert columns["current_waitlist_position"] == [40, 0, 150]
+
+    with pytest.raises(ValidationError) as info:
+        validate_predict_batch({"journeys": [SMOKE_SET[0], dict(SMOKE_SET[1], quota="VIP")]})
+    assert list(info.value.errors) == ["journeys[1].quota"]
+
+    with pytest.raises(ValidationError, match="more than 2"):
+        validate_predict_batch({"journeys": SMOKE_SET}, max_rows=2)
+    with pytest.raises(ValidationError, match="non-empty list"):
+        validate_predict_batch({"journeys": []})
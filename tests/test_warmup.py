@@ -0,0 +1,86 @@
+"""
+Tests for cache warm-up from request logs
+"""
+
+import gzip
+import json
+
+from cache import DiskCache, advisory_cache_key
+from model_registry import SMOKE_SET
+from validation import validate_predict
+from file_lock import file_lock
+from warmup import top_requests, warm_cache, warm_cache_once
+
+
+def _write_log(path, records):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def test_top_requests_dedupes_and_ranks(tmp_path):
+    log = tmp_path / "requests.jsonl.gz"
+    reordered = dict(reversed(list(SMOKE_SET[1].items())))
+    _write_log(log, [
+        SMOKE_SET[0],
+        {"request": SMOKE_SET[1], "latency_ms": 3.0},
+        reordered,
+        {"request_id": "not-a-prediction", "title": "ignored"},
+        dict(SMOKE_SET[1], days_before_festival="never"),
+        SMOKE_SET[2],
+        {"request": SMOKE_SET[1]},
+    ])
+
+    top = top_requests([str(log)], top_k=2)
+
+    assert len(top) == 2
+    assert top[0] == validate_predict(SMOKE_SET[1])
+
+
+def test_city_only_requests_are_warmed_under_the_service_key(advisor, tmp_path):
+    log = tmp_path / "requests.jsonl"
+    by_city = {k: v for k, v in SMOKE_SET[0].items()
+               if k not in ("route_distance_km", "source_city_tier", "destination_city_tier")}
+    _write_log(log, [{"request": by_city}])
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+
+    assert warm_cache([str(log)], cache, top_k=10, advisor=advisor)["computed"] == 1
+    assert cache.get(advisory_cache_key(advisor.model_version, validate_predict(SMOKE_SET[0])))
+
+
+def test_warm_cache_fills_and_skips(advisor, tmp_path):
+    log = tmp_path / "requests.jsonl"
+    _write_log(log, SMOKE_SET * 2)
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+
+    first = warm_cache([str(log)], cache, top_k=10, advisor=advisor, batch_size=2)
+    assert first["requests"] == len(SMOKE_SET)
+    assert first["computed"] == len(SMOKE_SET)
+
+    key = advisory_cache_key(advisor.model_version, validate_predict(SMOKE_SET[0]))
+    assert cache.get(key) == json.loads(json.dumps(advisor.get_complete_advisory(**SMOKE_SET[0])))
+
+    second = warm_cache([str(log)], cache, top_k=10, advisor=advisor)
+    assert second["computed"] == 0
+
+
+def test_batched_advisories_match_single_requests(advisor):
+    requests = [validate_predict(dict(request, current_waitlist_position=position))
+                for request in SMOKE_SET for position in (0, 12)]
+
+    assert advisor.get_complete_advisories(requests) == [
+        advisor.get_complete_advisory(**params) for params in requests
+    ]
+
+
+def test_warm_cache_once_skips_while_another_process_warms(advisor, tmp_path):
+    log = tmp_path / "requests.jsonl"
+    _write_log(log, SMOKE_SET)
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+
+    with file_lock(f"{cache.path}.warmup.lock") as held:
+        assert held
+        assert warm_cache_once([str(log)], cache, top_k=10, advisor=advisor) is None
+
+    assert warm_cache_once([str(log)], cache, top_k=10, advisor=advisor)["computed"] == len(SMOKE_SET)